@@ -0,0 +1,4 @@
+from benchmarks.runner import bench
+
+if __name__ == '__main__':
+    bench()
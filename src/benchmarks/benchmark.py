@@ -0,0 +1,48 @@
+import itertools
+import typing
+
+# Parameter values of a single benchmark case.
+Params = typing.Dict[str, typing.Any]
+
+
+class Case(typing.NamedTuple):
+    '''
+    A single measured operation, the optional setup is run before every call and not measured.
+    '''
+    run: typing.Callable[[], typing.Any]
+    setup: typing.Optional[typing.Callable[[], typing.Any]] = None
+    operations: int = 1
+
+
+class Benchmark(typing.NamedTuple):
+    name: str
+    grid: typing.Dict[str, typing.List[typing.Any]]
+    create: typing.Callable[..., Case]
+
+    def getParams(self) -> typing.Iterator[Params]:
+        '''
+        Generates all the parameter combinations of the benchmark.
+        :return: generator yielding parameter values.
+        '''
+        names = list(self.grid)
+        for values in itertools.product(*[self.grid[name] for name in names]):
+            yield dict(zip(names, values))
+
+
+# Registered benchmarks.
+BENCHMARKS: typing.List[Benchmark] = []
+
+
+def benchmark(name: str, **grid: typing.List[typing.Any]) \
+        -> typing.Callable[[typing.Callable[..., Case]], typing.Callable[..., Case]]:
+    '''
+    Registers a benchmark run for every combination of the parameter values.
+    :param name: benchmark name.
+    :param grid: values of the parameters passed to the decorated case factory.
+    :return: decorator.
+    '''
+    def decorator(create: typing.Callable[..., Case]) -> typing.Callable[..., Case]:
+        BENCHMARKS.append(Benchmark(name=name, grid=grid, create=create))
+        return create
+
+    return decorator
@@ -0,0 +1,167 @@
+import random
+import typing
+
+from benchmarks.benchmark import Case, benchmark
+from simulator.dispatcher.mixed import MixedDispatcher
+from simulator.position import Position
+from simulator.road.array import ArrayRoad
+from simulator.road.dense import DenseRoad
+from simulator.road.road import Road
+from simulator.road.sparse import SparseRoad
+from simulator.road.speedcontroller import SpeedController
+from simulator.simulator import Simulator
+from simulator.statistics.collector import Collector, Statistics
+from simulator.statistics.tracker import Tracker
+from simulator.vehicle.conventional import Driver
+from util import rand
+
+# Seed used by all the benchmarks.
+SEED = 42
+
+# Number of lookups measured by a single call of the query benchmarks.
+QUERIES = 1000
+
+ROADS: typing.Dict[str, typing.Type[Road]] = {
+    'dense': DenseRoad,
+    'array': ArrayRoad,
+    'sparse': SparseRoad,
+}
+
+# Parameters shared by the benchmarks running a simulation.
+ROAD = list(ROADS)
+LENGTH = [100, 1000]
+LANES = [1, 3]
+WIDTH = [1, 2]
+CAR_LENGTH = [1, 3]
+DENSITY = [.1, .4]
+
+
+def createSimulator(road: str = 'dense', length: int = 1000, lanes: int = 3, width: int = 1,
+                    car_length: int = 1, density: float = .2, warmup: int = 10) -> Simulator:
+    '''
+    Creates a seeded simulation with a speed limit and runs it for a few steps.
+    :param road: road implementation.
+    :param length: road length.
+    :param lanes: number of lanes.
+    :param width: lane width.
+    :param car_length: number of cells occupied by a car.
+    :param density: initial density of vehicles.
+    :param warmup: number of steps run before the measurement.
+    :return: simulator.
+    '''
+    random.seed(SEED)
+    rand.seed(SEED)
+    controller = SpeedController(max_speed=5)
+    controller.addLimit(lane=0, begin=length // 2, end=length // 2 + length // 10, limit=3)
+    road = ROADS[road](
+        length=length, lanes_count=lanes, lane_width=width, controller=controller)
+    dispatcher = MixedDispatcher(
+        road=road, count=lanes, penetration=.5, driver=Driver(), length=car_length)
+    simulator = Simulator(road=road, dispatcher=dispatcher)
+    simulator.scatterVehicles(density=density)
+    for _ in range(warmup):
+        simulator.step()
+    return simulator
+
+
+def getRandomPositions(road: Road, count: int) -> typing.List[Position]:
+    '''
+    Generates random positions on the road.
+    :param road: road.
+    :param count: number of positions.
+    :return: positions.
+    '''
+    return [(random.randrange(road.length), random.randrange(road.sublanesCount))
+            for _ in range(count)]
+
+
+@benchmark('Road.step', road=ROAD, length=LENGTH, lanes=LANES, width=WIDTH,
+           car_length=CAR_LENGTH, density=DENSITY)
+def roadStep(**kwargs) -> Case:
+    simulator = createSimulator(**kwargs)
+    # Dispatching is not measured, it only keeps the road populated.
+    return Case(run=simulator.road.step,
+                setup=lambda: simulator.dispatcher.dispatch(step=simulator.steps))
+
+
+@benchmark('Road.getNextVehicle', road=ROAD, length=LENGTH, lanes=LANES, density=DENSITY)
+def getNextVehicle(**kwargs) -> Case:
+    road = createSimulator(**kwargs).road
+    positions = getRandomPositions(road=road, count=QUERIES)
+
+    def run() -> None:
+        for position in positions:
+            road.getNextVehicle(position=position)
+
+    return Case(run=run, operations=len(positions))
+
+
+@benchmark('Road.getPreviousVehicle', road=ROAD, length=LENGTH, lanes=LANES, density=DENSITY)
+def getPreviousVehicle(**kwargs) -> Case:
+    road = createSimulator(**kwargs).road
+    positions = getRandomPositions(road=road, count=QUERIES)
+
+    def run() -> None:
+        for position in positions:
+            road.getPreviousVehicle(position=position)
+
+    return Case(run=run, operations=len(positions))
+
+
+@benchmark('Road.canPlaceVehicle', road=ROAD, length=LENGTH, width=WIDTH, car_length=CAR_LENGTH,
+           density=DENSITY)
+def canPlaceVehicle(**kwargs) -> Case:
+    simulator = createSimulator(**kwargs)
+    road = simulator.road
+    vehicles = []
+    for x, lane in getRandomPositions(road=road, count=QUERIES):
+        # Keep the whole vehicle on the road.
+        x = max(x, simulator.dispatcher.length - 1)
+        lane = min(lane, road.sublanesCount - road.lane_width)
+        vehicles.append(simulator.dispatcher._newVehicle(position=(x, lane)))
+
+    def run() -> None:
+        for vehicle in vehicles:
+            road.canPlaceVehicle(vehicle=vehicle)
+
+    return Case(run=run, operations=len(vehicles))
+
+
+@benchmark('SpeedController.getMaxSpeed', limits=[0, 10, 100], width=WIDTH)
+def getMaxSpeed(limits: int, width: int) -> Case:
+    random.seed(SEED)
+    length = 1000
+    controller = SpeedController(max_speed=5)
+    for _ in range(limits):
+        begin = random.randrange(length)
+        controller.addLimit(lane=random.randrange(3 * width), begin=begin,
+                            end=begin + random.randint(1, 50), limit=random.randint(1, 4))
+    positions = [(random.randrange(length), random.randrange(2 * width)) for _ in range(QUERIES)]
+
+    def run() -> None:
+        for position in positions:
+            controller.getMaxSpeed(position=position, width=width)
+
+    return Case(run=run, operations=len(positions))
+
+
+@benchmark('Dispatcher.dispatch', road=ROAD, lanes=LANES, width=WIDTH, car_length=CAR_LENGTH)
+def dispatch(**kwargs) -> Case:
+    simulator = createSimulator(**kwargs)
+    # Stepping is not measured, it makes room for new vehicles.
+    return Case(run=lambda: simulator.dispatcher.dispatch(step=simulator.steps),
+                setup=simulator.road.step)
+
+
+@benchmark('Collector.run', road=ROAD, length=LENGTH, lanes=LANES, density=DENSITY)
+def collectorRun(**kwargs) -> Case:
+    simulator = createSimulator(**kwargs)
+    collector = Collector(simulator=simulator, statistics=Statistics.ALL)
+    return Case(run=collector.run)
+
+
+@benchmark('Tracker.run', road=ROAD, length=LENGTH, lanes=LANES, density=DENSITY)
+def trackerRun(**kwargs) -> Case:
+    simulator = createSimulator(**kwargs)
+    tracker = Tracker(simulator=simulator)
+    return Case(run=tracker.run)
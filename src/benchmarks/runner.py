@@ -0,0 +1,145 @@
+import datetime
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+import typing
+
+import click
+
+import benchmarks.cases  # noqa: F401 registers the benchmarks
+from benchmarks.benchmark import BENCHMARKS, Benchmark, Case, Params
+from benchmarks.cases import SEED
+from util import rand
+
+# Measurement of a single benchmark case.
+Result = typing.Dict[str, typing.Any]
+
+
+def measure(case: Case, min_time: float, max_time: float, min_calls: int, max_calls: int) \
+        -> typing.List[float]:
+    '''
+    Measures calls of a benchmark case until the minimal time passes.
+    :param case: measured case.
+    :param min_time: minimal total measured time (s).
+    :param max_time: maximal time including the setup (s).
+    :param min_calls: minimal number of calls.
+    :param max_calls: maximal number of calls.
+    :return: durations of the calls (s).
+    '''
+    times = []
+    total = 0.
+    deadline = time.perf_counter() + max_time
+    while len(times) < min_calls or (
+            len(times) < max_calls and total < min_time and time.perf_counter() < deadline):
+        if case.setup is not None:
+            case.setup()
+        start = time.perf_counter()
+        case.run()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        total += elapsed
+    return times
+
+
+def runBenchmark(bench: Benchmark, params: Params, **kwargs) -> Result:
+    '''
+    Creates and measures a single benchmark case.
+    :param bench: benchmark.
+    :param params: benchmark parameters.
+    :param kwargs: measurement options.
+    :return: benchmark result, durations are per operation.
+    '''
+    case = bench.create(**params)
+    random.seed(SEED)
+    rand.seed(SEED)
+    times = [t / case.operations for t in measure(case=case, **kwargs)]
+    return dict(
+        name=bench.name, params=params, calls=len(times), operations=case.operations,
+        min=min(times), median=statistics.median(times), mean=statistics.mean(times),
+        stdev=statistics.stdev(times) if len(times) > 1 else 0.)
+
+
+def getCommit() -> typing.Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def getKey(result: Result) -> str:
+    return f'{result["name"]}[{json.dumps(result["params"], sort_keys=True)}]'
+
+
+def formatTime(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f}{unit}'
+    return f'{seconds / 1e-9:.0f}ns'
+
+
+@click.group()
+def bench() -> None:
+    pass
+
+
+@bench.command()
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='Save results as JSON')
+@click.option('--filter', '-k', 'pattern', default='', help='Run benchmarks containing PATTERN')
+@click.option('--min-time', default=.1, help='Minimal measured time of a case (s)')
+@click.option('--max-time', default=1., help='Maximal time of a case including the setup (s)')
+@click.option('--min-calls', default=5, help='Minimal number of measured calls of a case')
+@click.option('--max-calls', default=10000, help='Maximal number of measured calls of a case')
+def run(output: typing.Optional[str], pattern: str, **kwargs) -> None:
+    '''
+    Runs the benchmarks.
+    '''
+    results = []
+    for bench in BENCHMARKS:
+        if pattern not in bench.name:
+            continue
+        for params in bench.getParams():
+            result = runBenchmark(bench=bench, params=params, **kwargs)
+            results.append(result)
+            click.echo(f'{getKey(result)}: {formatTime(result["median"])}')
+    data = dict(
+        commit=getCommit(), date=datetime.datetime.now().isoformat(timespec='seconds'),
+        python=platform.python_version(), machine=platform.machine(), results=results)
+    if output is not None:
+        with open(output, 'w') as file:
+            json.dump(data, file, indent=2)
+
+
+@bench.command()
+@click.option('--threshold', default=.1, help='Relative change reported as a regression')
+@click.option('--statistic', default='median', type=click.Choice(['min', 'median', 'mean']),
+              help='Compared duration statistic')
+@click.argument('baseline', type=click.File())
+@click.argument('current', type=click.File())
+def compare(threshold: float, statistic: str, baseline: typing.TextIO,
+            current: typing.TextIO) -> None:
+    '''
+    Compares durations of two benchmark runs, exits with an error on regressions.
+    '''
+    baseline_results = {getKey(result): result for result in json.load(baseline)['results']}
+    regressions = 0
+    for result in json.load(current)['results']:
+        key = getKey(result)
+        if key not in baseline_results:
+            continue
+        before, after = baseline_results[key][statistic], result[statistic]
+        ratio = after / before
+        color = None
+        if ratio > 1 + threshold:
+            color = 'red'
+            regressions += 1
+        elif ratio < 1 - threshold:
+            color = 'green'
+        click.secho(f'{key}: {formatTime(before)} -> {formatTime(after)} ({ratio:.2f}x)',
+                    fg=color)
+    if regressions > 0:
+        click.secho(f'{regressions} regressions', fg='red')
+        exit(1)
@@ -2,11 +2,12 @@ import os
 import typing
 
 import click
+import numpy as np
 import pandas as pd
 import seaborn as sns
 import matplotlib.pylab as plt
 
-HeatMapData = typing.List[typing.List[float]]
+HeatMapData = typing.Union[typing.List[typing.List[float]], np.ndarray]
 
 
 class HeatMap:
@@ -15,13 +16,10 @@ class HeatMap:
     max_value: float
 
     def __init__(self, data: HeatMapData, title: str, max_value: float, skip: int = 0):
+        self.data = pd.DataFrame(data=data)
         if skip > 0:
-            new_data = []
-            for lane in data:
-                new_data.append(lane[skip:-skip])
-        else:
-            new_data = data
-        self.data = pd.DataFrame(data=new_data)
+            self.data = self.data.iloc[:, skip:-skip]
+            self.data.columns = range(self.data.shape[1])
         self.title = title
         self.max_value = max_value
 
@@ -104,7 +102,7 @@ def main(title: str, ylim: float, output: typing.Optional[str], prefix: str, ski
             data = current
 
     data /= len(files)
-    heatmap = HeatMap(data.values.tolist(), title=title, max_value=ylim, skip=skip)
+    heatmap = HeatMap(data.values, title=title, max_value=ylim, skip=skip)
     if output is not None:
         heatmap.save(output, prefix, only_data=False)
     else:
@@ -2,11 +2,12 @@ import os
 import typing
 
 import click
+import numpy as np
 import pandas as pd
 import seaborn as sns
 import matplotlib.pylab as plt
 
-VelocityData = typing.List[typing.List[float]]
+VelocityData = typing.Union[typing.List[typing.List[float]], np.ndarray]
 
 
 class VelocityChart:
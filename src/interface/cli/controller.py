@@ -1,7 +1,9 @@
+import contextlib
 import os
 import typing
 import click
 
+import numpy as np
 import pandas as pd
 
 from charts.heatmap import HeatMap
@@ -9,14 +11,32 @@ from charts.velocity import VelocityChart
 from charts.travel import TravelHistogram
 
 from simulator.simulator import Simulator
-from simulator.statistics.averageresult import AverageResult
 from simulator.statistics.collector import Collector, Statistics
+from simulator.statistics.metricswriter import MetricsWriter
+from simulator.statistics.spacetime import SpaceTimeCollector
 from simulator.statistics.tracker import Tracker
 from simulator.statistics.vehicletype import VehicleType
 
 from util.format import OptionalFormat
 
 
+def getTravelData(collector: Collector) -> pd.DataFrame:
+    '''
+    Prepares the travel time histogram data of a collector.
+    :param collector: collector gathering the travel times.
+    :return: percentages of all the vehicle types interleaved for every travel time.
+    '''
+    travel = np.stack(
+        [collector.travel, collector.travel_autonomous, collector.travel_conventional], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentages = travel / travel.sum(axis=0) * 100
+    return pd.DataFrame({
+        'x': np.repeat(np.arange(collector._travelLimit), 3),
+        'y': percentages.ravel(),
+        'type': np.tile(['All', 'Autonomous', 'Conventional'], collector._travelLimit),
+    })
+
+
 class Controller:
     simulator: Simulator
 
@@ -24,9 +44,20 @@ class Controller:
         self.simulator = simulator
 
     def run(self, steps: int, skip: int, statistics: Statistics, no_charts: bool,
-            output: typing.Optional[str] = None, prefix: str = '') -> None:
+            output: typing.Optional[str] = None, prefix: str = '', space_time: int = 0,
+            metrics: bool = False) -> None:
         with Collector(simulator=self.simulator, statistics=statistics, skip=skip) as collector, \
-                Tracker(simulator=self.simulator, buffer_size=steps - skip) as tracker:
+                Tracker(simulator=self.simulator, skip=skip) as tracker, \
+                contextlib.ExitStack() as stack:
+            space_time_collector = None
+            if space_time > 0:
+                path = None if output is None else os.path.join(output, f'{prefix}_spacetime.npy')
+                space_time_collector = stack.enter_context(SpaceTimeCollector(
+                    simulator=self.simulator, skip=skip, every=space_time, path=path))
+            if metrics and output is not None:
+                stack.enter_context(MetricsWriter(
+                    simulator=self.simulator, tracker=tracker,
+                    path=os.path.join(output, f'{prefix}_metrics')))
 
             def show_stats(_: typing.Any) -> str:
                 return '{:.2f}|{:.2f}|{:.2f} (Average|Conventional|Autonomous)'.format(
@@ -59,18 +90,10 @@ class Controller:
 
             if statistics & Statistics.VELOCITY:
                 click.secho('Generating speed charts', fg='blue')
-
-                def mapper(x: AverageResult) -> float:
-                    return x.toZeroFloat()
-
-                velocity = \
-                    [list(map(mapper, lane)) for lane in collector.velocity]
-                autonomous = \
-                    [list(map(mapper, lane)) for lane in collector.velocity_autonomous]
-                conventional = \
-                    [list(map(mapper, lane)) for lane in collector.velocity_conventional]
                 velocity = VelocityChart(
-                    car=velocity, autonomous=autonomous, conventional=conventional)
+                    car=collector.getVelocity(VehicleType.ANY),
+                    autonomous=collector.getVelocity(VehicleType.AUTONOMOUS),
+                    conventional=collector.getVelocity(VehicleType.CONVENTIONAL))
                 if output is not None:
                     velocity.save(path=output, prefix=f'{prefix}_speed', only_data=no_charts)
                 else:
@@ -79,19 +102,7 @@ class Controller:
             if statistics & Statistics.TRAVEL_TIME:
                 click.secho('Generating travel time histogram', fg='blue')
 
-                df = pd.DataFrame(columns=['x', 'y', 'type'])
-                n = sum(collector.travel)
-                na = sum(collector.travel_autonomous)
-                nc = sum(collector.travel_conventional)
-                for i in range(collector._travelLimit):
-                    df = df.append({'x': i, 'y': collector.travel[i] / n * 100,
-                                    'type': 'All'}, ignore_index=True)
-                    df = df.append({'x': i, 'y': collector.travel_autonomous[i] / na * 100,
-                                    'type': 'Autonomous'}, ignore_index=True)
-                    df = df.append({'x': i, 'y': collector.travel_conventional[i] / nc * 100,
-                                    'type': 'Conventional'}, ignore_index=True)
-
-                travel = TravelHistogram(data=df)
+                travel = TravelHistogram(data=getTravelData(collector))
                 if output is not None:
                     travel.save(path=output, prefix=prefix, only_data=no_charts)
                 else:
@@ -103,3 +114,7 @@ class Controller:
                 data.to_csv(os.path.join(output, f'{prefix}_average.csv'), index=False)
             else:
                 click.echo(data.to_csv(index=False))
+
+            if space_time_collector is not None:
+                click.secho('Saving space-time diagram', fg='blue')
+                click.echo(space_time_collector.save())
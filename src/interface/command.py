@@ -1,4 +1,3 @@
-import random
 import typing
 import click
 import click_config_file
@@ -9,11 +8,22 @@ from interface.gui.controller import Controller as GUIController
 from interface.cli.controller import Controller as CLIController
 
 from simulator.dispatcher.emergency import EmergencyDispatcher
+from simulator.engine.batch import BatchEngine
+from simulator.road.array import ArrayRoad
 from simulator.road.dense import DenseRoad
+from simulator.road.sparse import SparseRoad
 from simulator.road.speedcontroller import SpeedController
 from simulator.simulator import Simulator
 from simulator.statistics.collector import Statistics
 from simulator.vehicle.conventional import Driver
+from util import rand
+
+# Available road implementations.
+ROADS = {
+    'dense': DenseRoad,
+    'array': ArrayRoad,
+    'sparse': SparseRoad,
+}
 
 
 def configProvider(file_path: str, cmd: str) -> typing.Dict[str, typing.Any]:
@@ -27,6 +37,8 @@ def configProvider(file_path: str, cmd: str) -> typing.Dict[str, typing.Any]:
 @click.option('--length', default=100, help='Road length')
 @click.option('--width', default=1, help='Lane width')
 @click.option('--lanes', default=6, help='Number of lanes')
+@click.option('--road', default='dense', type=click.Choice(list(ROADS)),
+              help='Road implementation')
 # Speed controller options.
 @click.option('--max-speed', default=5, help='Road maximum speed')
 @click.option('--obstacles', multiple=True, default=[], type=ObstacleParamType())
@@ -42,15 +54,29 @@ def configProvider(file_path: str, cmd: str) -> typing.Dict[str, typing.Any]:
 @click.option('--symmetry', default=False, is_flag=True, help='Do not use left lane to overtake')
 @click.option('--limit', default=0, help='Difference in maximum speed between vehicles')
 # Other options.
-@click.option('--seed', type=int, help='Seed for the RNG')
+@click.option('--engine', default='object', type=click.Choice(['object', 'batch']),
+              help='Simulation engine, batch engine requires a single lane road')
+@click.option('--seed', type=int, help='Seed of all the random number streams')
+@click.option('--restore', type=click.Path(dir_okay=False, exists=True),
+              help='Continue a saved simulation, other options except seed are ignored')
 # Configuration file option.
 @click_config_file.configuration_option(provider=configProvider, implicit=False)
 @click.pass_context
 def command(ctx: click.Context, **kwargs) -> None:
+    ctx.obj = buildSimulator(**kwargs)
+
+
+def buildSimulator(**kwargs) -> Simulator:
+    '''
+    Creates a simulator from the command line options.
+    :param kwargs: command options.
+    :return: simulator with vehicles scattered on the road.
+    '''
     # Extract options.
     length: int = kwargs['length']
     width: int = kwargs['width']
     lanes: int = kwargs['lanes']
+    road_type: str = kwargs['road']
     max_speed: int = kwargs['max_speed']
     density: float = kwargs['density']
     dispatch: int = kwargs['dispatch']
@@ -63,12 +89,23 @@ def command(ctx: click.Context, **kwargs) -> None:
     limit: int = kwargs['limit']
     obstacles: typing.List[ObstacleValue] = kwargs['obstacles']
     seed: typing.Optional[int] = kwargs['seed']
-    # Initialize random number generator.
+    engine_type: str = kwargs['engine']
+    restore: typing.Optional[str] = kwargs['restore']
+    # Restore a saved simulation, a new seed forks it.
+    if restore is not None:
+        simulator = Simulator.load(file_path=restore)
+        if seed is not None:
+            rand.seed(seed)
+        return simulator
+    if engine_type == 'batch' and (lanes != 1 or width != 1):
+        raise click.BadParameter('batch engine requires a single lane road, use --lanes 1 '
+                                 '--width 1', param_hint='--engine')
+    # Initialize random number streams.
     if seed is not None:
-        random.seed(seed)
+        rand.seed(seed)
     # Create a road.
     speed_controller = SpeedController(max_speed=max_speed)
-    road = DenseRoad(
+    road = ROADS[road_type](
         length=length, lanes_count=lanes, lane_width=width, controller=speed_controller)
     # Add obstacles.
     for obstacle in obstacles:
@@ -79,9 +116,10 @@ def command(ctx: click.Context, **kwargs) -> None:
         count=dispatch, road=road, penetration=penetration,
         driver=driver, length=car_length, limit=limit, emergency_rate=emergency)
     # Create the simulator and scatter vehicles.
-    simulator = Simulator(road=road, dispatcher=dispatcher)
+    engine = BatchEngine(road=road) if engine_type == 'batch' else None
+    simulator = Simulator(road=road, dispatcher=dispatcher, engine=engine)
     simulator.scatterVehicles(density=density)
-    ctx.obj = simulator
+    return simulator
 
 
 @command.command()
@@ -94,6 +132,7 @@ def gui(ctx: click.Context, step: int, fps: int, buffer: int, quiet: int) -> Non
     simulator: Simulator = ctx.obj
     for _ in range(quiet):
         simulator.step()
+    simulator.sync()
     controller = GUIController(simulator=simulator)
     controller.run(speed=step, refresh=fps, buffer=buffer)
 
@@ -105,6 +144,8 @@ def gui(ctx: click.Context, step: int, fps: int, buffer: int, quiet: int) -> Non
 # Output parameters.
 @click.option('--output', '-o', type=click.Path(file_okay=False), help='Output directory')
 @click.option('--prefix', '-p', default='', help='Output files name prefix')
+@click.option('--checkpoint', type=click.Path(dir_okay=False),
+              help='Save the simulation after the last step')
 # Statistics generation.
 @click.option('--no-charts', is_flag=True, help='Do not generate charts')
 @click.option('--all-statistics', is_flag=True, help='Disable all statistics')
@@ -112,9 +153,15 @@ def gui(ctx: click.Context, step: int, fps: int, buffer: int, quiet: int) -> Non
 @click.option('--heatmap', is_flag=True, help='Toggle heatmap statistics')
 @click.option('--throughput', is_flag=True, help='Toggle throughput statistics')
 @click.option('--travel', is_flag=True, help='Toggle travel time statistics')
+@click.option('--space-time', default=0,
+              help='Record the space-time diagram of every n-th step, 0 to disable')
+@click.option('--metrics', is_flag=True,
+              help='Stream the tracker metrics of every step to the output directory')
 @click.pass_context
 def cli(ctx: click.Context, all_statistics: bool, velocity: bool, heatmap: bool, throughput: bool,
-        travel: bool, **kwargs):
+        travel: bool, checkpoint: typing.Optional[str], **kwargs):
+    if kwargs['metrics'] and kwargs['output'] is None:
+        raise click.UsageError('--metrics requires --output')
     controller = CLIController(simulator=ctx.obj)
     statistics = Statistics.ALL if all_statistics else Statistics.NONE
     if velocity:
@@ -126,3 +173,5 @@ def cli(ctx: click.Context, all_statistics: bool, velocity: bool, heatmap: bool,
     if travel:
         statistics ^= statistics.TRAVEL_TIME
     controller.run(statistics=statistics, **kwargs)
+    if checkpoint is not None:
+        ctx.obj.save(file_path=checkpoint)
@@ -0,0 +1,24 @@
+import unittest
+
+from click.testing import CliRunner
+
+from interface.command import command
+
+
+class CommandTestCase(unittest.TestCase):
+    def test_engine__lanes(self):
+        runner = CliRunner()
+        result = runner.invoke(command, ['--engine', 'batch', 'cli'])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('batch engine requires a single lane road', result.output)
+        self.assertIn('--engine', result.output)
+
+    def test_engine__single_lane(self):
+        runner = CliRunner()
+        result = runner.invoke(command, ['--engine', 'batch', '--lanes', '1', '--seed', '1',
+                                         'cli', '--steps', '5', '--no-charts'])
+        self.assertEqual(result.exit_code, 0, result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,19 +1,19 @@
 import contextlib
+import typing
 
 # Suppress the pygame welcome message.
 from simulator.statistics.vehicletype import VehicleType
-from simulator.vehicle.emergency import EmergencyCar
 
 with contextlib.redirect_stdout(None):
     import pygame
 
 from interface.gui.colors import Colors, gradient, Color
 from simulator.simulator import Simulator
+from simulator.statistics.averageresult import AverageResult
 from simulator.statistics.tracker import Tracker
-from simulator.vehicle.autonomous import AutonomousCar
-from simulator.vehicle.car import Car
 from simulator.vehicle.obstacle import Obstacle
-from simulator.vehicle.vehicle import Vehicle
+from simulator.vehicle.vehicle import Vehicle, VehicleKind, isKind
+from util.cumulativearray import CumulativeArray
 from util.format import OptionalFormat
 
 CL_OBSTACLE = Colors.DARK
@@ -35,6 +35,8 @@ class Controller:
     passed: float
     speed: float
     clock: pygame.time.Clock
+    # Velocities of the last steps shown in the statistics.
+    velocity: typing.Dict[VehicleType, CumulativeArray]
 
     def __init__(self, simulator: Simulator):
         self.simulator = simulator
@@ -51,11 +53,16 @@ class Controller:
         self.running = True
         self.clock = pygame.time.Clock()
         # Initialize statistics.
-        with Tracker(simulator=self.simulator, buffer_size=buffer) as tracker:
+        self.velocity = {vehicle_type: CumulativeArray(buffer, (0, 0))
+                         for vehicle_type in VehicleType}
+        with Tracker(simulator=self.simulator) as tracker:
             while self.running:
                 self._updateEvents()
                 if self._updateTime():
                     self.simulator.step()
+                    for vehicle_type, velocity in self.velocity.items():
+                        sample = tracker.getLastSample('velocity', vehicle_type)
+                        velocity.append(value=sample.value, count=sample.count)
 
                 self.screen.fill(CL_ROAD)
                 self._drawVehicles(self.passed / self.speed)
@@ -67,7 +74,7 @@ class Controller:
 
     def _drawVehicles(self, factor: float) -> None:
         for vehicle in self.simulator.road.getAllVehicles():
-            if isinstance(vehicle, Obstacle):
+            if isKind(vehicle.KIND, VehicleKind.OBSTACLE):
                 self._drawObstacle(vehicle)
             else:
                 self._drawVehicle(vehicle, factor)
@@ -92,11 +99,12 @@ class Controller:
 
     def _getVehicleColor(self, vehicle: Vehicle) -> Color:
         limit = self.simulator.road.controller.getMaxSpeed(vehicle.position, width=vehicle.width)
-        if isinstance(vehicle, AutonomousCar):
+        kind = vehicle.KIND
+        if isKind(kind, VehicleKind.AUTONOMOUS):
             start, end = Colors.PURPLE, Colors.BLUE
-        elif isinstance(vehicle, EmergencyCar):
+        elif isKind(kind, VehicleKind.EMERGENCY):
             start, end = Colors.WHITE, Colors.BLACK
-        elif isinstance(vehicle, Car):
+        elif isKind(kind, VehicleKind.CAR):
             start, end = Colors.RED, Colors.GREEN
         else:
             raise ValueError()
@@ -122,9 +130,9 @@ class Controller:
         font = pygame.font.Font(pygame.font.get_default_font(), self.SIZE)
         statistics = {
             'steps': tracker.steps,
-            'velocity': tracker.getAverageVelocity(VehicleType.ANY),
-            'velocity_autonomous': tracker.getAverageVelocity(VehicleType.AUTONOMOUS),
-            'velocity_conventional': tracker.getAverageVelocity(VehicleType.CONVENTIONAL),
+            'velocity': self._getVelocity(VehicleType.ANY),
+            'velocity_autonomous': self._getVelocity(VehicleType.AUTONOMOUS),
+            'velocity_conventional': self._getVelocity(VehicleType.CONVENTIONAL),
         }
         text = font.render(
             'Steps={steps} | Velocity={velocity:.2f} | '
@@ -135,6 +143,10 @@ class Controller:
         rect.center = (self.width // 2, self.height + self.STATS_SIZE // 2)
         self.screen.blit(text, rect)
 
+    def _getVelocity(self, vehicle_type: VehicleType) -> typing.Optional[float]:
+        value, count = self.velocity[vehicle_type].value()
+        return AverageResult(value=value, count=count).toMaybeFloat()
+
 
 def withOptionalFormat(statistics):
     return {k: OptionalFormat(v) for k, v in statistics.items()}
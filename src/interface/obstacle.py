@@ -48,4 +48,4 @@ def addObstacle(road: Road, obstacle: ObstacleValue) -> None:
     width = road.lane_width
     position = road.getRelativePosition(position=(end, lane))
     obstacle = Obstacle(position=position, width=width, length=length)
-    road.addVehicle(obstacle)
+    road.addObstacle(obstacle)
@@ -0,0 +1,195 @@
+import contextlib
+import itertools
+import os
+import shlex
+import typing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import click
+import pandas as pd
+
+from charts.heatmap import HeatMap
+from charts.travel import TravelHistogram
+from interface.cli.controller import getTravelData
+from interface.command import command, buildSimulator
+from simulator.statistics.collector import Collector, Statistics
+from simulator.statistics.tracker import Tracker
+
+# Columns identifying a single run besides the swept parameters.
+RUN_COLUMNS = ['replicate', 'seed']
+# Columns of the configuration shared by all the runs, a sweep is resumed only with the same one.
+CONFIG_COLUMNS = ['steps', 'skip', 'args']
+
+
+class Run(typing.NamedTuple):
+    values: typing.Tuple[str, ...]
+    replicate: int
+    seed: int
+    args: typing.List[str]
+    # Prefix of the files collected by the run.
+    prefix: str
+
+
+def parseGrid(grid: typing.Tuple[str, ...]) -> typing.List[typing.Tuple[str, typing.List[str]]]:
+    '''
+    Parses the swept parameters.
+    :param grid: parameters in NAME=VALUE,VALUE,... format.
+    :return: parameter names and their values.
+    '''
+    parameters = []
+    for parameter in grid:
+        name, separator, values = parameter.partition('=')
+        if not separator or not values:
+            raise click.BadParameter(f'{parameter} is not in NAME=VALUE,... format')
+        parameters.append((name.lstrip('-'), values.split(',')))
+    return parameters
+
+
+def getRuns(parameters: typing.List[typing.Tuple[str, typing.List[str]]],
+            args: typing.Tuple[str, ...], replicates: int, seed: int) -> typing.List[Run]:
+    '''
+    Creates all the runs of a sweep, every run has its own seed.
+    :param parameters: swept parameters.
+    :param args: simulation options shared by all the runs.
+    :param replicates: number of runs for every parameter combination.
+    :param seed: seed of the first run.
+    :return: runs of the sweep.
+    '''
+    runs = []
+    names = [name for name, _ in parameters]
+    combinations = itertools.product(*[values for _, values in parameters])
+    for i, values in enumerate(combinations):
+        options = []
+        for name, value in zip(names, values):
+            options.extend([f'--{name}', value])
+        for replicate in range(replicates):
+            run_seed = seed + i * replicates + replicate
+            prefix = '__'.join([*(f'{name}-{value}' for name, value in zip(names, values)),
+                                f'{replicate:02d}'])
+            runs.append(Run(values=values, replicate=replicate, seed=run_seed,
+                            args=[*args, *options, '--seed', str(run_seed)], prefix=prefix))
+    return runs
+
+
+def getFinishedRuns(output: str, names: typing.List[str], config: typing.Dict[str, str]) \
+        -> typing.Set[typing.Tuple[typing.Tuple[str, ...], int, int]]:
+    '''
+    Reads the runs already stored in the output file, the runs have to share the configuration.
+    :param output: consolidated output file.
+    :param names: swept parameter names.
+    :param config: configuration shared by all the runs.
+    :return: parameter values, replicates and seeds of the finished runs.
+    '''
+    if not os.path.exists(output) or os.path.getsize(output) == 0:
+        return set()
+    data = pd.read_csv(output, header=0, dtype=str, keep_default_na=False)
+    columns = [*names, *RUN_COLUMNS, *CONFIG_COLUMNS]
+    if data.columns.tolist()[:len(columns)] != columns:
+        raise click.ClickException(
+            f'{output} does not start with columns {",".join(columns)}, use a new output file')
+    for name, value in config.items():
+        if (data[name] != value).any():
+            raise click.ClickException(
+                f'{output} contains runs with a different {name}, use a new output file')
+    return set(zip(map(tuple, data[names].values.tolist()),
+                   data['replicate'].astype(int), data['seed'].astype(int)))
+
+
+def appendResults(output: str, data: pd.DataFrame) -> None:
+    '''
+    Appends the results of a run to the output file, the columns have to match its header.
+    :param output: consolidated output file.
+    :param data: results of a run.
+    :return: None.
+    '''
+    if not os.path.exists(output) or os.path.getsize(output) == 0:
+        data.to_csv(output, index=False)
+        return
+    header = pd.read_csv(output, nrows=0).columns.tolist()
+    if header != data.columns.tolist():
+        raise click.ClickException(
+            f'columns of {output} do not match the results, use a new output file')
+    data.to_csv(output, mode='a', header=False, index=False)
+
+
+def runSimulation(args: typing.List[str], steps: int, skip: int,
+                  collect: typing.Optional[str] = None, prefix: str = '') -> pd.DataFrame:
+    '''
+    Runs a single simulation in the current process.
+    :param args: simulation options.
+    :param steps: number of steps.
+    :param skip: number of steps skipped before collecting statistics.
+    :param collect: directory to save the heat map and travel time data to, not saved if None.
+    :param prefix: prefix of the saved files.
+    :return: average statistics.
+    '''
+    ctx = command.make_context('sweep', list(args))
+    simulator = buildSimulator(**ctx.params)
+    with Tracker(simulator=simulator, skip=skip) as tracker, contextlib.ExitStack() as stack:
+        collector = None
+        if collect is not None:
+            collector = stack.enter_context(Collector(
+                simulator=simulator, statistics=Statistics.HEAT_MAP | Statistics.TRAVEL_TIME,
+                skip=skip))
+        for _ in range(steps):
+            simulator.step()
+        if collector is not None:
+            HeatMap(data=collector.getHeatMap(), title='Traffic density', max_value=1).save(
+                path=collect, prefix=f'{prefix}_traffic', only_data=True)
+            TravelHistogram(data=getTravelData(collector)).save(
+                path=collect, prefix=prefix, only_data=True)
+        return tracker.getAverageData()
+
+
+@click.command()
+@click.option('--param', '-P', 'grid', multiple=True,
+              help='Swept simulation option in NAME=VALUE,VALUE,... format')
+@click.option('--replicates', '-n', default=1, help='Number of runs for every combination')
+@click.option('--steps', default=1000, help='Number of simulation steps')
+@click.option('--skip', default=0, help='Skip first n steps')
+@click.option('--seed', default=0, help='Seed of the first run')
+@click.option('--workers', '-j', type=int, help='Number of processes, all cores by default')
+@click.option('--output', '-o', required=True, type=click.Path(dir_okay=False),
+              help='Consolidated output file, finished runs are not repeated')
+@click.option('--collect', type=click.Path(file_okay=False),
+              help='Save the heat map and travel time data of every run to a directory')
+@click.argument('args', nargs=-1, type=click.UNPROCESSED)
+def sweep(grid: typing.Tuple[str, ...], replicates: int, steps: int, skip: int, seed: int,
+          workers: typing.Optional[int], output: str, collect: typing.Optional[str],
+          args: typing.Tuple[str, ...]) -> None:
+    '''
+    Runs simulations for all the combinations of the swept options, the remaining ARGS are
+    passed to every simulation.
+    '''
+    if skip >= steps:
+        raise click.BadParameter('must be lower than the number of steps', param_hint='--skip')
+    parameters = parseGrid(grid)
+    names = [name for name, _ in parameters]
+    config = {'steps': str(steps), 'skip': str(skip), 'args': ' '.join(map(shlex.quote, args))}
+    finished = getFinishedRuns(output=output, names=names, config=config)
+    runs = [run for run in getRuns(parameters=parameters, args=args, replicates=replicates,
+                                   seed=seed)
+            if (run.values, run.replicate, run.seed) not in finished]
+    click.secho(f'{len(finished)} runs finished, {len(runs)} remaining', fg='blue')
+    if collect is not None:
+        os.makedirs(collect, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(runSimulation, run.args, steps, skip, collect, run.prefix): run
+                   for run in runs}
+        with click.progressbar(as_completed(futures), len(futures)) as bar:
+            for future in bar:
+                run = futures[future]
+                data = future.result()
+                values = [*run.values, run.replicate, run.seed,
+                          *(config[name] for name in CONFIG_COLUMNS)]
+                for i, (column, value) in enumerate(zip(
+                        [*names, *RUN_COLUMNS, *CONFIG_COLUMNS], values)):
+                    data.insert(i, column, value)
+                # Results are stored right away, so an interrupted sweep can be resumed.
+                try:
+                    appendResults(output=output, data=data)
+                except click.ClickException:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
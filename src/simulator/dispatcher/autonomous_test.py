@@ -9,7 +9,9 @@ from simulator.dispatcher.dispatcher_test import implementsDispatcher
 @implementsDispatcher
 class AutonomousDispatcherTestCase(unittest.TestCase):
     def getDispatcher(self) -> Dispatcher:
-        return AutonomousDispatcher(road=Mock(), count=1)
+        road = Mock(lane_width=1)
+        road.controller.getMaxSpeed.return_value = 5
+        return AutonomousDispatcher(road=road, count=1)
 
 
 if __name__ == '__main__':
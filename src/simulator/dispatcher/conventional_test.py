@@ -10,7 +10,9 @@ from simulator.vehicle.conventional import Driver
 @implementsDispatcher
 class CarDispatcherTestCase(unittest.TestCase):
     def getDispatcher(self) -> Dispatcher:
-        return ConventionalDispatcher(road=Mock(), count=1, driver=Driver())
+        road = Mock(lane_width=1)
+        road.controller.getMaxSpeed.return_value = 5
+        return ConventionalDispatcher(road=road, count=1, driver=Driver())
 
 
 if __name__ == '__main__':
@@ -1,9 +1,7 @@
-import random
-
 from simulator.position import Position
 from simulator.road.road import Road
 from simulator.vehicle.vehicle import Vehicle
-from util.rand import shuffled
+from util.rand import dispatcher_random
 
 
 class Dispatcher:
@@ -23,20 +21,29 @@ class Dispatcher:
         Adds vehicles to the road.
         :return: None.
         '''
-        self.remaining += random.randint(0, self.count)
-        for lane in shuffled(range(self.road.lanes_count)):
+        self.remaining += dispatcher_random.randint(0, self.count)
+        for lane in dispatcher_random.shuffled(range(self.road.lanes_count)):
             if self.remaining <= 0:
                 return
-            # Check if position is not occupied.
+            # Check if position is not occupied before creating the vehicle.
             position = self.road.getRelativePosition(position=(self.length - 1, lane))
-            vehicle = self._newVehicle(position=position)
-            vehicle.setStatistics(start=step)
-            if not self.road.canPlaceVehicle(vehicle=vehicle):
+            if not self._canPlaceVehicle(position=position):
                 continue
             # Add the vehicle.
+            vehicle = self._newVehicle(position=position)
+            vehicle.setStatistics(start=step)
             self.road.addVehicle(vehicle=vehicle)
             self.remaining -= 1
 
+    def _canPlaceVehicle(self, position: Position) -> bool:
+        '''
+        Checks if a new vehicle can be placed at a given position without creating it.
+        :param position: vehicle position.
+        :return: if a vehicle can be placed.
+        '''
+        return self.road.isSafeArea(
+            position=position, length=self.length, width=self.road.lane_width)
+
     def _newVehicle(self, position: Position) -> Vehicle:
         '''
         Generates new vehicle at a given position.
@@ -25,12 +25,12 @@ class DispatcherTestCase(unittest.TestCase):
         with self.assertRaises(NotImplementedError, msg='expected _newVehicle to be virtual'):
             dispatcher._newVehicle(position=(0, 0))
 
-    @patch('random.randint')
+    @patch('util.rand.dispatcher_random.randint')
     def test_dispatch__count(self, mocked_random):
         road = Mock(lanes_count=1, lane_width=1)
         road.lanes_count = 1
         road.sublanesCount = lambda _: 1
-        road.canPlaceVehicle = Mock(return_value=False)
+        road.isSafeArea = Mock(return_value=False)
         road.getRelativePosition = lambda position: position
 
         # Check no vehicles added if random is zero.
@@ -39,7 +39,7 @@ class DispatcherTestCase(unittest.TestCase):
         dispatcher._newVehicle = Mock(return_value=vehicle)
         mocked_random.return_value = 0
         dispatcher.dispatch(step=0)
-        road.canPlaceVehicle.assert_not_called()
+        road.isSafeArea.assert_not_called()
         road.addVehicle.assert_not_called()
         self.assertEqual(dispatcher.remaining, 0)
 
@@ -47,13 +47,15 @@ class DispatcherTestCase(unittest.TestCase):
         road.reset_mock()
         mocked_random.return_value = 1
         dispatcher.dispatch(step=0)
-        road.canPlaceVehicle.assert_called()
+        road.isSafeArea.assert_called()
         road.addVehicle.assert_not_called()
+        # Vehicles are not created for the occupied lanes.
+        dispatcher._newVehicle.assert_not_called()
         self.assertEqual(dispatcher.remaining, 1)
 
         # Check remaining vehicles are added.
         road.reset_mock()
-        road.canPlaceVehicle.return_value = True
+        road.isSafeArea.return_value = True
         vehicle = Mock(length=1)
         vehicle.position = (42, 42)
 
@@ -64,13 +66,13 @@ class DispatcherTestCase(unittest.TestCase):
         dispatcher._newVehicle = mock_newVehicle
         mocked_random.return_value = 0
         dispatcher.dispatch(step=42)
-        road.canPlaceVehicle.assert_called_with(vehicle=vehicle)
+        road.isSafeArea.assert_called_with(position=(0, 0), length=1, width=1)
         road.addVehicle.assert_called_with(vehicle=vehicle)
         self.assertEqual(vehicle.position, (0, 0))
         self.assertEqual(dispatcher.remaining, 0)
         vehicle.setStatistics.assert_called_once_with(start=42)
 
-    @patch('random.randint')
+    @patch('util.rand.dispatcher_random.randint')
     def test_dispatch__width(self, mocked_random):
         '''
         Warning! Potentially flaky test, due to testing a random function.
@@ -79,7 +81,7 @@ class DispatcherTestCase(unittest.TestCase):
         '''
         road = Mock(lanes_count=2, lane_width=2)
         road.sublanesCount = property(lambda _: 6)
-        road.canPlaceVehicle = Mock(return_value=True)
+        road.isSafeArea = Mock(return_value=True)
 
         def mock_getRelativePosition(position: Position) -> Position:
             x, lane = position
@@ -105,10 +107,10 @@ class DispatcherTestCase(unittest.TestCase):
             self.assertIn(lane, [1, 3], msg='vehicle dispatched between lanes')
             self.assertEqual(x, 0)
 
-    @patch('random.randint')
+    @patch('util.rand.dispatcher_random.randint')
     def test_dispatch__length(self, mocked_random):
         road = Mock(lanes_count=1, lane_width=1)
-        road.canPlaceVehicle = Mock(return_value=True)
+        road.isSafeArea = Mock(return_value=True)
         road.getRelativePosition = lambda position: position
         mocked_random.return_value = 1
         dispatcher = Dispatcher(road=road, count=1, length=2)
@@ -122,7 +124,7 @@ class DispatcherTestCase(unittest.TestCase):
 
         dispatcher._newVehicle = mock_newVehicle
         dispatcher.dispatch(step=42)
-        road.canPlaceVehicle.assert_called_with(vehicle=vehicle)
+        road.isSafeArea.assert_called_with(position=(1, 0), length=2, width=1)
         road.addVehicle.assert_called_with(vehicle=vehicle)
         self.assertEqual(vehicle.position, (1, 0))
         vehicle.setStatistics.assert_called_once_with(start=42)
@@ -140,7 +142,7 @@ class DispatcherTestCase(unittest.TestCase):
 
         dispatcher._newVehicle = mock_newVehicle
         dispatcher.dispatch(step=42)
-        road.canPlaceVehicle.assert_called_with(vehicle=vehicle)
+        road.isSafeArea.assert_called_with(position=(3, 0), length=4, width=1)
         road.addVehicle.assert_called_with(vehicle=vehicle)
         self.assertEqual(vehicle.position, (3, 0))
         vehicle.setStatistics.assert_called_once_with(start=42)
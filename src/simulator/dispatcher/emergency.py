@@ -21,11 +21,11 @@ class EmergencyDispatcher(MixedDispatcher):
 
         if self.emergency:
             position = (self.length - 1, self.road.emergencyLane)
-            speed = self.road.controller.getMaxSpeed(position, width=self.road.lane_width)
-            vehicle = EmergencyCar(position=position, velocity=speed, road=self.road,
-                                   length=self.length, width=self.road.lane_width)
             # Add the vehicle if possible.
-            if self.road.canPlaceVehicle(vehicle=vehicle):
+            if self._canPlaceVehicle(position=position):
+                speed = self.road.controller.getMaxSpeed(position, width=self.road.lane_width)
+                vehicle = EmergencyCar(position=position, velocity=speed, road=self.road,
+                                       length=self.length, width=self.road.lane_width)
                 self.road.addEmergencyVehicle(vehicle=vehicle)
                 self.emergency = False
 
@@ -1,11 +1,10 @@
-import random
-
 from simulator.dispatcher.dispatcher import Dispatcher
 from simulator.position import Position
 from simulator.road.road import Road
 from simulator.vehicle.conventional import ConventionalCar, Driver
 from simulator.vehicle.autonomous import AutonomousCar
 from simulator.vehicle.vehicle import Vehicle
+from util.rand import dispatcher_random
 
 
 class MixedDispatcher(Dispatcher):
@@ -21,12 +20,12 @@ class MixedDispatcher(Dispatcher):
         self.limit = limit
 
     def _newVehicle(self, position: Position) -> Vehicle:
-        limit = random.randint(-self.limit, self.limit)
+        limit = dispatcher_random.randint(-self.limit, self.limit)
         speed = self.road.controller.getMaxSpeed(position, width=self.road.lane_width) + limit
         params = dict(
             position=position, velocity=speed, road=self.road,
             length=self.length, width=self.road.lane_width, limit=limit)
-        if random.random() < self.penetration:
+        if dispatcher_random.random() < self.penetration:
             return AutonomousCar(**params)
         else:
             return ConventionalCar(**params, driver=self.driver)
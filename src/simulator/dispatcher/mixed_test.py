@@ -11,14 +11,14 @@ from simulator.vehicle.conventional import ConventionalCar, Driver
 @implementsDispatcher
 class MixedDispatcherTestCase(unittest.TestCase):
     def getDispatcher(self) -> Dispatcher:
-        road = Mock()
+        road = Mock(lane_width=1)
         road.controller = Mock()
         road.controller.getMaxSpeed.return_value = 5
         return MixedDispatcher(road=road, count=1, penetration=.5, driver=Driver())
 
-    @patch('random.random')
+    @patch('util.rand.dispatcher_random.random')
     def test_penetrationRate(self, mocked_random):
-        road = Mock()
+        road = Mock(lane_width=1)
         road.controller = Mock()
         road.controller.getMaxSpeed.return_value = 5
         # Penetration rate 50%.
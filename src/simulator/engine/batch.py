@@ -0,0 +1,228 @@
+import typing
+
+import numpy as np
+
+from simulator.road.road import Road
+from simulator.vehicle.table import TABLE
+from simulator.vehicle.vehicle import Vehicle, VehicleKind
+from util.rand import driver_random, lanes_random
+
+# Vehicle types handled by the engine.
+UNSUPPORTED = -1
+OBSTACLE = 0
+CONVENTIONAL = 1
+AUTONOMOUS = 2
+
+# Arrays of the vehicle state kept by the engine.
+STATE = ('vehicle', 'x', 'velocity', 'last_x', 'last_velocity', 'length', 'width', 'kind',
+         'limit', 'slow', 'static')
+State = typing.Dict[str, np.ndarray]
+
+
+class BatchEngine:
+    '''
+    Performs the Nagel-Schreckenberg update of all the vehicles at once on roads where
+    vehicles cannot change lanes. The state of the vehicles is kept in parallel arrays ordered
+    from the front of the road across the steps, the vehicle objects are updated only when they
+    leave the road or on sync.
+    '''
+    road: Road
+    # State of the vehicles and the obstacles on the road, gathered on the first step.
+    state: typing.Optional[State]
+    # Number of the static obstacles of the road in the state.
+    obstacles: int
+    # Whether the vehicle objects match the state.
+    synced: bool
+
+    def __init__(self, road: Road):
+        if road.sublanesCount != 1:
+            raise ValueError('batch engine supports only single lane roads')
+        self.road = road
+        self.state = None
+        self.obstacles = 0
+        self.synced = True
+
+    def __getstate__(self) -> dict:
+        # Vehicles are synced before the simulation is saved, the state is gathered again.
+        return {'road': self.road}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(road=state['road'])
+
+    def step(self) -> None:
+        '''
+        Performs a single simulation step moving all the vehicles, equivalent to Road.step.
+        :return: None.
+        '''
+        if len(self.road.emergency) > 0:
+            raise ValueError('batch engine does not support emergency vehicles')
+        self.road._clearRemoved()
+        self._update()
+        state = self.state
+        if len(state['vehicle']) == 0:
+            self._commit(velocity=state['velocity'])
+            return
+
+        x, velocity, kind = state['x'], state['velocity'], state['kind']
+        gap = self._getGap(x=x, length=state['length'])
+        self._beforeMove(velocity=velocity, gap=gap, kind=kind)
+        speeds = np.array(self.road.controller.getLaneMaxSpeeds(lane=0, length=self.road.length))
+        limit = np.where(kind == OBSTACLE, 0, speeds[x] + state['limit'])
+        self._commit(velocity=self._move(
+            velocity=velocity, gap=gap, kind=kind, limit=limit, slow=state['slow']))
+
+    def sync(self) -> None:
+        '''
+        Copies the state of the vehicles on the road back to the vehicle objects.
+        :return: None.
+        '''
+        if not self.synced:
+            self._scatter(self.state)
+            self.synced = True
+
+    def _update(self) -> None:
+        '''
+        Gathers the vehicles added to the road since the last step, all the vehicles on the
+        first step.
+        :return: None.
+        '''
+        if self.state is None:
+            self.state = self._gather(vehicles=[], static=False)
+            added = list(self.road.getAllActiveVehicles())
+        else:
+            added = self.road.added
+        self.road.added = []
+        obstacles = self.road.obstacles[self.obstacles:]
+        self.obstacles = len(self.road.obstacles)
+        if len(added) == 0 and len(obstacles) == 0:
+            return
+        parts = (self.state, self._gather(vehicles=added, static=False),
+                 self._gather(vehicles=obstacles, static=True))
+        merged = {name: np.concatenate([part[name] for part in parts]) for name in STATE}
+        # Vehicles are ordered from the front of the road, static obstacles limit the gaps too.
+        order = np.argsort(-merged['x'], kind='stable')
+        self.state = {name: column[order] for name, column in merged.items()}
+
+    def _gather(self, vehicles: typing.List[Vehicle], static: bool) -> State:
+        '''
+        Reads the state of the vehicles through the columns of the vehicle table.
+        :param vehicles: vehicles on the road.
+        :param static: whether the vehicles are static obstacles.
+        :return: state of the vehicles.
+        '''
+        TABLE.store(vehicles)
+        handles = TABLE.getHandles(vehicles)
+        columns = TABLE.columns
+        kinds = columns['kind'][handles]
+        kind = np.full(len(vehicles), UNSUPPORTED, dtype=np.int8)
+        kind[kinds == VehicleKind.OBSTACLE] = OBSTACLE
+        kind[kinds == VehicleKind.CONVENTIONAL] = CONVENTIONAL
+        kind[kinds == VehicleKind.AUTONOMOUS] = AUTONOMOUS
+        if np.any(kind == UNSUPPORTED):
+            vehicle = vehicles[int(np.argmax(kind == UNSUPPORTED))]
+            raise ValueError(f'batch engine does not support {type(vehicle).__name__}')
+        slow = np.zeros(len(vehicles), dtype=np.float64)
+        conventional = np.flatnonzero(kind == CONVENTIONAL)
+        slow[conventional] = [vehicles[i].driver.slow for i in conventional.tolist()]
+        objects = np.empty(len(vehicles), dtype=object)
+        objects[:] = vehicles
+        state = {name: columns[name][handles] for name in
+                 ('x', 'velocity', 'last_x', 'last_velocity', 'length', 'width', 'limit')}
+        state.update(vehicle=objects, kind=kind, slow=slow,
+                     static=np.full(len(vehicles), static, dtype=bool))
+        return state
+
+    def _getGap(self, x: np.ndarray, length: np.ndarray) -> np.ndarray:
+        '''
+        Computes the maximum speed of the vehicles not causing an accident.
+        :param x: vehicle positions.
+        :param length: vehicle lengths.
+        :return: maximum speeds, road length for the first vehicle.
+        '''
+        gap = np.empty_like(x)
+        gap[0] = self.road.length
+        gap[1:] = (x[:-1] - length[:-1] + 1) - x[1:] - 1
+        return gap
+
+    @staticmethod
+    def _beforeMove(velocity: np.ndarray, gap: np.ndarray, kind: np.ndarray) -> None:
+        '''
+        Consumes the random numbers drawn by the lane change attempts of the object model.
+        :return: None.
+        '''
+        cars = kind != OBSTACLE
+        # Vehicles approaching an obstacle try to avoid it first.
+        obstacle = np.zeros_like(cars)
+        obstacle[1:] = (kind[:-1] == OBSTACLE) & (gap[1:] + 1 <= np.maximum(velocity[1:], 1))
+        # Every shuffle of the two lane changes draws a single number.
+        lanes_random.uniform(int(np.count_nonzero(cars)) + int(np.count_nonzero(cars & obstacle)))
+
+    @staticmethod
+    def _move(velocity: np.ndarray, gap: np.ndarray, kind: np.ndarray, limit: np.ndarray,
+              slow: np.ndarray) -> np.ndarray:
+        '''
+        Computes the new velocities of all the vehicles.
+        :return: new velocities.
+        '''
+        conventional = kind == CONVENTIONAL
+        autonomous = kind == AUTONOMOUS
+        # Random slowdown draws in the order of the object model.
+        draws = conventional & (velocity > 0)
+        slowed = np.zeros_like(draws)
+        slowed[draws] = driver_random.uniform(int(np.count_nonzero(draws))) < slow[draws]
+        target = np.where(slowed, velocity - 1, velocity + 1)
+        # Autonomous vehicles use the velocity of an autonomous vehicle in front.
+        bonus = np.zeros_like(autonomous)
+        bonus[1:] = autonomous[1:] & autonomous[:-1]
+        result = np.zeros_like(velocity)
+        while True:
+            ahead = np.zeros_like(result)
+            ahead[1:] = np.where(bonus[1:], result[:-1], 0)
+            speed = np.maximum(np.minimum(limit, gap + ahead), 0)
+            updated = np.where(kind == OBSTACLE, velocity, np.minimum(target, speed))
+            # Bonus chains get resolved from the front, one vehicle per iteration.
+            if np.array_equal(updated, result):
+                return result
+            result = updated
+
+    def _commit(self, velocity: np.ndarray) -> None:
+        '''
+        Moves the vehicles by their new velocities, removes the vehicles leaving the road and
+        commits the rest to the road.
+        :param velocity: new velocities.
+        :return: None.
+        '''
+        state = self.state
+        state['last_x'], state['last_velocity'] = state['x'], state['velocity']
+        state['x'], state['velocity'] = state['x'] + velocity, velocity
+        self.synced = False
+        leaving = state['x'] >= self.road.length
+        if np.any(leaving):
+            # Removed vehicles stay on the road until the next step and have to be up to date.
+            removed = {name: column[leaving] for name, column in state.items()}
+            self._scatter(removed)
+            for vehicle in removed['vehicle'].tolist():
+                self.road._removeVehicle(vehicle)
+            self.state = state = {name: column[~leaving] for name, column in state.items()}
+        moved = ~state['static']
+        x = state['x'][moved]
+        self.road._commitVehicles(
+            vehicles=state['vehicle'][moved], x=x, lane=np.zeros_like(x),
+            length=state['length'][moved], width=state['width'][moved])
+
+    @staticmethod
+    def _scatter(state: State) -> None:
+        '''
+        Copies the state back to the vehicle objects, obstacles are never changed.
+        :param state: state of the vehicles.
+        :return: None.
+        '''
+        cars = state['kind'] != OBSTACLE
+        for vehicle, x, velocity, last_x, last_velocity in zip(
+                state['vehicle'][cars].tolist(), state['x'][cars].tolist(),
+                state['velocity'][cars].tolist(), state['last_x'][cars].tolist(),
+                state['last_velocity'][cars].tolist()):
+            vehicle.last_velocity = last_velocity
+            vehicle.last_position = last_x, 0
+            vehicle.velocity = velocity
+            vehicle.position = x, 0
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import typing
+import unittest
+from unittest.mock import Mock
+
+import pandas as pd
+
+from simulator.dispatcher.mixed import MixedDispatcher
+from simulator.engine.batch import BatchEngine
+from simulator.road.array import ArrayRoad
+from simulator.road.dense import DenseRoad
+from simulator.road.sparse import SparseRoad
+from simulator.road.speedcontroller import SpeedController
+from simulator.simulator import Simulator
+from simulator.statistics.tracker import Tracker
+from simulator.vehicle.conventional import Driver
+from simulator.vehicle.obstacle import Obstacle
+from util import rand
+
+
+class BatchEngineTestCase(unittest.TestCase):
+    def getSimulator(self, seed: int, batch: bool, penetration: float, obstacle: bool = False,
+                     length: int = 1, road_type: type = DenseRoad) -> Simulator:
+        rand.seed(seed)
+        controller = SpeedController(max_speed=5)
+        controller.addLimit(lane=0, begin=60, end=80, limit=3)
+        road = road_type(length=150, lanes_count=1, lane_width=1, controller=controller)
+        if obstacle:
+            road.addObstacle(Obstacle(position=(120, 0), length=3, width=1))
+        dispatcher = MixedDispatcher(
+            road=road, count=1, penetration=penetration, driver=Driver(slow=.3),
+            length=length, limit=1)
+        engine = BatchEngine(road=road) if batch else None
+        simulator = Simulator(road=road, dispatcher=dispatcher, engine=engine)
+        simulator.scatterVehicles(density=.3)
+        return simulator
+
+    def runSimulation(self, simulator: Simulator, steps: int) -> typing.Tuple[list, pd.DataFrame]:
+        states = []
+        with Tracker(simulator=simulator) as tracker:
+            for _ in range(steps):
+                simulator.step()
+                states.append([(vehicle.position, vehicle.velocity)
+                               for vehicle in simulator.road.getAllVehicles()])
+            return states, tracker.getAverageData()
+
+    def assertSameRun(self, **kwargs) -> None:
+        expected_states, expected_data = \
+            self.runSimulation(self.getSimulator(batch=False, **kwargs), 100)
+        result_states, result_data = \
+            self.runSimulation(self.getSimulator(batch=True, **kwargs), 100)
+        for step, (expected, result) in enumerate(zip(expected_states, result_states)):
+            self.assertListEqual(expected, result, f'step={step}')
+        self.assertTrue(expected_data.equals(result_data))
+
+    def test_step(self):
+        for penetration in (0., .5, 1.):
+            with self.subTest(penetration=penetration):
+                self.assertSameRun(seed=42, penetration=penetration)
+
+    def test_step__obstacle(self):
+        self.assertSameRun(seed=42, penetration=.5, obstacle=True)
+
+    def test_step__length(self):
+        self.assertSameRun(seed=42, penetration=.5, length=3)
+
+    def test_step__road(self):
+        for road_type in (ArrayRoad, SparseRoad):
+            with self.subTest(road_type=road_type.__name__):
+                self.assertSameRun(seed=42, penetration=.5, obstacle=True, road_type=road_type)
+
+    def test_sync(self):
+        expected = self.getSimulator(seed=42, batch=False, penetration=.5, obstacle=True)
+        for _ in range(50):
+            expected.step()
+        result = self.getSimulator(seed=42, batch=True, penetration=.5, obstacle=True)
+        for _ in range(50):
+            result.step()
+        # Vehicles are updated only when they leave the road or on sync.
+        self.assertListEqual([vehicle.position for vehicle in result.road.removed],
+                             [vehicle.position for vehicle in expected.road.removed])
+        result.sync()
+        self.assertListEqual(
+            [(vehicle.position, vehicle.last_position, vehicle.velocity, vehicle.last_velocity)
+             for vehicle in result.road.getAllVehicles()],
+            [(vehicle.position, vehicle.last_position, vehicle.velocity, vehicle.last_velocity)
+             for vehicle in expected.road.getAllVehicles()])
+
+    def test_save(self):
+        simulator = self.getSimulator(seed=42, batch=True, penetration=.5)
+        for _ in range(50):
+            simulator.step()
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'checkpoint.gz')
+            simulator.save(file_path=file_path)
+            expected, _ = self.runSimulation(simulator, 50)
+            # Restored engine gathers the vehicles from the road again.
+            result, _ = self.runSimulation(Simulator.load(file_path=file_path), 50)
+        self.assertListEqual(expected, result)
+
+    def test_init(self):
+        road = DenseRoad(length=100, lanes_count=2, lane_width=1)
+        with self.assertRaises(ValueError):
+            BatchEngine(road=road)
+
+    def test_step__emergency(self):
+        road = DenseRoad(length=100, lanes_count=1, lane_width=1)
+        road.emergency.add(Mock())
+        engine = BatchEngine(road=road)
+        with self.assertRaises(ValueError):
+            engine.step()
+
+
+if __name__ == '__main__':
+    unittest.main()
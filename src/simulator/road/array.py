@@ -0,0 +1,209 @@
+import typing
+
+import numpy as np
+
+from simulator.position import Position
+from simulator.road.road import Road, CollisionError
+from simulator.road.speedcontroller import SpeedController
+from simulator.vehicle.vehicle import Vehicle
+
+# Identifier stored in the cells not occupied by any vehicle.
+EMPTY = 0
+# Indexes of the nearest occupied cells for every cell of every sub-lane.
+Neighbours = typing.List[typing.List[int]]
+
+
+class ArrayRoad(Road):
+    '''
+    Road implementation for traffic heavy roads, keeping the occupancy grid as a preallocated
+    array of vehicle identifiers.
+    '''
+    lanes: np.ndarray
+    pending_lanes: np.ndarray
+    # Static layer of the obstacles, copied to the pending lanes on every commit.
+    static_lanes: np.ndarray
+
+    # Vehicle identifiers.
+    vehicles: typing.List[typing.Optional[Vehicle]]
+    ids: typing.Dict[Vehicle, int]
+    free_ids: typing.List[int]
+    released: typing.List[Vehicle]
+
+    # Neighbour lookup caches of the current lanes, computed on demand.
+    next_cells: typing.Optional[Neighbours]
+    previous_cells: typing.Optional[Neighbours]
+
+    def __init__(self, length: int, lanes_count: int, lane_width: int,
+                 controller: typing.Optional[SpeedController] = None):
+        super().__init__(length, lanes_count, lane_width, controller=controller)
+        self.lanes = self._emptyLanes()
+        self.pending_lanes = self._emptyLanes()
+        self.static_lanes = self._emptyLanes()
+        # Identifier 0 is reserved for the empty cells.
+        self.vehicles = [None]
+        self.ids = dict()
+        self.free_ids = list()
+        self.released = list()
+        self.next_cells = None
+        self.previous_cells = None
+
+    def _emptyLanes(self) -> np.ndarray:
+        return np.full((self.sublanesCount, self.length), EMPTY, dtype=np.int32)
+
+    def _getId(self, vehicle: Vehicle) -> int:
+        '''
+        Returns the identifier of a vehicle, assigning a new one if necessary.
+        :param vehicle: vehicle to identify.
+        :return: vehicle identifier.
+        '''
+        vehicle_id = self.ids.get(vehicle)
+        if vehicle_id is None:
+            if len(self.free_ids) > 0:
+                vehicle_id = self.free_ids.pop()
+                self.vehicles[vehicle_id] = vehicle
+            else:
+                vehicle_id = len(self.vehicles)
+                self.vehicles.append(vehicle)
+            self.ids[vehicle] = vehicle_id
+        return vehicle_id
+
+    def _getArea(self, lanes: np.ndarray, vehicle: Vehicle) -> np.ndarray:
+        '''
+        Returns a view of the cells occupied by a vehicle.
+        :param lanes: occupancy grid.
+        :param vehicle: vehicle to place.
+        :return: occupied cells.
+        '''
+        x, lane = vehicle.position
+        if not self.isProperPosition(position=(x, lane)) or not self.isProperPosition(
+                position=(x - vehicle.length + 1, lane + vehicle.width - 1)):
+            raise IndexError(f'position {vehicle.position} not on the road')
+        return lanes[lane:lane + vehicle.width, x - vehicle.length + 1:x + 1]
+
+    def _placeVehicle(self, lanes: np.ndarray, vehicle: Vehicle) -> None:
+        area = self._getArea(lanes=lanes, vehicle=vehicle)
+        if area.any():
+            raise CollisionError()
+        area[:] = self._getId(vehicle)
+
+    def _computeNeighbours(self) -> None:
+        '''
+        Computes indexes of the next and the previous occupied cells for all the cells.
+        :return: None.
+        '''
+        occupied = self.lanes != EMPTY
+        cells = np.arange(self.length)
+        # Nearest occupied cells including the cell itself, shifted by one cell.
+        next_cells = np.minimum.accumulate(
+            np.where(occupied, cells, self.length)[:, ::-1], axis=1)[:, ::-1]
+        previous_cells = np.maximum.accumulate(np.where(occupied, cells, -1), axis=1)
+        self.next_cells = np.pad(
+            next_cells[:, 1:], ((0, 0), (0, 1)), constant_values=self.length).tolist()
+        self.previous_cells = np.pad(
+            previous_cells[:, :-1], ((0, 0), (1, 0)), constant_values=-1).tolist()
+
+    def addVehicle(self, vehicle: Vehicle) -> None:
+        self._placeVehicle(lanes=self.lanes, vehicle=vehicle)
+        self.added.append(vehicle)
+        self.next_cells = None
+        self.previous_cells = None
+
+    def addObstacle(self, obstacle: Vehicle) -> None:
+        for lanes in (self.lanes, self.pending_lanes):
+            if self._getArea(lanes=lanes, vehicle=obstacle).any():
+                raise CollisionError()
+        for lanes in (self.static_lanes, self.lanes, self.pending_lanes):
+            self._placeVehicle(lanes=lanes, vehicle=obstacle)
+        self.obstacles.append(obstacle)
+        self.next_cells = None
+        self.previous_cells = None
+
+    def getVehicle(self, position: Position) -> typing.Optional[Vehicle]:
+        x, lane = position
+        return self.vehicles[self.lanes[lane, x]]
+
+    def getAllActiveVehicles(self) -> typing.Generator[Vehicle, None, None]:
+        lanes = self.lanes
+        previous = np.full(self.length, EMPTY, dtype=lanes.dtype)
+        for lane in range(self.sublanesCount):
+            row = lanes[lane]
+            # Only the front cells of the vehicles on their first sub-lane are considered,
+            # obstacles are skipped.
+            heads = np.flatnonzero(
+                (row != EMPTY) & (row != np.append(row[1:], EMPTY)) & (row != previous) &
+                (self.static_lanes[lane] == EMPTY))
+            for x in reversed(heads.tolist()):
+                yield self.vehicles[row[x]]
+            previous = row
+
+    def addPendingVehicle(self, vehicle: Vehicle) -> None:
+        self._placeVehicle(lanes=self.pending_lanes, vehicle=vehicle)
+
+    def getPendingVehicle(self, position: Position) -> typing.Optional[Vehicle]:
+        x, lane = position
+        return self.vehicles[self.pending_lanes[lane, x]]
+
+    def isSafeArea(self, position: Position, length: int, width: int,
+                   ignore: typing.Optional[Vehicle] = None) -> bool:
+        x, lane = position
+        if not self.isProperPosition(position=position) or \
+                not self.isProperPosition(position=(x - length + 1, lane + width - 1)):
+            return False
+        ignore_id = self.ids.get(ignore, EMPTY)
+        for lanes in (self.lanes, self.pending_lanes):
+            area = lanes[lane:lane + width, x - length + 1:x + 1]
+            occupied = np.count_nonzero(area)
+            if occupied > 0 and (
+                    ignore_id == EMPTY or occupied > np.count_nonzero(area == ignore_id)):
+                return False
+        return True
+
+    def getNextVehicle(self, position: Position) -> typing.Tuple[int, typing.Optional[Vehicle]]:
+        x, lane = position
+        if not self.isProperPosition(position):
+            raise IndexError(f'position {position} not on the road')
+        if self.next_cells is None:
+            self._computeNeighbours()
+        i = self.next_cells[lane][x]
+        if i == self.length:
+            return self.length, None
+        return i, self.vehicles[self.lanes[lane, i]]
+
+    def getPreviousVehicle(self, position: Position) -> typing.Tuple[int, typing.Optional[Vehicle]]:
+        x, lane = position
+        if not self.isProperPosition(position):
+            raise IndexError(f'position {position} not on the road')
+        if self.previous_cells is None:
+            self._computeNeighbours()
+        i = self.previous_cells[lane][x]
+        if i == -1:
+            return -1, None
+        return i, self.vehicles[self.lanes[lane, i]]
+
+    def _commitVehicles(self, vehicles: np.ndarray, x: np.ndarray, lane: np.ndarray,
+                        length: np.ndarray, width: np.ndarray) -> None:
+        index, cell_lane, cell_x = self._getCells(x=x, lane=lane, length=length, width=width)
+        ids = np.array([self._getId(vehicle) for vehicle in vehicles.tolist()], dtype=np.int32)
+        lanes = self.pending_lanes
+        np.copyto(lanes, self.static_lanes)
+        cells = np.bincount(cell_lane * self.length + cell_x, minlength=lanes.size)
+        if np.any(lanes[cell_lane, cell_x] != EMPTY) or cells.max() > 1:
+            raise CollisionError()
+        lanes[cell_lane, cell_x] = ids[index]
+        self._commitLanes()
+
+    def _removeVehicle(self, vehicle: Vehicle) -> None:
+        super()._removeVehicle(vehicle)
+        self.released.append(vehicle)
+
+    def _commitLanes(self) -> None:
+        self.lanes, self.pending_lanes = self.pending_lanes, self.lanes
+        np.copyto(self.pending_lanes, self.static_lanes)
+        self.next_cells = None
+        self.previous_cells = None
+        # Identifiers of the removed vehicles are no longer referenced by the grid.
+        for vehicle in self.released:
+            vehicle_id = self.ids.pop(vehicle)
+            self.vehicles[vehicle_id] = None
+            self.free_ids.append(vehicle_id)
+        self.released = []
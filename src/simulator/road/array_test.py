@@ -0,0 +1,32 @@
+import unittest
+from unittest.mock import Mock
+
+from simulator.road.array import ArrayRoad
+from simulator.road.road_test import implementsRoad
+from simulator.vehicle.vehicle import VehicleFlags
+
+
+@implementsRoad
+class ArrayRoadTestCase(unittest.TestCase):
+    def getRoad(self, length: int, lanes: int, width: int) -> ArrayRoad:
+        return ArrayRoad(length=length, lanes_count=lanes, lane_width=width)
+
+    def test_commitLanes__ids(self):
+        road = self.getRoad(length=10, lanes=1, width=1)
+        removed = Mock(length=1, width=1, position=(9, 0), flags=VehicleFlags.NONE)
+        road.addVehicle(removed)
+        removed_id = road.ids[removed]
+        # Identifier is kept until the removed vehicle leaves the grid.
+        road._removeVehicle(removed)
+        self.assertIs(road.getVehicle(position=(9, 0)), removed)
+        road._commitLanes()
+        self.assertNotIn(removed, road.ids)
+        self.assertIsNone(road.getVehicle(position=(9, 0)))
+        # Released identifier gets reused.
+        vehicle = Mock(length=1, width=1, position=(0, 0))
+        road.addVehicle(vehicle)
+        self.assertEqual(road.ids[vehicle], removed_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
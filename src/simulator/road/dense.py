@@ -1,11 +1,31 @@
 import typing
 
+import numpy as np
+from sortedcontainers import SortedDict
+
 from simulator.position import Position
 from simulator.road.road import Road, CollisionError
 from simulator.road.speedcontroller import SpeedController
 from simulator.vehicle.vehicle import Vehicle
 
 Lane = typing.List[typing.Optional[Vehicle]]
+# Indexes of the nearest occupied cells for every cell of a sub-lane.
+Neighbours = typing.List[int]
+# Vehicles on the road ordered by sub-lane and descending front position.
+Index = SortedDict
+# Occupied cells of every sub-lane as bitsets, bit x is set when cell x is occupied.
+Occupancy = typing.List[int]
+
+
+def getAreaMask(x: int, length: int) -> int:
+    '''
+    Creates a bitset of the cells covered by a vehicle.
+    :param x: front position.
+    :param length: vehicle length.
+    :return: bitset of the covered cells.
+    '''
+    tail = max(x - length + 1, 0)
+    return ((1 << (x - tail + 1)) - 1) << tail
 
 
 class DenseRoad(Road):
@@ -14,15 +34,78 @@ class DenseRoad(Road):
     '''
     lanes: typing.List[Lane]
     pending_lanes: typing.List[Lane]
+    active: Index
+    pending_active: Index
+    occupancy: Occupancy
+    pending_occupancy: Occupancy
+    # Static layer of the obstacles, copied to the pending lanes on every commit.
+    static_lanes: typing.List[Lane]
+    static_occupancy: Occupancy
+    # Neighbour lookup caches of the current lanes, computed on demand.
+    next_cells: typing.List[typing.Optional[Neighbours]]
+    previous_cells: typing.List[typing.Optional[Neighbours]]
 
     def __init__(self, length: int, lanes_count: int, lane_width: int,
                  controller: typing.Optional[SpeedController] = None):
         super().__init__(length, lanes_count, lane_width, controller=controller)
-        self.lanes = [self._emptyLane() for _ in range(self.sublanesCount)]
-        self.pending_lanes = [self._emptyLane() for _ in range(self.sublanesCount)]
+        self.static_lanes = [[None] * self.length for _ in range(self.sublanesCount)]
+        self.static_occupancy = [0] * self.sublanesCount
+        self.lanes = self._emptyLanes()
+        self.pending_lanes = self._emptyLanes()
+        self.active = Index()
+        self.pending_active = Index()
+        self.occupancy = list(self.static_occupancy)
+        self.pending_occupancy = list(self.static_occupancy)
+        self._invalidateNeighbours()
 
-    def _emptyLane(self) -> Lane:
-        return [None] * self.length
+    def _emptyLanes(self) -> typing.List[Lane]:
+        return [list(lane) for lane in self.static_lanes]
+
+    def _invalidateNeighbours(self) -> None:
+        self.next_cells = [None] * self.sublanesCount
+        self.previous_cells = [None] * self.sublanesCount
+
+    def _getNextCells(self, lane: int) -> Neighbours:
+        '''
+        Gets indexes of the next occupied cells of a sub-lane, computing them in a single sweep.
+        :param lane: sub-lane.
+        :return: index of the next occupied cell or road length for every cell.
+        '''
+        cells = self.next_cells[lane]
+        if cells is None:
+            cells = [self.length] * self.length
+            row = self.lanes[lane]
+            next_cell = self.length
+            for x in range(self.length - 1, -1, -1):
+                cells[x] = next_cell
+                if row[x] is not None:
+                    next_cell = x
+            self.next_cells[lane] = cells
+        return cells
+
+    def _getPreviousCells(self, lane: int) -> Neighbours:
+        '''
+        Gets indexes of the previous occupied cells of a sub-lane, computing them in a single
+        sweep.
+        :param lane: sub-lane.
+        :return: index of the previous occupied cell or -1 for every cell.
+        '''
+        cells = self.previous_cells[lane]
+        if cells is None:
+            cells = [-1] * self.length
+            row = self.lanes[lane]
+            previous_cell = -1
+            for x in range(self.length):
+                cells[x] = previous_cell
+                if row[x] is not None:
+                    previous_cell = x
+            self.previous_cells[lane] = cells
+        return cells
+
+    @staticmethod
+    def _getIndexKey(vehicle: Vehicle) -> typing.Tuple[int, int]:
+        x, lane = vehicle.position
+        return lane, -x
 
     def addVehicle(self, vehicle: Vehicle) -> None:
         x, lane = vehicle.position
@@ -33,17 +116,37 @@ class DenseRoad(Road):
         for w in range(vehicle.width):
             for i in range(vehicle.length):
                 self.lanes[lane + w][x - i] = vehicle
+        mask = getAreaMask(x=x, length=vehicle.length)
+        for w in range(vehicle.width):
+            self.occupancy[lane + w] |= mask
+        self.active[self._getIndexKey(vehicle)] = vehicle
+        self.added.append(vehicle)
+        self._invalidateNeighbours()
+
+    def addObstacle(self, obstacle: Vehicle) -> None:
+        x, lane = obstacle.position
+        for w in range(obstacle.width):
+            for i in range(obstacle.length):
+                if self.lanes[lane + w][x - i] is not None or \
+                        self.pending_lanes[lane + w][x - i] is not None:
+                    raise CollisionError()
+        mask = getAreaMask(x=x, length=obstacle.length)
+        for lanes, occupancy in ((self.static_lanes, self.static_occupancy),
+                                 (self.lanes, self.occupancy),
+                                 (self.pending_lanes, self.pending_occupancy)):
+            for w in range(obstacle.width):
+                for i in range(obstacle.length):
+                    lanes[lane + w][x - i] = obstacle
+                occupancy[lane + w] |= mask
+        self.obstacles.append(obstacle)
+        self._invalidateNeighbours()
 
     def getVehicle(self, position: Position) -> typing.Optional[Vehicle]:
         x, lane = position
         return self.lanes[lane][x]
 
     def getAllActiveVehicles(self) -> typing.Generator[Vehicle, None, None]:
-        for lane in range(self.sublanesCount):
-            for x in reversed(range(self.length)):
-                vehicle = self.lanes[lane][x]
-                if vehicle is not None and vehicle.position == (x, lane):
-                    yield vehicle
+        yield from self.active.values()
 
     def addPendingVehicle(self, vehicle: Vehicle) -> None:
         x, lane = vehicle.position
@@ -54,29 +157,72 @@ class DenseRoad(Road):
         for w in range(vehicle.width):
             for i in range(vehicle.length):
                 self.pending_lanes[lane + w][x - i] = vehicle
+        mask = getAreaMask(x=x, length=vehicle.length)
+        for w in range(vehicle.width):
+            self.pending_occupancy[lane + w] |= mask
+        self.pending_active[self._getIndexKey(vehicle)] = vehicle
 
     def getPendingVehicle(self, position: Position) -> typing.Optional[Vehicle]:
         x, lane = position
         return self.pending_lanes[lane][x]
 
+    def isSafeArea(self, position: Position, length: int, width: int,
+                   ignore: typing.Optional[Vehicle] = None) -> bool:
+        x, lane = position
+        if not self.isProperPosition(position=position) or \
+                not self.isProperPosition(position=(x - length + 1, lane + width - 1)):
+            return False
+        mask = getAreaMask(x=x, length=length)
+        for w in range(width):
+            if (self.occupancy[lane + w] | self.pending_occupancy[lane + w]) & mask:
+                # Occupied cells may belong to the ignored vehicle.
+                return ignore is not None and super().isSafeArea(
+                    position=position, length=length, width=width, ignore=ignore)
+        return True
+
     def getNextVehicle(self, position: Position) -> typing.Tuple[int, typing.Optional[Vehicle]]:
         x, lane = position
         if not self.isProperPosition(position):
             raise IndexError(f'position {position} not on the road')
-        for i in range(x + 1, self.length):
-            if self.lanes[lane][i] is not None:
-                return i, self.lanes[lane][i]
-        return self.length, None
+        i = self._getNextCells(lane)[x]
+        if i == self.length:
+            return self.length, None
+        return i, self.lanes[lane][i]
 
     def getPreviousVehicle(self, position: Position) -> typing.Tuple[int, typing.Optional[Vehicle]]:
         x, lane = position
         if not self.isProperPosition(position):
             raise IndexError(f'position {position} not on the road')
-        for i in range(x - 1, -1, -1):
-            if self.lanes[lane][i] is not None:
-                return i, self.lanes[lane][i]
-        return -1, None
+        i = self._getPreviousCells(lane)[x]
+        if i == -1:
+            return -1, None
+        return i, self.lanes[lane][i]
 
     def _commitLanes(self) -> None:
         self.lanes = self.pending_lanes
-        self.pending_lanes = [self._emptyLane() for _ in range(self.sublanesCount)]
+        self.pending_lanes = self._emptyLanes()
+        self.active = self.pending_active
+        self.pending_active = Index()
+        self.occupancy = self.pending_occupancy
+        self.pending_occupancy = list(self.static_occupancy)
+        self._invalidateNeighbours()
+
+    def _commitVehicles(self, vehicles: np.ndarray, x: np.ndarray, lane: np.ndarray,
+                        length: np.ndarray, width: np.ndarray) -> None:
+        index, cell_lane, cell_x = self._getCells(x=x, lane=lane, length=length, width=width)
+        lanes = np.empty((self.sublanesCount, self.length), dtype=object)
+        lanes[:] = self.static_lanes
+        cells = np.bincount(cell_lane * self.length + cell_x, minlength=lanes.size)
+        occupied = lanes.astype(bool) + cells.reshape(lanes.shape)
+        if occupied.max() > 1:
+            raise CollisionError()
+        lanes[cell_lane, cell_x] = vehicles[index]
+        self.lanes = lanes.tolist()
+        self.pending_lanes = self._emptyLanes()
+        self.active = Index(zip(zip(lane.tolist(), (-x).tolist()), vehicles.tolist()))
+        self.pending_active = Index()
+        # Bit x of a sub-lane bitset is the cell x, the lowest bit of the first byte.
+        self.occupancy = [int.from_bytes(np.packbits(row, bitorder='little').tobytes(), 'little')
+                          for row in occupied > 0]
+        self.pending_occupancy = list(self.static_occupancy)
+        self._invalidateNeighbours()
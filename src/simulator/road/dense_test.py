@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import Mock
 
 from simulator.road.dense import DenseRoad
 from simulator.road.road_test import implementsRoad
@@ -9,6 +10,20 @@ class DenseRoadTestCase(unittest.TestCase):
     def getRoad(self, length: int, lanes: int, width: int) -> DenseRoad:
         return DenseRoad(length=length, lanes_count=lanes, lane_width=width)
 
+    def test_commitLanes__index(self):
+        road = self.getRoad(length=10, lanes=2, width=1)
+        first = Mock(length=1, width=1, position=(2, 0))
+        second = Mock(length=1, width=1, position=(5, 1))
+        road.addVehicle(first)
+        road.addVehicle(second)
+        # Pending vehicles are indexed after the commit.
+        first.position = (3, 1)
+        road.addPendingVehicle(first)
+        self.assertListEqual(list(road.getAllActiveVehicles()), [first, second])
+        road._commitLanes()
+        self.assertListEqual(list(road.getAllActiveVehicles()), [first])
+        self.assertEqual(len(road.pending_active), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
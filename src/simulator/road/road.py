@@ -1,6 +1,9 @@
+import bisect
 import itertools
 import typing
 
+import numpy as np
+
 from simulator.position import Position, inBounds
 from simulator.road.speedcontroller import SpeedController
 from simulator.vehicle.vehicle import Vehicle, VehicleFlags
@@ -14,8 +17,18 @@ class Road:
     lanes_count: int
     lane_width: int
 
+    # Vehicles added and removed since the last step.
+    added: typing.List[Vehicle]
     removed: typing.List[Vehicle]
     emergency: typing.Set[Vehicle]
+    # Emergency vehicles ordered by their front positions, refreshed on every step.
+    emergency_positions: typing.List[int]
+    emergency_vehicles: typing.List[Vehicle]
+    # Static obstacles, kept on the road without being updated.
+    obstacles: typing.List[Vehicle]
+
+    # Number of updates performed.
+    epoch: int
 
     def __init__(self, length: int, lanes_count: int, lane_width: int,
                  controller: typing.Optional[SpeedController] = None):
@@ -23,8 +36,13 @@ class Road:
         self.lanes_count = lanes_count
         self.lane_width = lane_width
         self.controller = controller if controller is not None else SpeedController()
+        self.added = list()
         self.removed = list()
         self.emergency = set()
+        self.emergency_positions = list()
+        self.emergency_vehicles = list()
+        self.obstacles = list()
+        self.epoch = 0
 
     @property
     def sublanesCount(self) -> int:
@@ -82,6 +100,15 @@ class Road:
         '''
         raise NotImplementedError()
 
+    def addObstacle(self, obstacle: Vehicle) -> None:
+        '''
+        Adds a static obstacle to the road. Obstacles occupy the road like vehicles, but they are
+        not moved nor committed in the simulation steps.
+        :param obstacle: obstacle to add.
+        :return: None.
+        '''
+        raise NotImplementedError()
+
     def addEmergencyVehicle(self, vehicle: Vehicle) -> None:
         '''
         Adds a new emergency vehicle to the  road.
@@ -92,6 +119,36 @@ class Road:
             raise ValueError('emergency vehicle expected')
         self.emergency.add(vehicle)
         self.addVehicle(vehicle=vehicle)
+        x, _ = vehicle.position
+        i = bisect.bisect_right(self.emergency_positions, x)
+        self.emergency_positions.insert(i, x)
+        self.emergency_vehicles.insert(i, vehicle)
+
+    def getEmergencyVehicle(self, x: int, radius: int) -> typing.Optional[Vehicle]:
+        '''
+        Finds the nearest emergency vehicle, using the positions from the start of the step.
+        :param x: position on the road.
+        :param radius: distance the emergency vehicle has to be closer than.
+        :return: the nearest emergency vehicle, preferring the one behind, or None.
+        '''
+        positions = self.emergency_positions
+        i = bisect.bisect_left(positions, x)
+        result = None
+        # Only the vehicles right behind and in front of the position are candidates.
+        for j in range(max(i - 1, 0), min(i + 1, len(positions))):
+            distance = abs(positions[j] - x)
+            if distance < radius:
+                radius = distance
+                result = self.emergency_vehicles[j]
+        return result
+
+    def _indexEmergency(self) -> None:
+        '''
+        Rebuilds the index of the emergency vehicle positions.
+        :return: None.
+        '''
+        self.emergency_vehicles = sorted(self.emergency, key=lambda vehicle: vehicle.position[0])
+        self.emergency_positions = [vehicle.position[0] for vehicle in self.emergency_vehicles]
 
     def getVehicle(self, position: Position) -> typing.Optional[Vehicle]:
         '''
@@ -103,17 +160,17 @@ class Road:
 
     def getAllActiveVehicles(self) -> typing.Generator[Vehicle, None, None]:
         '''
-        Gets all the vehicles on the road.
+        Gets all the vehicles on the road, except the static obstacles.
         :return: generator yielding all the vehicles.
         '''
         raise NotImplementedError()
 
     def getAllVehicles(self) -> typing.Iterator[Vehicle]:
         '''
-        Gets all vehicles on the road including recently removed vehicles.
+        Gets all vehicles on the road including the obstacles and recently removed vehicles.
         :return: generator yielding all the vehicles.
         '''
-        return itertools.chain(self.getAllActiveVehicles(), self.removed)
+        return itertools.chain(self.getAllActiveVehicles(), self.obstacles, self.removed)
 
     def addPendingVehicle(self, vehicle: Vehicle) -> None:
         '''
@@ -170,16 +227,28 @@ class Road:
         pending = self.getPendingVehicle(position=position)
         return (vehicle is None or vehicle is ignore) and (pending is None or pending is ignore)
 
+    def isSafeArea(self, position: Position, length: int, width: int,
+                   ignore: typing.Optional[Vehicle] = None) -> bool:
+        '''
+        Checks if an area is safe to place a vehicle in, both on the road and the pending road.
+        :param position: front position of the area.
+        :param length: area length.
+        :param width: area width.
+        :param ignore: ignore potential collisions with the given vehicle.
+        :return: if all the positions in the area are safe.
+        '''
+        x, lane = position
+        return all(self.isSafePosition(position=(x - i, lane + w), ignore=ignore)
+                   for i in range(length) for w in range(width))
+
     def canPlaceVehicle(self, vehicle: Vehicle) -> bool:
         '''
         Checks if a given vehicle can be placed on the road.
         :param vehicle: vehicle to check.
         :return: if a vehicle can be placed.
         '''
-        x, lane = vehicle.position
-        return \
-            all(self.isSafePosition(position=(x - i, lane + j))
-                for i in range(vehicle.length) for j in range(vehicle.width))
+        return self.isSafeArea(
+            position=vehicle.position, length=vehicle.length, width=vehicle.width)
 
     def _commitLanes(self) -> None:
         '''
@@ -188,6 +257,39 @@ class Road:
         '''
         raise NotImplementedError()
 
+    def _getCells(self, x: np.ndarray, lane: np.ndarray, length: np.ndarray,
+                  width: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        '''
+        Lists the cells covered by the vehicles, checking the vehicles are on the road.
+        :param x: front positions of the vehicles.
+        :param lane: sub-lanes of the vehicles.
+        :param length: vehicle lengths.
+        :param width: vehicle widths.
+        :return: vehicle indexes, sub-lanes and positions of the covered cells.
+        '''
+        if np.any(x >= self.length) or np.any(x - length + 1 < 0) or np.any(lane < 0) or \
+                np.any(lane + width > self.sublanesCount):
+            raise IndexError('vehicle positions not on the road')
+        counts = length * width
+        index = np.repeat(np.arange(len(x)), counts)
+        offset = np.arange(len(index)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return index, lane[index] + offset // length[index], x[index] - offset % length[index]
+
+    def _commitVehicles(self, vehicles: np.ndarray, x: np.ndarray, lane: np.ndarray,
+                        length: np.ndarray, width: np.ndarray) -> None:
+        '''
+        Replaces all the vehicles on the road at once, equivalent to adding every vehicle to the
+        empty pending road and committing the lanes. The positions are given separately, the
+        attributes of the vehicles may be out of date.
+        :param vehicles: object array of the vehicles, the static obstacles are kept.
+        :param x: front positions of the vehicles.
+        :param lane: sub-lanes of the vehicles.
+        :param length: vehicle lengths.
+        :param width: vehicle widths.
+        :return: None.
+        '''
+        raise NotImplementedError()
+
     def _updateLanes(self, f: typing.Callable[[Vehicle], Position]) -> None:
         '''
         Performs an update function on each of the vehicles on the road. Actions are
@@ -195,15 +297,14 @@ class Road:
         :param f: update function.
         :return: None.
         '''
-        # Reset MOVED flag to keep track of vehicles already moved.
+        # Vehicles moved in this update are marked with a new epoch.
+        self.epoch += 1
+        epoch = self.epoch
         for vehicle in self.getAllActiveVehicles():
-            vehicle.flags &= ~VehicleFlags.MOVED
-
-        for vehicle in self.getAllActiveVehicles():
-            # Skip vehicles with MOVED flag set.
-            if VehicleFlags.MOVED in vehicle.flags:
+            # Skip vehicles already moved.
+            if vehicle.epoch == epoch:
                 continue
-            vehicle.flags |= VehicleFlags.MOVED
+            vehicle.epoch = epoch
             # Apply move function.
             x, _ = f(vehicle)
             if x < self.length:
@@ -222,12 +323,24 @@ class Road:
         if vehicle.flags & VehicleFlags.EMERGENCY:
             self.emergency.remove(vehicle)
 
+    def _clearRemoved(self) -> None:
+        '''
+        Forgets the vehicles removed in the previous step, releasing their rows of the vehicle
+        table.
+        :return: None.
+        '''
+        for vehicle in self.removed:
+            vehicle.release()
+        self.removed = []
+
     def step(self) -> None:
         '''
         Performs a single simulation step moving all the vehicles.
         :return: None.
         '''
-        self.removed = []
+        self._clearRemoved()
+        self.added = []
+        self._indexEmergency()
         self._updateLanes(lambda vehicle: vehicle.beforeMove())
         self._updateLanes(lambda vehicle: vehicle.move())
 
@@ -3,6 +3,8 @@ import unittest
 from unittest.mock import Mock, call
 from itertools import chain, combinations
 
+import numpy as np
+
 from simulator.position import Position
 from simulator.road.road import Road, CollisionError
 from simulator.vehicle.vehicle import Vehicle, VehicleFlags
@@ -175,6 +177,31 @@ def implementsRoad(cls):
         self.assertIn(vehicle, result)
         self.assertIn(removed, result)
 
+    def test_addObstacle(self: cls):
+        road: Road = self.getRoad(length=100, lanes=2, width=1)
+        obstacle: Vehicle = Mock(length=20, width=1, position=(50, 1), flags=VehicleFlags.NONE)
+        road.addObstacle(obstacle)
+        vehicle: Vehicle = Mock(length=1, width=1, position=(10, 1), flags=VehicleFlags.NONE)
+        road.addVehicle(vehicle)
+        # Obstacles stay on the road after the commits.
+        for _ in range(2):
+            road._updateLanes(lambda vehicle: vehicle.position)
+            self.assertListEqual(list(road.getAllActiveVehicles()), [vehicle])
+            self.assertCountEqual(road.getAllVehicles(), [vehicle, obstacle])
+            for x in range(31, 51):
+                self.assertIs(road.getVehicle(position=(x, 1)), obstacle)
+                self.assertIs(road.getPendingVehicle(position=(x, 1)), obstacle)
+            self.assertIsNone(road.getPendingVehicle(position=(10, 1)))
+            self.assertEqual(road.getNextVehicle(position=(10, 1)), (31, obstacle))
+            self.assertEqual(road.getPreviousVehicle(position=(60, 1)), (50, obstacle))
+            self.assertFalse(road.isSafeArea(position=(31, 1), length=1, width=1))
+            self.assertTrue(road.isSafeArea(position=(30, 1), length=5, width=1))
+        # Obstacles cannot overlap vehicles.
+        with self.assertRaises(CollisionError):
+            road.addObstacle(Mock(length=2, width=1, position=(11, 1)))
+        with self.assertRaises(CollisionError):
+            road.addVehicle(Mock(length=2, width=1, position=(31, 1)))
+
     def test_addPendingVehicle(self: cls):
         # Add a vehicle.
         road: Road = self.getRoad(length=100, lanes=1, width=1)
@@ -464,6 +491,50 @@ def implementsRoad(cls):
         with self.assertRaises(IndexError):
             road.getPreviousVehicle(position=(0, -1))
 
+    def test_isSafeArea(self: cls):
+        road: Road = self.getRoad(length=100, lanes=2, width=2)
+        vehicle: Vehicle = Mock(length=3, width=2, position=(50, 1), flags=VehicleFlags.NONE)
+        road.addVehicle(vehicle)
+        pending: Vehicle = Mock(length=2, width=1, position=(20, 3), flags=VehicleFlags.NONE)
+        road.addPendingVehicle(pending)
+        # Free areas.
+        self.assertTrue(road.isSafeArea(position=(47, 1), length=2, width=2))
+        self.assertTrue(road.isSafeArea(position=(60, 0), length=10, width=4))
+        self.assertTrue(road.isSafeArea(position=(50, 3), length=20, width=2))
+        # Areas overlapping the vehicles.
+        self.assertFalse(road.isSafeArea(position=(48, 0), length=1, width=2))
+        self.assertFalse(road.isSafeArea(position=(55, 2), length=8, width=1))
+        self.assertFalse(road.isSafeArea(position=(19, 0), length=1, width=4))
+        self.assertFalse(road.isSafeArea(position=(30, 3), length=11, width=1))
+        # Ignored vehicle.
+        self.assertTrue(road.isSafeArea(position=(51, 1), length=3, width=2, ignore=vehicle))
+        self.assertFalse(road.isSafeArea(position=(51, 2), length=40, width=2, ignore=vehicle))
+        self.assertTrue(road.isSafeArea(position=(21, 3), length=3, width=1, ignore=pending))
+        # Areas outside the road.
+        self.assertFalse(road.isSafeArea(position=(1, 0), length=3, width=1))
+        self.assertFalse(road.isSafeArea(position=(100, 0), length=1, width=1))
+        self.assertFalse(road.isSafeArea(position=(10, 5), length=1, width=2))
+        self.assertFalse(road.isSafeArea(position=(10, -1), length=1, width=1))
+
+    def test_getNeighbours__update(self: cls):
+        road: Road = self.getRoad(length=100, lanes=1, width=1)
+        first: Vehicle = Mock(length=1, width=1, position=(80, 0), flags=VehicleFlags.NONE)
+        road.addVehicle(first)
+        self.assertEqual(road.getNextVehicle(position=(10, 0)), (80, first))
+        self.assertEqual(road.getPreviousVehicle(position=(90, 0)), (80, first))
+        # Added vehicles are found by the following lookups.
+        second: Vehicle = Mock(length=1, width=1, position=(50, 0), flags=VehicleFlags.NONE)
+        road.addVehicle(second)
+        self.assertEqual(road.getNextVehicle(position=(10, 0)), (50, second))
+        self.assertEqual(road.getPreviousVehicle(position=(60, 0)), (50, second))
+        # Committed lanes replace the current vehicles.
+        second.position = (20, 0)
+        road.addPendingVehicle(second)
+        self.assertEqual(road.getNextVehicle(position=(10, 0)), (50, second))
+        road._commitLanes()
+        self.assertEqual(road.getNextVehicle(position=(10, 0)), (20, second))
+        self.assertEqual(road.getPreviousVehicle(position=(90, 0)), (20, second))
+
     def test_commitLanes(self: cls):
         road: Road = self.getRoad(length=100, lanes=1, width=1)
         vehicles: typing.List[Vehicle] = []
@@ -477,6 +548,45 @@ def implementsRoad(cls):
             result = road.getVehicle(position=(x, 0))
             self.assertEqual(result, vehicles[x], f'invalid vehicle x={x}')
 
+    def test_commitVehicles(self: cls):
+        road: Road = self.getRoad(length=20, lanes=1, width=2)
+        obstacle: Vehicle = Mock(length=2, width=1, position=(15, 3), flags=VehicleFlags.NONE)
+        road.addObstacle(obstacle)
+        old: Vehicle = Mock(length=1, width=1, position=(0, 0), flags=VehicleFlags.NONE)
+        road.addVehicle(old)
+        # Positions of the vehicle objects are not used.
+        first = Mock(length=2, width=2, position=(0, 0))
+        second = Mock(length=1, width=1, position=(0, 0))
+        third = Mock(length=3, width=1, position=(0, 0))
+        road._commitVehicles(
+            vehicles=np.array([first, second, third], dtype=object), x=np.array([12, 3, 19]),
+            lane=np.array([1, 0, 3]), length=np.array([2, 1, 3]), width=np.array([2, 1, 1]))
+        self.assertListEqual(list(road.getAllActiveVehicles()), [second, first, third])
+        self.assertCountEqual(road.getAllVehicles(), [first, second, third, obstacle])
+        for position, vehicle in [((12, 1), first), ((11, 2), first), ((3, 0), second),
+                                  ((17, 3), third), ((15, 3), obstacle), ((0, 0), None),
+                                  ((10, 1), None), ((16, 2), None)]:
+            self.assertIs(road.getVehicle(position=position), vehicle, f'position={position}')
+            pending = obstacle if vehicle is obstacle else None
+            self.assertIs(road.getPendingVehicle(position=position), pending)
+        self.assertEqual(road.getNextVehicle(position=(4, 2)), (11, first))
+        self.assertEqual(road.getPreviousVehicle(position=(18, 3)), (17, third))
+        self.assertFalse(road.isSafeArea(position=(3, 0), length=1, width=1))
+        self.assertTrue(road.isSafeArea(position=(13, 1), length=1, width=3))
+        # Vehicles cannot overlap each other nor the obstacles.
+        with self.assertRaises(CollisionError):
+            road._commitVehicles(
+                vehicles=np.array([first, second], dtype=object), x=np.array([12, 11]),
+                lane=np.array([1, 2]), length=np.array([2, 1]), width=np.array([2, 1]))
+        with self.assertRaises(CollisionError):
+            road._commitVehicles(
+                vehicles=np.array([third], dtype=object), x=np.array([17]),
+                lane=np.array([3]), length=np.array([3]), width=np.array([1]))
+        with self.assertRaises(IndexError):
+            road._commitVehicles(
+                vehicles=np.array([third], dtype=object), x=np.array([1]),
+                lane=np.array([3]), length=np.array([3]), width=np.array([1]))
+
     def test_updateLanes(self: cls):
         road: Road = self.getRoad(length=10, lanes=1, width=1)
         vehicles: typing.List[Vehicle] = []
@@ -554,6 +664,7 @@ def implementsRoad(cls):
     cls.test_getAllActiveVehicles__length = test_getAllActiveVehicles__length
     cls.test_getAllActiveVehicles__width = test_getAllActiveVehicles__width
     cls.test_getAllVehicles = test_getAllVehicles
+    cls.test_addObstacle = test_addObstacle
     cls.test_addPendingVehicle = test_addPendingVehicle
     cls.test_addPendingVehicle__length = test_addPendingVehicle__length
     cls.test_addPendingVehicle__width = test_addPendingVehicle__width
@@ -568,7 +679,10 @@ def implementsRoad(cls):
     cls.test_getPreviousVehicle__length = test_getPreviousVehicle__length
     cls.test_getPreviousVehicle__width = test_getPreviousVehicle__width
     cls.test_getPreviousVehicle__errors = test_getPreviousVehicle__errors
+    cls.test_isSafeArea = test_isSafeArea
+    cls.test_getNeighbours__update = test_getNeighbours__update
     cls.test_commitLanes = test_commitLanes
+    cls.test_commitVehicles = test_commitVehicles
     cls.test_updateLanes = test_updateLanes
     cls.test_updateLanes__length = test_updateLanes__length
     cls.test_updateLanes__width = test_updateLanes__width
@@ -576,6 +690,21 @@ def implementsRoad(cls):
 
 
 class RoadTestCase(unittest.TestCase):
+    def test_updateLanes__epoch(self):
+        road = Road(length=100, lanes_count=1, lane_width=1)
+        vehicle = Vehicle(position=(0, 0))
+        # Wide vehicles may be reached multiple times.
+        road.getAllActiveVehicles = Mock(return_value=[vehicle, vehicle])
+        road.addPendingVehicle = Mock()
+        road._commitLanes = Mock()
+        f = Mock(return_value=(1, 0))
+        road._updateLanes(f)
+        f.assert_called_once_with(vehicle)
+        # Next update moves the vehicle again.
+        road._updateLanes(f)
+        self.assertEqual(f.call_count, 2)
+        self.assertEqual(road.addPendingVehicle.call_count, 2)
+
     def test_interface(self):
         road = Road(100, 1, 1)
         with self.assertRaises(NotImplementedError):
@@ -594,6 +723,9 @@ class RoadTestCase(unittest.TestCase):
             _ = road.getPreviousVehicle(position=(0, 0))
         with self.assertRaises(NotImplementedError):
             _ = road._commitLanes()
+        with self.assertRaises(NotImplementedError):
+            road._commitVehicles(vehicles=np.array([]), x=np.array([]), lane=np.array([]),
+                                 length=np.array([]), width=np.array([]))
 
     def test_sublanesCount(self):
         road = Road(100, 1, lane_width=1)
@@ -684,11 +816,11 @@ class RoadTestCase(unittest.TestCase):
         vehicle = Mock(width=2, length=3, position=(2, 1))
 
         positions = [(0, 1), (1, 1), (2, 1), (0, 2), (1, 2), (2, 2)]
-        calls = [call(position=position) for position in positions]
+        calls = [call(position=position, ignore=None) for position in positions]
 
         def mock_isSafePosition(invalid: typing.Iterable[Position]) \
-                -> typing.Callable[[Position], bool]:
-            return lambda position: position not in invalid
+                -> typing.Callable[[Position, typing.Optional[Vehicle]], bool]:
+            return lambda position, ignore: position not in invalid
 
         road.isSafePosition = Mock(side_effect=mock_isSafePosition([]))
         self.assertTrue(road.canPlaceVehicle(vehicle=vehicle))
@@ -714,6 +846,34 @@ class RoadTestCase(unittest.TestCase):
         road.addVehicle.assert_called_once_with(vehicle=vehicle)
         self.assertCountEqual({vehicle}, road.emergency)
 
+    def test_getEmergencyVehicle(self):
+        road: Road = Road(length=100, lanes_count=1, lane_width=1)
+        road.addVehicle = Mock()
+        # No emergency vehicles.
+        self.assertIsNone(road.getEmergencyVehicle(x=50, radius=10))
+        behind = Mock(position=(40, 0), flags=VehicleFlags.EMERGENCY)
+        front = Mock(position=(60, 0), flags=VehicleFlags.EMERGENCY)
+        far = Mock(position=(90, 0), flags=VehicleFlags.EMERGENCY)
+        for vehicle in (front, far, behind):
+            road.addEmergencyVehicle(vehicle)
+        # Emergency vehicles too far.
+        self.assertIsNone(road.getEmergencyVehicle(x=10, radius=10))
+        self.assertIsNone(road.getEmergencyVehicle(x=75, radius=10))
+        # Emergency vehicle approaching and in front.
+        self.assertIs(road.getEmergencyVehicle(x=45, radius=10), behind)
+        self.assertIs(road.getEmergencyVehicle(x=35, radius=10), behind)
+        self.assertIs(road.getEmergencyVehicle(x=90, radius=10), far)
+        # The nearest emergency vehicle is preferred, the one behind on a tie.
+        self.assertIs(road.getEmergencyVehicle(x=51, radius=10), front)
+        self.assertIs(road.getEmergencyVehicle(x=50, radius=11), behind)
+        # Positions are refreshed on every step.
+        road._updateLanes = Mock()
+        behind.position = (80, 0)
+        self.assertIs(road.getEmergencyVehicle(x=45, radius=10), behind)
+        road.step()
+        self.assertIsNone(road.getEmergencyVehicle(x=45, radius=10))
+        self.assertIs(road.getEmergencyVehicle(x=75, radius=10), behind)
+
     def test_removeVehicle(self):
         road: Road = Road(length=100, lanes_count=1, lane_width=1)
         vehicle = Mock(position=(0, 0), flags=VehicleFlags.NONE)
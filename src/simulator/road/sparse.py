@@ -0,0 +1,182 @@
+import typing
+
+import numpy as np
+from sortedcontainers import SortedDict
+
+from simulator.position import Position
+from simulator.road.road import Road, CollisionError
+from simulator.road.speedcontroller import SpeedController
+from simulator.vehicle.vehicle import Vehicle
+
+# Vehicles on a sub-lane ordered by their front position.
+Lane = SortedDict
+
+
+class SparseRoad(Road):
+    '''
+    Road implementation for roads with low traffic, keeping only the occupied positions.
+    '''
+    lanes: typing.List[Lane]
+    pending_lanes: typing.List[Lane]
+    # Static layer of the obstacles, copied to the pending lanes on every commit.
+    static_lanes: typing.List[Lane]
+
+    def __init__(self, length: int, lanes_count: int, lane_width: int,
+                 controller: typing.Optional[SpeedController] = None):
+        super().__init__(length, lanes_count, lane_width, controller=controller)
+        self.static_lanes = [Lane() for _ in range(self.sublanesCount)]
+        self.lanes = self._emptyLanes()
+        self.pending_lanes = self._emptyLanes()
+
+    def _emptyLanes(self) -> typing.List[Lane]:
+        return [lane.copy() for lane in self.static_lanes]
+
+    def _findVehicle(self, lane: Lane, begin: int, end: int) -> typing.Optional[Vehicle]:
+        '''
+        Finds a vehicle occupying any of the positions in the range on a sub-lane.
+        :param lane: sub-lane to search.
+        :param begin: range start (inc.)
+        :param end: range end (inc.)
+        :return: a vehicle occupying the range or None.
+        '''
+        # Only the first vehicle in front of the range start may reach back to it.
+        i = lane.bisect_left(begin)
+        if i < len(lane):
+            head, vehicle = lane.peekitem(i)
+            if head - vehicle.length < end:
+                return vehicle
+        return None
+
+    def _isFree(self, lane: Lane, begin: int, end: int, ignore: typing.Optional[Vehicle]) -> bool:
+        '''
+        Checks if all the positions in the range on a sub-lane are free.
+        :param lane: sub-lane to search.
+        :param begin: range start (inc.)
+        :param end: range end (inc.)
+        :param ignore: vehicle allowed to occupy the range.
+        :return: if the range is free.
+        '''
+        for head in lane.irange(minimum=begin):
+            vehicle = lane[head]
+            if head - vehicle.length >= end:
+                return True
+            if vehicle is not ignore:
+                return False
+        return True
+
+    def _placeVehicle(self, lanes: typing.List[Lane], vehicle: Vehicle) -> None:
+        x, lane = vehicle.position
+        tail = x - vehicle.length + 1
+        if not self.isProperPosition(position=(x, lane)) or \
+                not self.isProperPosition(position=(tail, lane + vehicle.width - 1)):
+            raise IndexError(f'position {vehicle.position} not on the road')
+        for w in range(vehicle.width):
+            if self._findVehicle(lane=lanes[lane + w], begin=tail, end=x) is not None:
+                raise CollisionError()
+        for w in range(vehicle.width):
+            lanes[lane + w][x] = vehicle
+
+    def _getVehicle(self, lanes: typing.List[Lane], position: Position) \
+            -> typing.Optional[Vehicle]:
+        if not self.isProperPosition(position=position):
+            raise IndexError(f'position {position} not on the road')
+        x, lane = position
+        return self._findVehicle(lane=lanes[lane], begin=x, end=x)
+
+    def addVehicle(self, vehicle: Vehicle) -> None:
+        self._placeVehicle(lanes=self.lanes, vehicle=vehicle)
+        self.added.append(vehicle)
+
+    def addObstacle(self, obstacle: Vehicle) -> None:
+        x, lane = obstacle.position
+        tail = x - obstacle.length + 1
+        if not self.isProperPosition(position=(x, lane)) or \
+                not self.isProperPosition(position=(tail, lane + obstacle.width - 1)):
+            raise IndexError(f'position {obstacle.position} not on the road')
+        for lanes in (self.lanes, self.pending_lanes):
+            for w in range(obstacle.width):
+                if self._findVehicle(lane=lanes[lane + w], begin=tail, end=x) is not None:
+                    raise CollisionError()
+        for lanes in (self.static_lanes, self.lanes, self.pending_lanes):
+            self._placeVehicle(lanes=lanes, vehicle=obstacle)
+        self.obstacles.append(obstacle)
+
+    def getVehicle(self, position: Position) -> typing.Optional[Vehicle]:
+        return self._getVehicle(lanes=self.lanes, position=position)
+
+    def getAllActiveVehicles(self) -> typing.Generator[Vehicle, None, None]:
+        lanes = self.lanes
+        previous = Lane()
+        for lane in range(self.sublanesCount):
+            obstacles = self.static_lanes[lane]
+            # Vehicles are yielded on their first sub-lane only.
+            for x, vehicle in reversed(lanes[lane].items()):
+                if previous.get(x) is not vehicle and obstacles.get(x) is not vehicle:
+                    yield vehicle
+            previous = lanes[lane]
+
+    def addPendingVehicle(self, vehicle: Vehicle) -> None:
+        self._placeVehicle(lanes=self.pending_lanes, vehicle=vehicle)
+
+    def getPendingVehicle(self, position: Position) -> typing.Optional[Vehicle]:
+        return self._getVehicle(lanes=self.pending_lanes, position=position)
+
+    def isSafeArea(self, position: Position, length: int, width: int,
+                   ignore: typing.Optional[Vehicle] = None) -> bool:
+        x, lane = position
+        tail = x - length + 1
+        if not self.isProperPosition(position=position) or \
+                not self.isProperPosition(position=(tail, lane + width - 1)):
+            return False
+        return all(self._isFree(lane=lanes[lane + w], begin=tail, end=x, ignore=ignore)
+                   for lanes in (self.lanes, self.pending_lanes) for w in range(width))
+
+    def getNextVehicle(self, position: Position) -> typing.Tuple[int, typing.Optional[Vehicle]]:
+        x, lane = position
+        if not self.isProperPosition(position):
+            raise IndexError(f'position {position} not on the road')
+        sublane = self.lanes[lane]
+        i = sublane.bisect_left(x + 1)
+        if i == len(sublane):
+            return self.length, None
+        head, vehicle = sublane.peekitem(i)
+        return max(x + 1, head - vehicle.length + 1), vehicle
+
+    def getPreviousVehicle(self, position: Position) -> typing.Tuple[int, typing.Optional[Vehicle]]:
+        x, lane = position
+        if not self.isProperPosition(position):
+            raise IndexError(f'position {position} not on the road')
+        sublane = self.lanes[lane]
+        i = sublane.bisect_left(x)
+        # The first vehicle in front may still occupy the previous position.
+        if i < len(sublane):
+            head, vehicle = sublane.peekitem(i)
+            if head - vehicle.length < x - 1:
+                return x - 1, vehicle
+        if i == 0:
+            return -1, None
+        return sublane.peekitem(i - 1)
+
+    def _commitLanes(self) -> None:
+        self.lanes = self.pending_lanes
+        self.pending_lanes = self._emptyLanes()
+
+    def _commitVehicles(self, vehicles: np.ndarray, x: np.ndarray, lane: np.ndarray,
+                        length: np.ndarray, width: np.ndarray) -> None:
+        index, cell_lane, cell_x = self._getCells(x=x, lane=lane, length=length, width=width)
+        # Vehicles are kept by their front positions on every sub-lane they occupy.
+        heads = cell_x == x[index]
+        index, cell_lane = index[heads], cell_lane[heads]
+        lanes = self._emptyLanes()
+        for sublane, static in enumerate(self.static_lanes):
+            selected = index[cell_lane == sublane]
+            head = np.concatenate((x[selected], np.array(list(static.keys()), dtype=x.dtype)))
+            tail = head - np.concatenate((
+                length[selected],
+                np.array([obstacle.length for obstacle in static.values()], dtype=x.dtype))) + 1
+            order = np.argsort(head)
+            if np.any(tail[order][1:] <= head[order][:-1]):
+                raise CollisionError()
+            lanes[sublane].update(zip(x[selected].tolist(), vehicles[selected].tolist()))
+        self.lanes = lanes
+        self.pending_lanes = self._emptyLanes()
@@ -0,0 +1,29 @@
+import unittest
+from unittest.mock import Mock
+
+from simulator.road.sparse import SparseRoad
+from simulator.road.road import CollisionError
+from simulator.road.road_test import implementsRoad
+
+
+@implementsRoad
+class SparseRoadTestCase(unittest.TestCase):
+    def getRoad(self, length: int, lanes: int, width: int) -> SparseRoad:
+        return SparseRoad(length=length, lanes_count=lanes, lane_width=width)
+
+    def test_addVehicle__overlap(self):
+        road = self.getRoad(length=100, lanes=1, width=1)
+        road.addVehicle(Mock(length=3, width=1, position=(10, 0)))
+        # Vehicles reaching into the occupied range from the front or the back.
+        with self.assertRaises(CollisionError):
+            road.addVehicle(Mock(length=1, width=1, position=(8, 0)))
+        with self.assertRaises(CollisionError):
+            road.addVehicle(Mock(length=5, width=1, position=(12, 0)))
+        # Vehicles right next to the occupied range.
+        road.addVehicle(Mock(length=1, width=1, position=(7, 0)))
+        road.addVehicle(Mock(length=2, width=1, position=(12, 0)))
+        self.assertEqual(len(road.lanes[0]), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,18 +1,23 @@
 import typing
 from collections import defaultdict
 
-from intervaltree import IntervalTree, Interval
+from intervaltree import IntervalTree
 
 from simulator.position import Position
 
+# Speed limit at every position of a sub-lane.
+LimitTable = typing.Dict[int, typing.List[int]]
+
 
 class SpeedController:
     max_speed: int
     limits: typing.Dict[int, IntervalTree]
+    table: typing.Optional[LimitTable]
 
     def __init__(self, max_speed: int = 5):
         self.max_speed = max_speed
         self.limits = defaultdict(IntervalTree)
+        self.table = None
 
     def addLimit(self, lane: int, begin: int, end: int, limit: int) -> None:
         '''
@@ -24,6 +29,38 @@ class SpeedController:
         :return: None.
         '''
         self.limits[lane].addi(begin=begin, end=end + 1, data=limit)
+        # Lookup table has to be compiled again.
+        self.table = None
+
+    def compile(self) -> LimitTable:
+        '''
+        Builds a lookup table with the speed limit at every position of the limited sub-lanes.
+        :return: lookup table.
+        '''
+        table = {}
+        for lane, limits in self.limits.items():
+            if len(limits) == 0:
+                continue
+            row = [self.max_speed] * limits.end()
+            for limit in limits:
+                row[limit.begin:limit.end] = \
+                    [min(speed, limit.data) for speed in row[limit.begin:limit.end]]
+            table[lane] = row
+        return table
+
+    def getLaneMaxSpeeds(self, lane: int, length: int) -> typing.List[int]:
+        '''
+        Returns maximum speeds at all the positions of a sub-lane.
+        :param lane: sub-lane.
+        :param length: road length.
+        :return: maximum speed at every position.
+        '''
+        if self.table is None:
+            self.table = self.compile()
+        speeds = [self.max_speed] * length
+        row = self.table.get(lane, [])[:length]
+        speeds[:len(row)] = row
+        return speeds
 
     def getMaxSpeed(self, position: Position, width: int) -> int:
         '''
@@ -32,12 +69,12 @@ class SpeedController:
         :param width: vehicle width.
         :return: maximum speed.
         '''
+        if self.table is None:
+            self.table = self.compile()
         x, lane = position
         speed = self.max_speed
         for w in range(width):
-            if lane + w in self.limits:
-                limits: typing.Set[Interval] = self.limits[lane].at(x)
-                if len(limits) > 0:
-                    limit = min((limit.data for limit in limits))
-                    speed = min(speed, limit)
+            row = self.table.get(lane + w)
+            if row is not None and 0 <= x < len(row):
+                speed = min(speed, row[x])
         return speed
@@ -47,6 +47,40 @@ class SpeedControllerTestCase(unittest.TestCase):
         speed = controller.getMaxSpeed(position=(25, 0), width=1)
         self.assertEqual(speed, 3, 'invalid limit')
 
+    def test_getMaxSpeed__width(self):
+        controller = SpeedController(max_speed=10)
+        controller.addLimit(1, 10, 20, 5)
+        controller.addLimit(2, 15, 25, 3)
+        # Limits of all the occupied sub-lanes apply.
+        speed = controller.getMaxSpeed(position=(12, 0), width=1)
+        self.assertEqual(speed, 10, 'invalid limit')
+        speed = controller.getMaxSpeed(position=(12, 0), width=2)
+        self.assertEqual(speed, 5, 'invalid limit')
+        speed = controller.getMaxSpeed(position=(12, 1), width=2)
+        self.assertEqual(speed, 5, 'invalid limit')
+        speed = controller.getMaxSpeed(position=(22, 1), width=1)
+        self.assertEqual(speed, 10, 'invalid limit')
+        speed = controller.getMaxSpeed(position=(22, 1), width=2)
+        self.assertEqual(speed, 3, 'invalid limit')
+        speed = controller.getMaxSpeed(position=(17, 0), width=3)
+        self.assertEqual(speed, 3, 'invalid limit')
+
+    def test_addLimit(self):
+        controller = SpeedController(max_speed=10)
+        controller.addLimit(0, 10, 20, 5)
+        speed = controller.getMaxSpeed(position=(15, 0), width=1)
+        self.assertEqual(speed, 5, 'invalid limit')
+        self.assertIsNotNone(controller.table)
+        # New limits invalidate the compiled table.
+        controller.addLimit(0, 15, 25, 3)
+        self.assertIsNone(controller.table)
+        speed = controller.getMaxSpeed(position=(15, 0), width=1)
+        self.assertEqual(speed, 3, 'invalid limit')
+        speed = controller.getMaxSpeed(position=(25, 0), width=1)
+        self.assertEqual(speed, 3, 'invalid limit')
+        speed = controller.getMaxSpeed(position=(-1, 0), width=1)
+        self.assertEqual(speed, 10, 'invalid limit')
+
 
 if __name__ == '__main__':
     unittest.main()
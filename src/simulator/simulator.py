@@ -1,8 +1,13 @@
+import gzip
+import pickle
 import typing
-import random
 
 from simulator.dispatcher.dispatcher import Dispatcher
+from simulator.engine.batch import BatchEngine
 from simulator.road.road import Road
+from simulator.vehicle.table import TABLE
+from util import rand
+from util.rand import dispatcher_random
 
 
 class Hook:
@@ -25,12 +30,15 @@ class Hook:
 class Simulator:
     road: Road
     dispatcher: Dispatcher
+    engine: typing.Optional[BatchEngine]
     steps: int
     hooks: typing.List[Hook]
 
-    def __init__(self, road: Road, dispatcher: Dispatcher):
+    def __init__(self, road: Road, dispatcher: Dispatcher,
+                 engine: typing.Optional[BatchEngine] = None):
         self.road = road
         self.dispatcher = dispatcher
+        self.engine = engine
         self.steps = 0
         self.hooks = list()
 
@@ -43,11 +51,13 @@ class Simulator:
         for lane in range(self.road.lanes_count):
             for x in range(self.road.length):
                 position = self.road.getRelativePosition(position=(x, lane))
+                if not self.dispatcher._canPlaceVehicle(position=position) or \
+                        dispatcher_random.random() >= density:
+                    continue
                 vehicle = self.dispatcher._newVehicle(position=position)
                 # Set start to negative value to indicate a vehicle was scattered.
                 vehicle.setStatistics(start=-1)
-                if self.road.canPlaceVehicle(vehicle=vehicle) and random.random() < density:
-                    self.road.addVehicle(vehicle=vehicle)
+                self.road.addVehicle(vehicle=vehicle)
 
     def step(self) -> None:
         '''
@@ -55,11 +65,50 @@ class Simulator:
         :return: None.
         '''
         self.dispatcher.dispatch(step=self.steps)
-        self.road.step()
+        if self.engine is not None:
+            self.engine.step()
+        else:
+            self.road.step()
         self.steps += 1
+        if len(self.hooks) > 0:
+            self.sync()
         for hook in self.hooks:
             hook.run()
 
+    def sync(self) -> None:
+        '''
+        Updates the vehicles moved by the engine and stores the state of all the vehicles on the
+        road to the vehicle table, done before the hooks are run.
+        :return: None.
+        '''
+        if self.engine is not None:
+            self.engine.sync()
+        TABLE.store(self.road.getAllVehicles())
+
+    def save(self, file_path: str) -> None:
+        '''
+        Saves a checkpoint of the simulation including the attached hooks and the state of the
+        random number streams.
+        :param file_path: checkpoint file.
+        :return: None.
+        '''
+        self.sync()
+        with gzip.open(file_path, 'wb') as file:
+            pickle.dump((self, rand.getState()), file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(file_path: str) -> 'Simulator':
+        '''
+        Restores a simulation from a checkpoint, the random number streams continue from the
+        saved state.
+        :param file_path: checkpoint file.
+        :return: restored simulator.
+        '''
+        with gzip.open(file_path, 'rb') as file:
+            simulator, state = pickle.load(file)
+        rand.setState(state)
+        return simulator
+
     def addHook(self, hook: Hook) -> None:
         self.hooks.append(hook)
 
@@ -1,13 +1,23 @@
+import os
+import tempfile
+import typing
 import unittest
 from unittest.mock import Mock, patch
 
+from simulator.dispatcher.mixed import MixedDispatcher
 from simulator.position import Position
+from simulator.road.array import ArrayRoad
+from simulator.road.dense import DenseRoad
+from simulator.road.sparse import SparseRoad
 from simulator.simulator import Simulator, Hook
+from simulator.statistics.tracker import Tracker
+from simulator.vehicle.conventional import Driver
 from simulator.vehicle.vehicle import Vehicle
+from util import rand
 
 
 class SimulatorTestCase(unittest.TestCase):
-    @patch('random.random')
+    @patch('util.rand.dispatcher_random.random')
     def test_scatterVehicles(self, patched_random):
         road = Mock(length=10, lanes_count=1)
 
@@ -22,23 +32,27 @@ class SimulatorTestCase(unittest.TestCase):
 
         dispatcher._newVehicle.side_effect = mock_newVehicle
         simulator = Simulator(road=road, dispatcher=dispatcher)
-        # Road fully occupied.
-        road.canPlaceVehicle.return_value = False
+        # Road fully occupied, no vehicles are created.
+        dispatcher._canPlaceVehicle.return_value = False
         simulator.scatterVehicles(1.0)
         road.addVehicle.assert_not_called()
+        dispatcher._newVehicle.assert_not_called()
         # Low density.
-        road.canPlaceVehicle.return_value = True
+        dispatcher._canPlaceVehicle.return_value = True
         patched_random.return_value = 1
         simulator.scatterVehicles(0)
         road.addVehicle.assert_not_called()
+        dispatcher._newVehicle.assert_not_called()
         # Add a vehicle.
-        road.canPlaceVehicle.side_effect = [True, True] + [False] * 8
+        dispatcher._canPlaceVehicle.side_effect = [True, True] + [False] * 8
         patched_random.side_effect = [0, 1, 0]
         simulator.scatterVehicles(.5)
         road.addVehicle.assert_called_once()
+        dispatcher._newVehicle.assert_called_once_with(position=(0, 0))
 
     def test_step(self):
         road = Mock()
+        road.getAllVehicles.return_value = []
         dispatcher = Mock()
         simulator = Simulator(road=road, dispatcher=dispatcher)
         # No hooks.
@@ -67,6 +81,37 @@ class SimulatorTestCase(unittest.TestCase):
         simulator.removeHook(hook)
         self.assertNotIn(hook, simulator.hooks)
 
+    def test_save(self):
+        def run(simulator: Simulator, steps: int) -> typing.List[list]:
+            states = []
+            for _ in range(steps):
+                simulator.step()
+                states.append([(vehicle.position, vehicle.velocity)
+                               for vehicle in simulator.road.getAllVehicles()])
+            return states
+
+        for road_class in (DenseRoad, ArrayRoad, SparseRoad):
+            with self.subTest(road=road_class.__name__), tempfile.TemporaryDirectory() as path:
+                rand.seed(42)
+                road = road_class(length=50, lanes_count=3, lane_width=1)
+                dispatcher = MixedDispatcher(
+                    road=road, count=2, penetration=.5, driver=Driver(), length=2)
+                simulator = Simulator(road=road, dispatcher=dispatcher)
+                simulator.scatterVehicles(density=.2)
+                tracker = Tracker(simulator=simulator)
+                simulator.addHook(tracker)
+                run(simulator, 20)
+                # Save a checkpoint and continue the simulation.
+                file_path = os.path.join(path, 'checkpoint')
+                simulator.save(file_path)
+                expected = run(simulator, 20)
+                # Restored simulation continues the same way.
+                restored = Simulator.load(file_path)
+                self.assertEqual(restored.steps, 20)
+                self.assertListEqual(run(restored, 20), expected)
+                restored_tracker, = restored.hooks
+                self.assertTrue(restored_tracker.getAverageData().equals(tracker.getAverageData()))
+
 
 class HookTestCase(unittest.TestCase):
     def test_interface(self):
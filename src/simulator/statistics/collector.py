@@ -1,12 +1,14 @@
 import enum
 import typing
 
+import numpy as np
+
 from simulator.road.road import Road
 from simulator.simulator import Hook, Simulator
-from simulator.statistics.averageresult import AverageResult
-from simulator.vehicle.autonomous import isAutonomous
-from simulator.vehicle.car import isCar
-from simulator.vehicle.conventional import isConventional
+from simulator.statistics.filters import selectKind
+from simulator.statistics.vehicletype import VehicleType
+from simulator.vehicle.table import TABLE
+from simulator.vehicle.vehicle import VehicleKind
 from util.enum import withLimits
 
 
@@ -18,26 +20,35 @@ class Statistics(enum.Flag):
     TRAVEL_TIME = enum.auto()
 
 
+# Spans of the cells passed by vehicles in a step: lanes, first cells and cells after the last.
+Spans = typing.Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
 class Collector(Hook):
+    '''
+    Collects statistics of the road cells. Statistics of the cells passed by vehicles are kept as
+    difference arrays along the road, a vehicle adds its value at the first passed cell and
+    subtracts it after the last one, the values of the cells are prefix sums of the arrays.
+    '''
     statistics: Statistics
     skip: int
     steps: int
 
-    # Velocity statistics buffers.
-    velocity: typing.List[typing.List[AverageResult]]
-    velocity_autonomous: typing.List[typing.List[AverageResult]]
-    velocity_conventional: typing.List[typing.List[AverageResult]]
+    # Velocity statistics buffers, differences of the velocity sums and counts.
+    velocity: np.ndarray
+    velocity_autonomous: np.ndarray
+    velocity_conventional: np.ndarray
 
-    # Throughput statistics buffers.
-    throughput: typing.List[typing.List[int]]
+    # Throughput statistics buffers, differences of the counts.
+    throughput: np.ndarray
 
-    # Heat map statistics buffers.
-    heat_map: typing.List[typing.List[float]]
+    # Heat map statistics buffers, differences of the traffic.
+    heat_map: np.ndarray
 
-    # Travel time buffers.
-    travel: typing.List[int]
-    travel_autonomous: typing.List[int]
-    travel_conventional: typing.List[int]
+    # Travel time buffers, counts of the removed vehicles by their travel time.
+    travel: np.ndarray
+    travel_autonomous: np.ndarray
+    travel_conventional: np.ndarray
 
     def __init__(self, simulator: Simulator, statistics: Statistics = Statistics.ALL,
                  skip: int = 0):
@@ -77,92 +88,127 @@ class Collector(Hook):
     def _travelLimit(self) -> int:
         return self._road.length * 2
 
+    def _newDifferences(self, planes: int = 0, dtype: typing.Any = np.int64) -> np.ndarray:
+        '''
+        Creates a zeroed difference array with an extra cell after the end of the road.
+        :param planes: number of the stacked arrays, 0 for a single array.
+        :param dtype: type of the values.
+        :return: difference array indexed by lane and cell.
+        '''
+        shape = (self._road.lanes_count, self._road.length + 1)
+        return np.zeros((planes, *shape) if planes > 0 else shape, dtype=dtype)
+
+    def _getSpans(self, handles: np.ndarray) -> Spans:
+        '''
+        Gets the cells passed by the vehicles in the last step, the cells are bounded by the road.
+        :param handles: handles of the vehicles in the vehicle table.
+        :return: lanes, first cells and cells after the last one.
+        '''
+        columns = TABLE.columns
+        last_x = columns['last_x'][handles]
+        cur_x, lanes = self._road.getAbsolutePosition((columns['x'][handles],
+                                                       columns['lane'][handles]))
+        return lanes, last_x, np.minimum(cur_x, self._road.length)
+
+    @staticmethod
+    def _scatter(differences: np.ndarray, spans: Spans, value: typing.Any = 1) -> None:
+        '''
+        Adds a value to all the cells of the spans.
+        :param differences: difference array indexed by lane and cell.
+        :param spans: spans of the cells, the empty spans are ignored.
+        :param value: value added to the cells, single or one per span.
+        :return: None.
+        '''
+        lanes, begin, end = spans
+        value = np.broadcast_to(value, lanes.shape)
+        selected = begin < end
+        lanes, begin, end, value = lanes[selected], begin[selected], end[selected], value[selected]
+        np.add.at(differences, (lanes, begin), value)
+        np.subtract.at(differences, (lanes, end), value)
+
+    @staticmethod
+    def _sumDifferences(differences: np.ndarray) -> np.ndarray:
+        return np.cumsum(differences, axis=-1)[..., :-1]
+
     def _initVelocity(self):
-        self.velocity = \
-            [[AverageResult(0, 0) for _ in range(self._road.length)]
-             for _ in range(self._road.lanes_count)]
-        self.velocity_autonomous = \
-            [[AverageResult(0, 0) for _ in range(self._road.length)]
-             for _ in range(self._road.lanes_count)]
-        self.velocity_conventional = \
-            [[AverageResult(0, 0) for _ in range(self._road.length)]
-             for _ in range(self._road.lanes_count)]
+        self.velocity = self._newDifferences(planes=2)
+        self.velocity_autonomous = self._newDifferences(planes=2)
+        self.velocity_conventional = self._newDifferences(planes=2)
 
     def _collectVelocity(self) -> None:
-        for vehicle in self._road.getAllActiveVehicles():
-            last_x, _ = self._road.getAbsolutePosition(vehicle.last_position)
-            cur_x, lane = self._road.getAbsolutePosition(vehicle.position)
-            for x in range(last_x, cur_x):
-                if x >= self._road.length:
-                    continue
-                value = AverageResult(value=vehicle.velocity, count=1)
-                if isCar(vehicle):
-                    self.velocity[lane][x] += value
-                if isAutonomous(vehicle):
-                    self.velocity_autonomous[lane][x] += value
-                if isConventional(vehicle):
-                    self.velocity_conventional[lane][x] += value
+        handles = TABLE.getHandles(self._road.getAllActiveVehicles())
+        lanes, begin, end = self._getSpans(handles)
+        columns = TABLE.columns
+        kinds = columns['kind'][handles]
+        velocity = columns['velocity'][handles]
+        for differences, mask in ((self.velocity, VehicleKind.CAR),
+                                  (self.velocity_autonomous, VehicleKind.AUTONOMOUS),
+                                  (self.velocity_conventional, VehicleKind.CONVENTIONAL)):
+            selected = selectKind(kinds, mask)
+            spans = lanes[selected], begin[selected], end[selected]
+            self._scatter(differences[0], spans, velocity[selected])
+            self._scatter(differences[1], spans)
+
+    def getVelocity(self, vehicle_type: VehicleType = VehicleType.ANY) -> np.ndarray:
+        '''
+        Returns an average velocity of the vehicles passing the cells.
+        :param vehicle_type: type of the vehicles.
+        :return: average velocity indexed by lane and cell, zero in the cells nobody passed.
+        '''
+        differences = {
+            VehicleType.ANY: self.velocity,
+            VehicleType.AUTONOMOUS: self.velocity_autonomous,
+            VehicleType.CONVENTIONAL: self.velocity_conventional,
+        }[vehicle_type]
+        sums, counts = self._sumDifferences(differences)
+        return np.divide(sums, counts, out=np.zeros(sums.shape), where=counts > 0)
 
     def _initThroughput(self) -> None:
-        self.throughput = [[0] * self._road.length for _ in range(self._road.lanes_count)]
+        self.throughput = self._newDifferences()
 
     def _collectThroughput(self) -> None:
-        for vehicle in self._road.getAllVehicles():
-            last_x, _ = self._road.getAbsolutePosition(vehicle.last_position)
-            cur_x, lane = self._road.getAbsolutePosition(vehicle.position)
-            for x in range(last_x, cur_x):
-                if x < self._road.length:
-                    self.throughput[lane][x] += 1
-
-    def getThrougput(self) -> typing.List[typing.List[float]]:
+        handles = TABLE.getHandles(self._road.getAllVehicles())
+        self._scatter(self.throughput, self._getSpans(handles))
+
+    def getThrougput(self) -> np.ndarray:
         '''
         Returns a normalized throughput, representing average throughput in a single step.
-        :return: normalized throughput.
+        :return: normalized throughput indexed by lane and cell.
         '''
         N = float(self.steps - self.skip)
-        throughput = [[.0] * self._road.length for _ in range(self._road.lanes_count)]
-        for lane in range(self._road.lanes_count):
-            for x in range(self._road.length):
-                throughput[lane][x] = self.throughput[lane][x] / N
-        return throughput
+        return self._sumDifferences(self.throughput) / N
 
     def _initHeatMap(self) -> None:
-        self.heat_map = [[.0] * self._road.length for _ in range(self._road.lanes_count)]
+        self.heat_map = self._newDifferences(dtype=np.float64)
 
     def _collectHeatMap(self) -> None:
-        for vehicle in self._road.getAllVehicles():
-            last_x, _ = self._road.getAbsolutePosition(vehicle.last_position)
-            cur_x, lane = self._road.getAbsolutePosition(vehicle.position)
-            value = 1. / (cur_x - last_x + 1)
-            if cur_x == last_x:
-                self.heat_map[lane][cur_x] += 1.
-            for x in range(last_x, cur_x):
-                if x < self._road.length:
-                    self.heat_map[lane][x] += value
-
-    def getHeatMap(self) -> typing.List[typing.List[float]]:
+        handles = TABLE.getHandles(self._road.getAllVehicles())
+        lanes, begin, end = self._getSpans(handles)
+        cur_x = TABLE.columns['x'][handles]
+        # Traffic is split among the passed cells, a waiting vehicle occupies its cell.
+        value = 1. / (cur_x - begin + 1)
+        end = np.where(cur_x == begin, cur_x + 1, end)
+        self._scatter(self.heat_map, (lanes, begin, end), value)
+
+    def getHeatMap(self) -> np.ndarray:
         '''
         Returns a normalized heat map, representing average traffic in a single step.
-        :return: normalized heat map.
+        :return: normalized heat map indexed by lane and cell.
         '''
         N = self.steps - self.skip
-        heat_map = [[.0] * self._road.length for _ in range(self._road.lanes_count)]
-        for lane in range(self._road.lanes_count):
-            for x in range(self._road.length):
-                heat_map[lane][x] = self.heat_map[lane][x] / N
-        return heat_map
+        return self._sumDifferences(self.heat_map) / N
 
     def _initTravelTime(self) -> None:
-        self.travel = [0] * self._travelLimit
-        self.travel_autonomous = [0] * self._travelLimit
-        self.travel_conventional = [0] * self._travelLimit
+        self.travel = np.zeros(self._travelLimit, dtype=np.int64)
+        self.travel_autonomous = np.zeros(self._travelLimit, dtype=np.int64)
+        self.travel_conventional = np.zeros(self._travelLimit, dtype=np.int64)
 
     def _collectTravelTime(self) -> None:
-        for vehicle in self._road.removed:
-            time = min(self.simulator.steps - vehicle.start, self._travelLimit - 1)
-            if isCar(vehicle):
-                self.travel[time] += 1
-            if isAutonomous(vehicle):
-                self.travel_autonomous[time] += 1
-            if isConventional(vehicle):
-                self.travel_conventional[time] += 1
+        columns = TABLE.columns
+        handles = TABLE.getHandles(self._road.removed)
+        kinds = columns['kind'][handles]
+        time = np.minimum(self.simulator.steps - columns['start'][handles], self._travelLimit - 1)
+        for travel, mask in ((self.travel, VehicleKind.CAR),
+                             (self.travel_autonomous, VehicleKind.AUTONOMOUS),
+                             (self.travel_conventional, VehicleKind.CONVENTIONAL)):
+            np.add.at(travel, time[selectKind(kinds, mask)], 1)
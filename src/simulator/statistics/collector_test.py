@@ -1,7 +1,16 @@
 import unittest
 from unittest.mock import Mock
 
+from simulator.dispatcher.mixed import MixedDispatcher
+from simulator.road.dense import DenseRoad
+from simulator.road.speedcontroller import SpeedController
+from simulator.simulator import Simulator
 from simulator.statistics.collector import Collector, Statistics
+from simulator.statistics.vehicletype import VehicleType
+from simulator.vehicle.autonomous import isAutonomous
+from simulator.vehicle.car import isCar
+from simulator.vehicle.conventional import Driver, isConventional
+from util import rand
 
 
 class CollectorTestCase(unittest.TestCase):
@@ -149,6 +158,51 @@ class CollectorTestCase(unittest.TestCase):
         collector = Collector(simulator=simulator, statistics=Statistics.NONE)
         self.assertIs(road, collector._road)
 
+    def test_collect(self):
+        rand.seed(42)
+        road = DenseRoad(length=50, lanes_count=2, lane_width=2,
+                         controller=SpeedController(max_speed=5))
+        dispatcher = MixedDispatcher(road=road, count=2, penetration=.5, driver=Driver())
+        simulator = Simulator(road=road, dispatcher=dispatcher)
+        simulator.scatterVehicles(density=.2)
+        # Statistics of every passed cell computed directly.
+        throughput = [[0] * road.length for _ in range(road.lanes_count)]
+        heat_map = [[.0] * road.length for _ in range(road.lanes_count)]
+        velocity = {vehicle_type: [[(0, 0)] * road.length for _ in range(road.lanes_count)]
+                    for vehicle_type in VehicleType}
+        predicates = {VehicleType.ANY: isCar, VehicleType.AUTONOMOUS: isAutonomous,
+                      VehicleType.CONVENTIONAL: isConventional}
+        steps = 30
+        with Collector(simulator=simulator) as collector:
+            for _ in range(steps):
+                simulator.step()
+                for vehicle in road.getAllVehicles():
+                    last_x, _ = road.getAbsolutePosition(vehicle.last_position)
+                    cur_x, lane = road.getAbsolutePosition(vehicle.position)
+                    if cur_x == last_x:
+                        heat_map[lane][cur_x] += 1.
+                    for x in range(last_x, min(cur_x, road.length)):
+                        throughput[lane][x] += 1
+                        heat_map[lane][x] += 1. / (cur_x - last_x + 1)
+                        if vehicle not in road.removed:
+                            for vehicle_type, predicate in predicates.items():
+                                if predicate(vehicle):
+                                    value, count = velocity[vehicle_type][lane][x]
+                                    velocity[vehicle_type][lane][x] = \
+                                        value + vehicle.velocity, count + 1
+        result_throughput = collector.getThrougput()
+        result_heat_map = collector.getHeatMap()
+        result_velocity = {vehicle_type: collector.getVelocity(vehicle_type)
+                           for vehicle_type in VehicleType}
+        for lane in range(road.lanes_count):
+            for x in range(road.length):
+                self.assertAlmostEqual(result_throughput[lane][x], throughput[lane][x] / steps)
+                self.assertAlmostEqual(result_heat_map[lane][x], heat_map[lane][x] / steps)
+                for vehicle_type in VehicleType:
+                    value, count = velocity[vehicle_type][lane][x]
+                    self.assertAlmostEqual(result_velocity[vehicle_type][lane][x],
+                                           value / count if count > 0 else 0.)
+
 
 if __name__ == '__main__':
     unittest.main()
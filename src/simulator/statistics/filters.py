@@ -1,6 +1,8 @@
 import typing
 
-from simulator.vehicle.vehicle import Vehicle
+import numpy as np
+
+from simulator.vehicle.vehicle import Vehicle, isKind
 
 
 Filter = typing.Callable[[Vehicle], bool]
@@ -12,3 +14,17 @@ def combine(*predicates: Filter) -> Filter:
 
 def filterLane(lane: int) -> Filter:
     return lambda vehicle: vehicle.position[1] == lane
+
+
+def filterKind(mask: int) -> Filter:
+    return lambda vehicle: isKind(vehicle.KIND, mask)
+
+
+def selectKind(kinds: np.ndarray, mask: int) -> np.ndarray:
+    '''
+    Matches kind codes of many vehicles at once.
+    :param kinds: kind codes of the vehicles.
+    :param mask: kind code of the vehicle class to match.
+    :return: boolean array selecting the vehicles of the class or its subclasses.
+    '''
+    return kinds & mask == mask
@@ -1,7 +1,10 @@
 import unittest
 from unittest.mock import Mock
 
-from simulator.statistics.filters import combine, filterLane
+import numpy as np
+
+from simulator.statistics.filters import combine, filterKind, filterLane, selectKind
+from simulator.vehicle.vehicle import VehicleKind
 
 
 class FiltersTestCase(unittest.TestCase):
@@ -27,6 +30,22 @@ class FiltersTestCase(unittest.TestCase):
         self.assertFalse(filterLane(0)(vehicle))
         self.assertFalse(filterLane(2)(vehicle))
 
+    def test_filterKind(self):
+        self.assertTrue(filterKind(VehicleKind.CAR)(Mock(KIND=VehicleKind.AUTONOMOUS)))
+        self.assertTrue(filterKind(VehicleKind.AUTONOMOUS)(Mock(KIND=VehicleKind.AUTONOMOUS)))
+        self.assertFalse(filterKind(VehicleKind.CONVENTIONAL)(Mock(KIND=VehicleKind.AUTONOMOUS)))
+        self.assertFalse(filterKind(VehicleKind.CAR)(Mock(KIND=VehicleKind.OBSTACLE)))
+
+    def test_selectKind(self):
+        kinds = np.array([VehicleKind.OBSTACLE, VehicleKind.CONVENTIONAL, VehicleKind.AUTONOMOUS,
+                          VehicleKind.EMERGENCY, VehicleKind.CAR])
+        self.assertListEqual(selectKind(kinds, VehicleKind.CAR).tolist(),
+                             [False, True, True, True, True])
+        self.assertListEqual(selectKind(kinds, VehicleKind.CONVENTIONAL).tolist(),
+                             [False, True, False, False, False])
+        self.assertListEqual(selectKind(kinds, VehicleKind.OBSTACLE).tolist(),
+                             [True, False, False, False, False])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,149 @@
+import os
+import queue
+import threading
+import typing
+
+import numpy as np
+import pandas as pd
+
+from simulator.simulator import Hook, Simulator
+from simulator.statistics.tracker import METRICS, Tracker
+from simulator.statistics.vehicletype import VehicleType, getVehicleTypeName
+from util.npyfile import NpyWriter
+
+
+def getColumns() -> typing.List[str]:
+    '''
+    Returns names of the written columns, the step and the number of the tracked vehicles and
+    the metric sums for every vehicle type.
+    :return: column names.
+    '''
+    columns = ['step']
+    for vehicle_type in VehicleType:
+        name = getVehicleTypeName(vehicle_type)
+        columns.append(f'count_{name}')
+        columns.extend(f'{column}_{name}' for _, column in METRICS)
+    return columns
+
+
+def readMetrics(path: str) -> pd.DataFrame:
+    '''
+    Reads the metrics written by a metrics writer.
+    :param path: directory of the metrics.
+    :return: data frame with a row for every step.
+    '''
+    return pd.DataFrame({column: np.load(os.path.join(path, f'{column}.npy'))
+                         for column in getColumns()})
+
+
+class MetricsWriter(Hook):
+    '''
+    Streams the metrics of a tracker in every step to a directory of append-only .npy files, one
+    per column. Rows are collected in batches written by a background thread, so the simulation
+    does not wait for the disk, only the last unfinished batch is lost when the simulation
+    crashes. The writer has to run after the tracker, the steps skipped by the tracker are not
+    written.
+    '''
+    tracker: Tracker
+    path: str
+    batch_size: int
+    files: typing.List[NpyWriter]
+    batch: np.ndarray
+    used: int
+    batches: queue.Queue
+    thread: threading.Thread
+    error: typing.Optional[BaseException]
+
+    def __init__(self, simulator: Simulator, tracker: Tracker, path: str,
+                 batch_size: int = 1024, max_batches: int = 4):
+        '''
+        :param simulator: simulator.
+        :param tracker: tracker of the metrics.
+        :param path: directory of the metrics, created if it does not exist.
+        :param batch_size: number of the steps written at once.
+        :param max_batches: number of the batches waiting to be written before the simulation
+            gets blocked.
+        '''
+        super().__init__(simulator=simulator)
+        self.tracker = tracker
+        self.path = path
+        self.batch_size = batch_size
+        os.makedirs(path, exist_ok=True)
+        columns = getColumns()
+        self.files = [NpyWriter(path=os.path.join(path, f'{column}.npy'), dtype=np.int64)
+                      for column in columns]
+        self.batch = np.empty((batch_size, len(columns)), dtype=np.int64)
+        self.used = 0
+        self.batches = queue.Queue(maxsize=max_batches)
+        self.error = None
+        self.thread = threading.Thread(target=self._write, daemon=True)
+        self.thread.start()
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        super().__exit__(exc_type, exc_value, exc_traceback)
+        self.close()
+
+    def run(self) -> None:
+        if self.tracker.steps <= self.tracker.skip:
+            return
+        row = self.batch[self.used]
+        row[0] = self.simulator.steps
+        i = 1
+        for vehicle_type in VehicleType:
+            row[i] = self.tracker.getLastSample('velocity', vehicle_type).count
+            i += 1
+            for metric, _ in METRICS:
+                row[i] = self.tracker.getLastSample(metric, vehicle_type).value
+                i += 1
+        self.used += 1
+        if self.used == self.batch_size:
+            self.flush()
+
+    def _write(self) -> None:
+        '''
+        Writes the batches in the background until the writer gets closed.
+        :return: None.
+        '''
+        while True:
+            batch = self.batches.get()
+            try:
+                if batch is None:
+                    return
+                # Keep taking the batches after an error, so the simulation is not blocked.
+                if self.error is None:
+                    for file, column in zip(self.files, batch.T):
+                        file.append(column)
+            except BaseException as error:
+                self.error = error
+            finally:
+                self.batches.task_done()
+
+    def _checkError(self) -> None:
+        if self.error is not None:
+            raise IOError(f'writing metrics to {self.path} failed') from self.error
+
+    def _putBatch(self) -> None:
+        if self.used > 0:
+            self.batches.put(self.batch[:self.used])
+            self.batch = np.empty_like(self.batch)
+            self.used = 0
+
+    def flush(self) -> None:
+        '''
+        Passes the collected rows to the background thread.
+        :return: None.
+        '''
+        self._checkError()
+        self._putBatch()
+
+    def close(self) -> None:
+        '''
+        Writes the remaining rows and waits for the background thread.
+        :return: None.
+        '''
+        if not self.thread.is_alive():
+            return
+        self._putBatch()
+        self.batches.put(None)
+        self.thread.join()
+        self._checkError()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from simulator.dispatcher.mixed import MixedDispatcher
+from simulator.road.dense import DenseRoad
+from simulator.road.speedcontroller import SpeedController
+from simulator.simulator import Simulator
+from simulator.statistics.metricswriter import MetricsWriter, getColumns, readMetrics
+from simulator.statistics.tracker import Tracker
+from simulator.statistics.vehicletype import VehicleType
+from simulator.vehicle.conventional import Driver
+from util import rand
+
+
+class MetricsWriterTestCase(unittest.TestCase):
+    def setUp(self):
+        rand.seed(42)
+        road = DenseRoad(length=50, lanes_count=2, lane_width=1,
+                         controller=SpeedController(max_speed=5))
+        dispatcher = MixedDispatcher(road=road, count=2, penetration=.5, driver=Driver())
+        self.simulator = Simulator(road=road, dispatcher=dispatcher)
+        self.simulator.scatterVehicles(density=.2)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'metrics')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_run(self):
+        steps = 25
+        velocity = []
+        with Tracker(simulator=self.simulator) as tracker, \
+                MetricsWriter(simulator=self.simulator, tracker=tracker, path=self.path,
+                              batch_size=10):
+            for _ in range(steps):
+                self.simulator.step()
+                velocity.append(tracker.getLastSample('velocity', VehicleType.ANY).value)
+        data = readMetrics(self.path)
+        self.assertListEqual(list(data.columns), getColumns())
+        self.assertListEqual(data['step'].tolist(), list(range(1, steps + 1)))
+        self.assertListEqual(data['velocity_all'].tolist(), velocity)
+        # Sums of the steps match the tracker averages.
+        for column, getAverage in (('velocity', tracker.getAverageVelocity),
+                                   ('waiting', tracker.getAverageWaiting),
+                                   ('laneChanges', tracker.getAverageLaneChanges)):
+            for name, vehicle_type in (('all', VehicleType.ANY),
+                                       ('autonomous', VehicleType.AUTONOMOUS),
+                                       ('conventional', VehicleType.CONVENTIONAL)):
+                self.assertAlmostEqual(
+                    data[f'{column}_{name}'].sum() / data[f'count_{name}'].sum(),
+                    getAverage(vehicle_type))
+        throughput, _ = tracker.throughput[VehicleType.ANY].value()
+        self.assertEqual(data['throughput_all'].sum(), throughput)
+
+    def test_run__batches(self):
+        with Tracker(simulator=self.simulator) as tracker, \
+                MetricsWriter(simulator=self.simulator, tracker=tracker, path=self.path,
+                              batch_size=4) as writer:
+            for _ in range(10):
+                self.simulator.step()
+            # Two full batches are passed to the background thread.
+            self.assertEqual(writer.used, 2)
+        self.assertFalse(writer.thread.is_alive())
+        self.assertEqual(len(np.load(os.path.join(self.path, 'step.npy'))), 10)
+
+    def test_run__error(self):
+        with Tracker(simulator=self.simulator) as tracker:
+            writer = MetricsWriter(simulator=self.simulator, tracker=tracker, path=self.path,
+                                   batch_size=2)
+            with patch.object(writer.files[0], 'append', side_effect=OSError('disk full')):
+                with writer:
+                    # The only batch is passed on before it fails to be written.
+                    for _ in range(2):
+                        self.simulator.step()
+                    writer.batches.join()
+                    with self.assertRaises(IOError):
+                        writer.flush()
+                    with self.assertRaises(IOError):
+                        writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
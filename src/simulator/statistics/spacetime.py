@@ -0,0 +1,94 @@
+import itertools
+import typing
+
+import numpy as np
+
+from simulator.simulator import Hook, Simulator
+from simulator.vehicle.table import TABLE
+from util.chunkedarray import ChunkedArray
+
+# Value of the cells without a vehicle.
+EMPTY = -1
+
+
+class SpaceTimeCollector(Hook):
+    '''
+    Records the space-time diagram of the traffic, the velocity of the vehicle occupying every
+    cell of the road after the recorded steps. The field of (steps x sub-lanes x length) cells is
+    stored in chunks spilled to a memory-mapped .npy file once they exceed the memory budget,
+    the file holds all the recorded steps only after save.
+    '''
+    skip: int
+    every: int
+    steps: int
+    field: ChunkedArray
+    frame: np.ndarray
+
+    def __init__(self, simulator: Simulator, skip: int = 0, every: int = 1,
+                 chunk_size: int = 256, memory_budget: int = 256 * 2 ** 20,
+                 path: typing.Optional[str] = None, dtype: typing.Any = None):
+        '''
+        :param simulator: simulator.
+        :param skip: number of the first steps not recorded.
+        :param every: record only every n-th step.
+        :param chunk_size: number of steps in a chunk.
+        :param memory_budget: maximal size of the steps kept in memory (bytes).
+        :param path: path of the .npy file, a temporary file is used if not given.
+        :param dtype: type of the velocities, the smallest signed integer type holding the maximum
+            speed of the road by default.
+        '''
+        super().__init__(simulator=simulator)
+        self.skip = skip
+        self.every = every
+        self.steps = 0
+        road = simulator.road
+        if dtype is None:
+            dtype = np.min_scalar_type(-road.controller.max_speed - 1)
+        shape = (road.sublanesCount, road.length)
+        self.field = ChunkedArray(shape=shape, dtype=dtype, chunk_size=chunk_size,
+                                  memory_budget=memory_budget, path=path)
+        self.frame = np.empty(shape, dtype=dtype)
+
+    def run(self) -> None:
+        self.steps += 1
+        if self.steps <= self.skip or (self.steps - self.skip - 1) % self.every != 0:
+            return
+        road = self.simulator.road
+        columns = TABLE.columns
+        # Removed vehicles are not on the road anymore.
+        handles = TABLE.getHandles(itertools.chain(road.getAllActiveVehicles(), road.obstacles))
+        x, lane = columns['x'][handles], columns['lane'][handles]
+        length, width = columns['length'][handles], columns['width'][handles]
+        velocity = columns['velocity'][handles]
+        if velocity.max(initial=0) > np.iinfo(self.frame.dtype).max:
+            raise ValueError(f'velocity {velocity.max()} does not fit {self.frame.dtype}')
+        self.frame.fill(EMPTY)
+        # Fill the cells covered by the vehicles one offset from the front at a time.
+        for i in range(int(length.max(initial=0))):
+            for w in range(int(width.max(initial=0))):
+                cell_x = x - i
+                selected = (length > i) & (width > w) & (cell_x >= 0) & (cell_x < road.length)
+                self.frame[lane[selected] + w, cell_x[selected]] = velocity[selected]
+        self.field.append(self.frame)
+
+    def getField(self) -> np.ndarray:
+        '''
+        Returns the recorded velocity field, memory-mapped if it was spilled to the file.
+        :return: velocities indexed by recorded step, sub-lane and cell, EMPTY in empty cells.
+        '''
+        return self.field.toArray()
+
+    def getOccupancy(self) -> np.ndarray:
+        '''
+        Returns the recorded occupancy field.
+        :return: whether a cell is occupied indexed by recorded step, sub-lane and cell.
+        '''
+        return self.getField() != EMPTY
+
+    def save(self) -> str:
+        '''
+        Writes all the recorded steps to the .npy file.
+        :return: path of the file.
+        '''
+        self.field.flush()
+        return self.field.path
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+
+from interface.obstacle import addObstacle
+from simulator.dispatcher.mixed import MixedDispatcher
+from simulator.road.dense import DenseRoad
+from simulator.road.speedcontroller import SpeedController
+from simulator.simulator import Simulator
+from simulator.statistics.spacetime import EMPTY, SpaceTimeCollector
+from simulator.vehicle.conventional import ConventionalCar, Driver
+from util import rand
+
+
+class SpaceTimeCollectorTestCase(unittest.TestCase):
+    def getSimulator(self) -> Simulator:
+        rand.seed(42)
+        road = DenseRoad(length=40, lanes_count=2, lane_width=2,
+                         controller=SpeedController(max_speed=5))
+        addObstacle(road=road, obstacle=(1, 20, 21))
+        dispatcher = MixedDispatcher(road=road, count=2, penetration=.5, driver=Driver(),
+                                     length=2)
+        simulator = Simulator(road=road, dispatcher=dispatcher)
+        simulator.scatterVehicles(density=.1)
+        return simulator
+
+    def test_run(self):
+        simulator = self.getSimulator()
+        road = simulator.road
+        expected = []
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'field.npy')
+            # A chunk of 2 steps and a budget of 2 chunks spills the steps to the file.
+            step_bytes = road.sublanesCount * road.length
+            with SpaceTimeCollector(simulator=simulator, skip=3, every=2, chunk_size=2,
+                                    memory_budget=4 * step_bytes, path=path) as collector:
+                for step in range(1, 21):
+                    simulator.step()
+                    if step <= 3 or (step - 4) % 2 != 0:
+                        continue
+                    frame = np.full((road.sublanesCount, road.length), EMPTY)
+                    for vehicle in [*road.getAllActiveVehicles(), *road.obstacles]:
+                        x, lane = vehicle.position
+                        for i in range(vehicle.length):
+                            for w in range(vehicle.width):
+                                if 0 <= x - i < road.length:
+                                    frame[lane + w, x - i] = vehicle.velocity
+                    expected.append(frame)
+            self.assertGreater(collector.field.spilled, 0)
+            field = collector.getField()
+            self.assertEqual(field.shape, (9, road.sublanesCount, road.length))
+            np.testing.assert_array_equal(field, np.array(expected))
+            np.testing.assert_array_equal(collector.getOccupancy(), np.array(expected) != EMPTY)
+            self.assertEqual(collector.save(), path)
+            np.testing.assert_array_equal(np.load(path), np.array(expected))
+            del field
+
+    def test_run__memory(self):
+        simulator = self.getSimulator()
+        with SpaceTimeCollector(simulator=simulator) as collector:
+            for _ in range(5):
+                simulator.step()
+        self.assertIsNone(collector.field.path)
+        field = collector.getField()
+        self.assertEqual(field.shape, (5, simulator.road.sublanesCount, simulator.road.length))
+        # Obstacle occupies its cells in every step.
+        self.assertTrue(np.all(field[:, 3:5, 20:22] == 0))
+
+    def test_run__removed(self):
+        simulator = self.getSimulator()
+        road = simulator.road
+        with SpaceTimeCollector(simulator=simulator) as collector:
+            while not any(vehicle.position[0] - vehicle.length + 1 < road.length
+                          for vehicle in road.removed):
+                simulator.step()
+        # Vehicles leaving the road are not drawn, even with their tails on the road.
+        self.assertEqual(np.count_nonzero(collector.getField()[-1] != EMPTY),
+                         sum(vehicle.length * vehicle.width for vehicle in
+                             [*road.getAllActiveVehicles(), *road.obstacles]))
+
+    def test_init__dtype(self):
+        road = DenseRoad(length=10, lanes_count=1, lane_width=1,
+                         controller=SpeedController(max_speed=200))
+        simulator = Simulator(road=road, dispatcher=Mock())
+        self.assertEqual(SpaceTimeCollector(simulator=simulator).field.dtype, np.int16)
+        # Velocities not fitting the given type are rejected.
+        road.addVehicle(ConventionalCar(position=(5, 0), velocity=150, road=road))
+        simulator.sync()
+        collector = SpaceTimeCollector(simulator=simulator, dtype=np.int8)
+        with self.assertRaises(ValueError):
+            collector.run()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,29 +1,46 @@
 import typing
 
+import numpy as np
 import pandas as pd
 from more_itertools import ilen
 
 from simulator.road.road import Road
 from simulator.simulator import Hook, Simulator
 from simulator.statistics.averageresult import AverageResult
-from simulator.statistics.filters import Filter, combine
-from simulator.statistics.vehicletype import VehicleType, getVehicleTypeFilter, getVehicleTypeName
+from simulator.statistics.filters import Filter, combine, selectKind
+from simulator.statistics.vehicletype import VehicleType, getVehicleTypeFilter, \
+    getVehicleTypeMask, getVehicleTypeName
 from simulator.vehicle.car import Car, isCar
+from simulator.vehicle.table import TABLE
 from simulator.vehicle.vehicle import Vehicle
-from util.cumulativelist import CumulativeList
 from util.dict import makeOrderedDict
+from util.onlinestatistics import OnlineStatistics
 
 
 class Tracker(Hook):
+    '''
+    Tracks the average metrics of the vehicles in every step. The statistics of every metric are
+    kept in constant memory, so besides the mean the standard deviation of the per-step values
+    and the confidence interval of the mean are available after a single run.
+    '''
+    fused: bool
+    skip: int
     steps: int
-    velocity: typing.Dict[VehicleType, CumulativeList[AverageResult]]
-    throughput: typing.Dict[VehicleType, CumulativeList[int]]
-    decelerations: typing.Dict[VehicleType, CumulativeList[AverageResult]]
-    lane_changes: typing.Dict[VehicleType, CumulativeList[AverageResult]]
-    waiting: typing.Dict[VehicleType, CumulativeList[AverageResult]]
-
-    def __init__(self, simulator: Simulator, buffer_size: int = 1):
+    velocity: typing.Dict[VehicleType, OnlineStatistics]
+    throughput: typing.Dict[VehicleType, OnlineStatistics]
+    decelerations: typing.Dict[VehicleType, OnlineStatistics]
+    lane_changes: typing.Dict[VehicleType, OnlineStatistics]
+    waiting: typing.Dict[VehicleType, OnlineStatistics]
+
+    def __init__(self, simulator: Simulator, skip: int = 0, fused: bool = True):
+        '''
+        :param simulator: simulator.
+        :param skip: number of the first steps not tracked.
+        :param fused: track all the vehicle types at once on the vehicle table.
+        '''
         super().__init__(simulator=simulator)
+        self.fused = fused
+        self.skip = skip
         self.steps = 0
         self.velocity = {}
         self.throughput = {}
@@ -31,11 +48,11 @@ class Tracker(Hook):
         self.lane_changes = {}
         self.waiting = {}
         for vehicle_type in VehicleType:
-            self.velocity[vehicle_type] = CumulativeList(buffer_size, AverageResult(0, 0))
-            self.throughput[vehicle_type] = CumulativeList(buffer_size, 0)
-            self.decelerations[vehicle_type] = CumulativeList(buffer_size, AverageResult(0, 0))
-            self.lane_changes[vehicle_type] = CumulativeList(buffer_size, AverageResult(0, 0))
-            self.waiting[vehicle_type] = CumulativeList(buffer_size, AverageResult(0, 0))
+            self.velocity[vehicle_type] = OnlineStatistics()
+            self.throughput[vehicle_type] = OnlineStatistics()
+            self.decelerations[vehicle_type] = OnlineStatistics()
+            self.lane_changes[vehicle_type] = OnlineStatistics()
+            self.waiting[vehicle_type] = OnlineStatistics()
 
     @property
     def _road(self) -> Road:
@@ -43,13 +60,83 @@ class Tracker(Hook):
 
     def run(self) -> None:
         self.steps += 1
+        if self.steps <= self.skip:
+            return
+        if self.fused:
+            self._runFused()
+            return
         for vehicle_type in VehicleType:
             predicate = getVehicleTypeFilter(vehicle_type)
-            self.velocity[vehicle_type].append(self._trackVelocity(predicate))
-            self.throughput[vehicle_type].append(self._trackThroughput(predicate))
-            self.decelerations[vehicle_type].append(self._trackDecelerations(predicate))
-            self.lane_changes[vehicle_type].append(self._trackLaneChanges(predicate))
-            self.waiting[vehicle_type].append(self._trackWaiting(predicate))
+            self.throughput[vehicle_type].append(
+                value=self._trackThroughput(predicate), count=1)
+            for samples, result in (
+                    (self.velocity, self._trackVelocity(predicate)),
+                    (self.decelerations, self._trackDecelerations(predicate)),
+                    (self.lane_changes, self._trackLaneChanges(predicate)),
+                    (self.waiting, self._trackWaiting(predicate))):
+                samples[vehicle_type].append(value=result.value, count=result.count)
+
+    def _runFused(self) -> None:
+        '''
+        Tracks all the metrics of all the vehicle types at once on the columns of the vehicle
+        table, a vehicle type selects its vehicles by a single comparison of the kind codes.
+        :return: None.
+        '''
+        columns = TABLE.columns
+        handles = TABLE.getHandles(self._road.getAllActiveVehicles())
+        kinds = columns['kind'][handles]
+        velocity = columns['velocity'][handles]
+        lane_changes = columns['last_lane'][handles] != columns['lane'][handles]
+        decelerations = columns['last_velocity'][handles] - velocity > 1
+        waiting = (columns['last_x'][handles] == columns['x'][handles]) & ~lane_changes
+        removed = columns['kind'][TABLE.getHandles(self._road.removed)]
+        for vehicle_type in VehicleType:
+            mask = getVehicleTypeMask(vehicle_type)
+            selected = selectKind(kinds, mask)
+            count = int(np.count_nonzero(selected))
+            self.velocity[vehicle_type].append(value=int(velocity[selected].sum()), count=count)
+            self.throughput[vehicle_type].append(
+                value=int(np.count_nonzero(selectKind(removed, mask))), count=1)
+            self.decelerations[vehicle_type].append(
+                value=int(np.count_nonzero(decelerations & selected)), count=count)
+            self.lane_changes[vehicle_type].append(
+                value=int(np.count_nonzero(lane_changes & selected)), count=count)
+            self.waiting[vehicle_type].append(
+                value=int(np.count_nonzero(waiting & selected)), count=count)
+
+    def getLastSample(self, metric: str, vehicle_type: VehicleType) -> AverageResult:
+        '''
+        Returns the sample of a metric tracked in the last step.
+        :param metric: name of the metric attribute, e.g. velocity or lane_changes.
+        :param vehicle_type: type of the vehicles.
+        :return: sum of the metric and the number of the tracked vehicles.
+        '''
+        value, count = getattr(self, metric)[vehicle_type].last
+        return AverageResult(value=value, count=count)
+
+    def getStd(self, metric: str, vehicle_type: VehicleType) -> typing.Optional[float]:
+        '''
+        Returns the standard deviation of the per-step averages of a metric weighted by the
+        numbers of the tracked vehicles, the same as the average.
+        :param metric: name of the metric attribute, e.g. velocity or lane_changes.
+        :param vehicle_type: type of the vehicles.
+        :return: standard deviation or None with less than two tracked steps.
+        '''
+        return getattr(self, metric)[vehicle_type].std()
+
+    def getHalfWidth(self, metric: str, vehicle_type: VehicleType) -> typing.Optional[float]:
+        '''
+        Returns the half-width of the 95% confidence interval of the average of a metric.
+        :param metric: name of the metric attribute, e.g. velocity or lane_changes.
+        :param vehicle_type: type of the vehicles.
+        :return: half-width or None when too few steps were tracked.
+        '''
+        return getattr(self, metric)[vehicle_type].halfWidth()
+
+    @staticmethod
+    def _getAverage(samples: OnlineStatistics) -> AverageResult:
+        value, count = samples.value()
+        return AverageResult(value=value, count=count)
 
     def _trackVelocity(self, predicate: Filter) -> AverageResult:
         velocity, count = 0, 0
@@ -59,13 +146,13 @@ class Tracker(Hook):
         return AverageResult(value=velocity, count=count)
 
     def getAverageVelocity(self, vehicle_type: VehicleType) -> typing.Optional[float]:
-        return self.velocity[vehicle_type].value().toMaybeFloat()
+        return self._getAverage(self.velocity[vehicle_type]).toMaybeFloat()
 
     def _trackThroughput(self, predicate: Filter) -> int:
         return ilen(filter(predicate, self._road.removed))
 
     def getAverageThroughput(self, vehicle_type: VehicleType) -> float:
-        return self.throughput[vehicle_type].value() / len(self.throughput[vehicle_type])
+        return self._getAverage(self.throughput[vehicle_type]).toZeroFloat()
 
     def _trackPercentage(self, count_filter: Filter, value_filter) -> AverageResult:
         value, count = 0, 0
@@ -77,16 +164,15 @@ class Tracker(Hook):
 
     def _trackDecelerations(self, predicate: Filter) -> AverageResult:
         def isDeceleration(vehicle: Car) -> bool:
-            _, last_velocity = vehicle.path[-1]
-            return last_velocity - vehicle.velocity > 1
+            return vehicle.last_velocity - vehicle.velocity > 1
 
         return self._trackPercentage(combine(predicate, isCar), isDeceleration)
 
     def getAverageDecelerationsAbsolute(self, vehicle_type: VehicleType) -> int:
-        return self.decelerations[vehicle_type].value().value
+        return self._getAverage(self.decelerations[vehicle_type]).value
 
     def getAverageDecelerations(self, vehicle_type: VehicleType) -> typing.Optional[float]:
-        return self.decelerations[vehicle_type].value().toMaybeFloat()
+        return self._getAverage(self.decelerations[vehicle_type]).toMaybeFloat()
 
     def _trackLaneChanges(self, predicate: Filter) -> AverageResult:
         def isLaneChange(vehicle: Vehicle) -> bool:
@@ -97,10 +183,10 @@ class Tracker(Hook):
         return self._trackPercentage(predicate, isLaneChange)
 
     def getAverageLaneChangesAbsolute(self, vehicle_type: VehicleType) -> int:
-        return self.lane_changes[vehicle_type].value().value
+        return self._getAverage(self.lane_changes[vehicle_type]).value
 
     def getAverageLaneChanges(self, vehicle_type: VehicleType) -> typing.Optional[float]:
-        return self.lane_changes[vehicle_type].value().toMaybeFloat()
+        return self._getAverage(self.lane_changes[vehicle_type]).toMaybeFloat()
 
     def _trackWaiting(self, predicate: Filter) -> AverageResult:
         def isWaiting(vehicle: Vehicle) -> bool:
@@ -109,10 +195,10 @@ class Tracker(Hook):
         return self._trackPercentage(predicate, isWaiting)
 
     def getAverageWaitingAbsolute(self, vehicle_type: VehicleType) -> int:
-        return self.waiting[vehicle_type].value().value
+        return self._getAverage(self.waiting[vehicle_type]).value
 
     def getAverageWaiting(self, vehicle_type: VehicleType) -> typing.Optional[float]:
-        return self.waiting[vehicle_type].value().toMaybeFloat()
+        return self._getAverage(self.waiting[vehicle_type]).toMaybeFloat()
 
     def getAverageData(self) -> pd.DataFrame:
         statistics = {}
@@ -129,13 +215,25 @@ class Tracker(Hook):
             statistics[f'waiting_absolute_{name}'] = \
                 self.getAverageWaitingAbsolute(vehicle_type)
             statistics[f'waiting_{name}'] = self.getAverageWaiting(vehicle_type)
+            for metric, key in METRICS:
+                statistics[f'{key}_std_{name}'] = self.getStd(metric, vehicle_type)
+                statistics[f'{key}_ci_{name}'] = self.getHalfWidth(metric, vehicle_type)
 
         return pd.DataFrame(makeOrderedDict(statistics, AVERAGE_DATA_ORDER), index=[0])
 
 
+# Tracked metrics, names of the tracker attributes and of the statistics.
+METRICS = [('velocity', 'velocity'), ('throughput', 'throughput'),
+           ('decelerations', 'decelerations'), ('lane_changes', 'laneChanges'),
+           ('waiting', 'waiting')]
+
 # Order for the average statistics.
-AVERAGE_DATA_KEYS = ['velocity', 'throughput', 'decelerations_absolute', 'decelerations',
-                     'laneChanges_absolute', 'laneChanges', 'waiting_absolute', 'waiting']
+AVERAGE_DATA_KEYS = ['velocity', 'velocity_std', 'velocity_ci',
+                     'throughput', 'throughput_std', 'throughput_ci',
+                     'decelerations_absolute', 'decelerations', 'decelerations_std',
+                     'decelerations_ci',
+                     'laneChanges_absolute', 'laneChanges', 'laneChanges_std', 'laneChanges_ci',
+                     'waiting_absolute', 'waiting', 'waiting_std', 'waiting_ci']
 AVERAGE_DATA_ORDER = []
 for key in AVERAGE_DATA_KEYS:
     for vehicle_type in VehicleType:
@@ -3,11 +3,21 @@ import unittest
 import typing
 from unittest.mock import Mock
 
+import numpy as np
+
+from simulator.dispatcher.emergency import EmergencyDispatcher
+from simulator.road.dense import DenseRoad
+from simulator.simulator import Simulator
+
 from simulator.statistics.averageresult import AverageResult
 from simulator.statistics.filters import Filter
-from simulator.statistics.tracker import Tracker
+from simulator.statistics.tracker import AVERAGE_DATA_ORDER, Tracker
+from simulator.statistics.vehicletype import VehicleType
 from simulator.vehicle.car import Car
+from simulator.vehicle.conventional import Driver
+from simulator.vehicle.obstacle import Obstacle
 from simulator.vehicle.vehicle import Vehicle
+from util import rand
 
 
 class TrackerTestCase(unittest.TestCase):
@@ -91,9 +101,9 @@ class TrackerTestCase(unittest.TestCase):
         road = Mock()
         vehicles: typing.List[Vehicle] = []
         for velocity in range(10):
-            vehicle = Mock(spec=Car)
+            vehicle = Mock(spec=Car, KIND=Car.KIND)
             vehicle.velocity = velocity
-            vehicle.path = [((0, 0), 12)]
+            vehicle.last_velocity = 12
             vehicles.append(vehicle)
         road.getAllActiveVehicles = lambda: vehicles
         tracker = Tracker(simulator=Mock(road=road))
@@ -119,21 +129,21 @@ class TrackerTestCase(unittest.TestCase):
         vehicles: typing.List[Vehicle] = []
         # Vehicles which decelerated quickly.
         for _ in range(10):
-            vehicle = Mock(spec=Car)
+            vehicle = Mock(spec=Car, KIND=Car.KIND)
             vehicle.velocity = 5
-            vehicle.path = [((0, 0), 10)]
+            vehicle.last_velocity = 10
             vehicles.append(vehicle)
         # Not cars, therefore should not be counted.
         for _ in range(10):
-            vehicle = Mock(spec=Vehicle)
+            vehicle = Mock(spec=Vehicle, KIND=Vehicle.KIND)
             vehicle.velocity = 5
-            vehicle.path = [((0, 0), 10)]
+            vehicle.last_velocity = 10
             vehicles.append(vehicle)
         # Vehicles which did not decelerate quickly.
         for _ in range(10):
-            vehicle = Mock(spec=Car)
+            vehicle = Mock(spec=Car, KIND=Car.KIND)
             vehicle.velocity = 9
-            vehicle.path = [((0, 0), 10)]
+            vehicle.last_velocity = 10
             vehicles.append(vehicle)
         road.getAllActiveVehicles = lambda: vehicles
         tracker = Tracker(simulator=Mock(road=road))
@@ -197,6 +207,45 @@ class TrackerTestCase(unittest.TestCase):
         expected = AverageResult(value=5, count=5)
         self.assertEqual(result, expected, '{} != {}'.format(str(result), str(expected)))
 
+    def test_run__fused(self):
+        rand.seed(42)
+        road = DenseRoad(length=100, lanes_count=3, lane_width=1)
+        road.addVehicle(Obstacle(position=(50, 1), length=3, width=1))
+        dispatcher = EmergencyDispatcher(
+            count=3, road=road, penetration=.5, driver=Driver(), emergency_rate=20)
+        simulator = Simulator(road=road, dispatcher=dispatcher)
+        simulator.scatterVehicles(density=.2)
+        fused = Tracker(simulator=simulator, skip=50)
+        tracker = Tracker(simulator=simulator, skip=50, fused=False)
+        with fused, tracker:
+            for _ in range(100):
+                simulator.step()
+        self.assertTrue(fused.getAverageData().equals(tracker.getAverageData()))
+
+    def test_getAverageData(self):
+        rand.seed(42)
+        road = DenseRoad(length=100, lanes_count=3, lane_width=1)
+        dispatcher = EmergencyDispatcher(
+            count=3, road=road, penetration=.5, driver=Driver(), emergency_rate=20)
+        simulator = Simulator(road=road, dispatcher=dispatcher)
+        simulator.scatterVehicles(density=.2)
+        velocity = []
+        with Tracker(simulator=simulator, skip=10) as tracker:
+            for _ in range(100):
+                simulator.step()
+                sample = tracker.getLastSample('velocity', VehicleType.ANY)
+                velocity.append((sample.value, sample.count))
+        # Skipped steps are not tracked.
+        self.assertEqual(len(tracker.velocity[VehicleType.ANY]), 90)
+        data = tracker.getAverageData()
+        self.assertListEqual(list(data.columns), AVERAGE_DATA_ORDER)
+        # Step averages are weighted by the numbers of the vehicles.
+        values, counts = np.array(velocity[10:]).T
+        self.assertAlmostEqual(data['velocity_std_all'][0], np.sqrt(np.cov(
+            values / counts, aweights=counts)))
+        self.assertGreater(data['velocity_ci_all'][0], 0)
+        self.assertGreater(data['throughput_ci_all'][0], 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,29 @@
+import typing
+
+from simulator.position import Position
+from simulator.simulator import Hook, Simulator
+from simulator.vehicle.car import isCar
+from simulator.vehicle.vehicle import Vehicle
+
+# Position and velocity of a car after a step.
+State = typing.Tuple[Position, int]
+
+
+class TrajectoryRecorder(Hook):
+    '''
+    Records the full paths of the cars, the cars themselves keep only their last state.
+    '''
+    paths: typing.Dict[Vehicle, typing.List[State]]
+
+    def __init__(self, simulator: Simulator):
+        super().__init__(simulator=simulator)
+        self.paths = dict()
+
+    def run(self) -> None:
+        for vehicle in self.simulator.road.getAllVehicles():
+            if not isCar(vehicle):
+                continue
+            path = self.paths.get(vehicle)
+            if path is None:
+                path = self.paths[vehicle] = list()
+            path.append((vehicle.position, vehicle.velocity))
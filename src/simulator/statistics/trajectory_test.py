@@ -0,0 +1,40 @@
+import unittest
+
+from simulator.dispatcher.mixed import MixedDispatcher
+from simulator.road.dense import DenseRoad
+from simulator.simulator import Simulator
+from simulator.statistics.trajectory import TrajectoryRecorder
+from simulator.vehicle.car import isCar
+from simulator.vehicle.conventional import Driver
+from simulator.vehicle.obstacle import Obstacle
+from util import rand
+
+
+class TrajectoryRecorderTestCase(unittest.TestCase):
+    def test_run(self):
+        rand.seed(42)
+        road = DenseRoad(length=50, lanes_count=2, lane_width=1)
+        road.addObstacle(Obstacle(position=(30, 1), length=3, width=1))
+        dispatcher = MixedDispatcher(road=road, count=2, penetration=.5, driver=Driver())
+        simulator = Simulator(road=road, dispatcher=dispatcher)
+        simulator.scatterVehicles(density=.2)
+        with TrajectoryRecorder(simulator=simulator) as recorder:
+            for _ in range(30):
+                simulator.step()
+                # Paths end with the current state of the cars.
+                for vehicle in road.getAllVehicles():
+                    if isCar(vehicle):
+                        self.assertEqual(recorder.paths[vehicle][-1],
+                                         (vehicle.position, vehicle.velocity))
+        self.assertTrue(all(isCar(vehicle) for vehicle in recorder.paths))
+        # Cars are recorded in every step until they leave the road.
+        for vehicle, path in recorder.paths.items():
+            self.assertLessEqual(len(path), 30)
+            xs = [x for (x, _), _ in path]
+            self.assertListEqual(xs, sorted(xs))
+            if xs[-1] < road.length:
+                self.assertEqual(len(path), 30 - vehicle.start if vehicle.start >= 0 else 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,7 @@
 import enum
 
-from simulator.statistics.filters import Filter
-from simulator.vehicle.autonomous import isAutonomous
-from simulator.vehicle.car import isCar
-from simulator.vehicle.conventional import isConventional
+from simulator.statistics.filters import Filter, filterKind
+from simulator.vehicle.vehicle import VehicleKind
 
 
 class VehicleType(enum.Enum):
@@ -12,16 +10,20 @@ class VehicleType(enum.Enum):
     ANY = enum.auto()
 
 
-def getVehicleTypeFilter(vehicle_type: VehicleType) -> Filter:
+def getVehicleTypeMask(vehicle_type: VehicleType) -> int:
     if vehicle_type is VehicleType.CONVENTIONAL:
-        return isConventional
+        return VehicleKind.CONVENTIONAL
     elif vehicle_type is VehicleType.AUTONOMOUS:
-        return isAutonomous
+        return VehicleKind.AUTONOMOUS
     elif vehicle_type is VehicleType.ANY:
-        return isCar
+        return VehicleKind.CAR
     assert False, 'unreachable'
 
 
+def getVehicleTypeFilter(vehicle_type: VehicleType) -> Filter:
+    return filterKind(getVehicleTypeMask(vehicle_type))
+
+
 def getVehicleTypeName(vehicle_type: VehicleType) -> str:
     if vehicle_type is VehicleType.CONVENTIONAL:
         return 'conventional'
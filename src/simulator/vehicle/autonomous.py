@@ -1,12 +1,15 @@
 from simulator.position import Position
 from simulator.road.road import Road
 from simulator.vehicle.car import Car
-from simulator.vehicle.obstacle import Obstacle
-from simulator.vehicle.vehicle import Vehicle
-from util.rand import shuffled
+from simulator.vehicle.vehicle import Vehicle, VehicleKind, isKind
+from util.rand import lanes_random
 
 
 class AutonomousCar(Car):
+    __slots__ = ()
+
+    KIND = VehicleKind.AUTONOMOUS
+
     def __init__(self, position: Position, velocity: int, road: Road,
                  length: int = 1, width: int = 1, limit: int = 0):
         super().__init__(
@@ -22,14 +25,14 @@ class AutonomousCar(Car):
     def _tryAvoidObstacle(self) -> bool:
         x, lane = self.position
         vx, vehicle = self.road.getNextVehicle(position=self.position)
-        if vehicle is None or not isinstance(vehicle, Obstacle):
+        if vehicle is None or not isKind(vehicle.KIND, VehicleKind.OBSTACLE):
             return False
         if vx - x > max(self.velocity, 1):
             return False
         # Find the best lane change.
         best_change = 0
         best_limit = self._getMaxSpeed(position=self.position)
-        for change in shuffled([-self.road.lane_width, self.road.lane_width]):
+        for change in lanes_random.shuffled([-self.road.lane_width, self.road.lane_width]):
             destination = (x, lane + change)
             if self._canAvoid(obstacle=vehicle, destination=destination):
                 limit = self._getMaxSpeed(position=destination)
@@ -58,7 +61,7 @@ class AutonomousCar(Car):
                 _, absoluteLane = self.road.getAbsolutePosition(self.position)
                 change = changeValue if absoluteLane == -1 else -changeValue
                 # When coming back always get priority.
-                return self._tryAvoidWithChange(Obstacle((-1, -1), 0, 0), change)
+                return self._tryAvoidWithChange(None, change)
 
         # If already creating emergency corridor don't move.
         if not self.road.isSingleLane(self):
@@ -78,7 +81,7 @@ class AutonomousCar(Car):
         x, lane = self.position
         best_change = 0
         best_limit = self._getMaxSpeed(position=self.position)
-        for change in shuffled([-self.road.lane_width, self.road.lane_width]):
+        for change in lanes_random.shuffled([-self.road.lane_width, self.road.lane_width]):
             destination = (x, lane + change)
             if self._canChangeLane(destination):
                 limit = self._getMaxSpeed(position=destination)
@@ -90,15 +93,15 @@ class AutonomousCar(Car):
         return False
 
     def _getMaxSpeedBonus(self, next: Vehicle, position: Position) -> int:
-        if isinstance(next, AutonomousCar):
+        if isKind(next.KIND, VehicleKind.AUTONOMOUS):
             return next.velocity
         return 0
 
     def _getSafeChangeDistance(self, previous: Vehicle, destination: Position) -> int:
-        if isinstance(previous, AutonomousCar):
+        if isKind(previous.KIND, VehicleKind.AUTONOMOUS):
             return previous.velocity
         return super()._getSafeChangeDistance(previous, destination)
 
 
 def isAutonomous(vehicle: Vehicle) -> bool:
-    return isinstance(vehicle, AutonomousCar)
+    return isKind(vehicle.KIND, VehicleKind.AUTONOMOUS)
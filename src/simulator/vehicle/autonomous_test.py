@@ -5,8 +5,10 @@ from unittest.mock import Mock
 from simulator.position import Position
 from simulator.vehicle.autonomous import AutonomousCar, isAutonomous
 from simulator.vehicle.obstacle import Obstacle
-from simulator.vehicle.vehicle import Vehicle
-from simulator.vehicle.vehicle_test import implementsVehicle
+from simulator.vehicle.vehicle import Vehicle, VehicleKind
+from simulator.vehicle.vehicle_test import implementsVehicle, patchable
+
+PatchableAutonomousCar = patchable(AutonomousCar)
 
 
 @implementsVehicle
@@ -16,6 +18,7 @@ class AutonomousCarTestCase(unittest.TestCase):
         road.isProperPosition.return_value = False
         road.getNextVehicle.return_value = (10000, None)
         road.getPreviousVehicle.return_value = (-1, None)
+        road.getEmergencyVehicle.return_value = None
         road.controller = Mock()
         road.controller.getMaxSpeed.return_value = 5
         return AutonomousCar(position=position, velocity=1, road=road)
@@ -24,17 +27,17 @@ class AutonomousCarTestCase(unittest.TestCase):
         road = Mock(length=100)
         road.controller = Mock()
         road.controller.getMaxSpeed.return_value = 5
-        car = AutonomousCar(position=(0, 0), velocity=5, road=road)
+        car = PatchableAutonomousCar(position=(0, 0), velocity=5, road=road)
         # No vehicles in front.
         road.getNextVehicle.return_value = (100, None)
         limit = car._getMaxSpeed(position=(0, 0))
         self.assertEqual(limit, 5)
         # Vehicle in front is far away.
-        road.getNextVehicle.return_value = (10, Mock())
+        road.getNextVehicle.return_value = (10, Mock(KIND=VehicleKind.CAR))
         limit = car._getMaxSpeed(position=(0, 0))
         self.assertEqual(limit, 5)
         # Vehicle in front is blocking the road.
-        road.getNextVehicle.return_value = (2, Mock())
+        road.getNextVehicle.return_value = (2, Mock(KIND=VehicleKind.CAR))
         limit = car._getMaxSpeed(position=(0, 0))
         self.assertEqual(limit, 1)
         # Vehicle in front is autonomous.
@@ -51,17 +54,17 @@ class AutonomousCarTestCase(unittest.TestCase):
         # No obstacles on the road.
         road = Mock(lane_width=1)
         road.getNextVehicle.return_value = -1, None
-        car = AutonomousCar(position=(42, 1), velocity=5, road=road)
+        car = PatchableAutonomousCar(position=(42, 1), velocity=5, road=road)
         self.assertFalse(car._tryAvoidObstacle())
         # Not an obstacle on the road in front.
         road = Mock(lane_width=1)
-        road.getNextVehicle.return_value = 44, Mock()
-        car = AutonomousCar(position=(42, 1), velocity=5, road=road)
+        road.getNextVehicle.return_value = 44, Mock(KIND=VehicleKind.CAR)
+        car = PatchableAutonomousCar(position=(42, 1), velocity=5, road=road)
         self.assertFalse(car._tryAvoidObstacle())
         # Obstacle is far away.
         road = Mock(lane_width=1)
         road.getNextVehicle.return_value = 120, Obstacle(position=(120, 2), length=1, width=1)
-        car = AutonomousCar(position=(42, 1), velocity=5, road=road)
+        car = PatchableAutonomousCar(position=(42, 1), velocity=5, road=road)
         self.assertFalse(car._tryAvoidObstacle())
 
         def mock_getMaxSpeed(prev: int, next: int, other: int) -> typing.Callable[[Position], int]:
@@ -77,7 +80,7 @@ class AutonomousCarTestCase(unittest.TestCase):
         road = Mock(lane_width=1)
         road.getNextVehicle.return_value = 5, Obstacle(position=(5, 1), length=1, width=1)
         # Unable to change lanes.
-        car = AutonomousCar(position=(0, 1), velocity=5, road=road)
+        car = PatchableAutonomousCar(position=(0, 1), velocity=5, road=road)
         car._canAvoid = Mock(return_value=False)
         car._avoid = Mock()
         car._getMaxSpeed = Mock(side_effect=mock_getMaxSpeed(5, 4, 3))
@@ -85,7 +88,7 @@ class AutonomousCarTestCase(unittest.TestCase):
         car._avoid.assert_not_called()
         self.assertEqual(car.position, (0, 1))
         # Previous lane is the fastest.
-        car = AutonomousCar(position=(0, 1), velocity=5, road=road)
+        car = PatchableAutonomousCar(position=(0, 1), velocity=5, road=road)
         car._canAvoid = Mock(return_value=True)
         car._avoid = Mock()
         car._getMaxSpeed = Mock(side_effect=mock_getMaxSpeed(5, 4, 3))
@@ -93,7 +96,7 @@ class AutonomousCarTestCase(unittest.TestCase):
         car._avoid.assert_called_once()
         self.assertEqual(car.position, (0, 0))
         # Next lane is the fastest.
-        car = AutonomousCar(position=(0, 1), velocity=5, road=road)
+        car = PatchableAutonomousCar(position=(0, 1), velocity=5, road=road)
         car._canAvoid = Mock(return_value=True)
         car._avoid = Mock()
         car._getMaxSpeed = Mock(side_effect=mock_getMaxSpeed(4, 5, 3))
@@ -101,7 +104,7 @@ class AutonomousCarTestCase(unittest.TestCase):
         car._avoid.assert_called_once()
         self.assertEqual(car.position, (0, 2))
         # Current lane is the fastest.
-        car = AutonomousCar(position=(0, 1), velocity=5, road=road)
+        car = PatchableAutonomousCar(position=(0, 1), velocity=5, road=road)
         car._canAvoid = Mock(return_value=True)
         car._avoid = Mock()
         car._getMaxSpeed = Mock(side_effect=mock_getMaxSpeed(4, 3, 5))
@@ -109,7 +112,7 @@ class AutonomousCarTestCase(unittest.TestCase):
         car._avoid.assert_not_called()
         self.assertEqual(car.position, (0, 1))
         # Best lane is the same speed as current.
-        car = AutonomousCar(position=(0, 1), velocity=5, road=road)
+        car = PatchableAutonomousCar(position=(0, 1), velocity=5, road=road)
         car._canAvoid = Mock(return_value=True)
         car._avoid = Mock()
         car._getMaxSpeed = Mock(side_effect=mock_getMaxSpeed(5, 4, 5))
@@ -130,31 +133,31 @@ class AutonomousCarTestCase(unittest.TestCase):
 
         road = Mock(lane_width=1)
         # Unable to change lanes.
-        car = AutonomousCar(position=(0, 1), velocity=5, road=road)
+        car = PatchableAutonomousCar(position=(0, 1), velocity=5, road=road)
         car._canChangeLane = Mock(return_value=False)
         car._getMaxSpeed = Mock(side_effect=mock_getMaxSpeed(5, 4, 3))
         self.assertFalse(car._tryChangeLanes())
         self.assertEqual(car.position, (0, 1))
         # Previous lane is the fastest.
-        car = AutonomousCar(position=(0, 1), velocity=5, road=road)
+        car = PatchableAutonomousCar(position=(0, 1), velocity=5, road=road)
         car._canChangeLane = Mock(return_value=True)
         car._getMaxSpeed = Mock(side_effect=mock_getMaxSpeed(5, 4, 3))
         self.assertTrue(car._tryChangeLanes())
         self.assertEqual(car.position, (0, 0))
         # Next lane is the fastest.
-        car = AutonomousCar(position=(0, 1), velocity=5, road=road)
+        car = PatchableAutonomousCar(position=(0, 1), velocity=5, road=road)
         car._canChangeLane = Mock(return_value=True)
         car._getMaxSpeed = Mock(side_effect=mock_getMaxSpeed(4, 5, 3))
         self.assertTrue(car._tryChangeLanes())
         self.assertEqual(car.position, (0, 2))
         # Current lane is the fastest.
-        car = AutonomousCar(position=(0, 1), velocity=5, road=road)
+        car = PatchableAutonomousCar(position=(0, 1), velocity=5, road=road)
         car._canChangeLane = Mock(return_value=True)
         car._getMaxSpeed = Mock(side_effect=mock_getMaxSpeed(4, 3, 5))
         self.assertFalse(car._tryChangeLanes())
         self.assertEqual(car.position, (0, 1))
         # Best lane is the same speed as current.
-        car = AutonomousCar(position=(0, 1), velocity=5, road=road)
+        car = PatchableAutonomousCar(position=(0, 1), velocity=5, road=road)
         car._canChangeLane = Mock(return_value=True)
         car._getMaxSpeed = Mock(side_effect=mock_getMaxSpeed(5, 4, 5))
         self.assertFalse(car._tryChangeLanes())
@@ -2,11 +2,14 @@ import typing
 
 from simulator.position import Position
 from simulator.road.road import Road
-from simulator.vehicle.obstacle import Obstacle
-from simulator.vehicle.vehicle import Vehicle
+from simulator.vehicle.vehicle import Vehicle, VehicleKind, isKind
 
 
 class Car(Vehicle):
+    __slots__ = ('road', 'limit', 'last_velocity', 'zipped')
+
+    KIND = VehicleKind.CAR
+
     # Constants.
     EMERGENCY_RADIUS = 10
 
@@ -15,7 +18,7 @@ class Car(Vehicle):
     limit: int
 
     # Runtime properties.
-    path: typing.List[typing.Tuple[Position, int]]
+    last_velocity: int
     zipped: typing.Set[Vehicle]
 
     def __init__(self, position: Position, velocity: int, road: Road,
@@ -23,7 +26,7 @@ class Car(Vehicle):
         super().__init__(position=position, velocity=velocity, length=length, width=width)
         self.road = road
         self.limit = limit
-        self.path = list()
+        self.last_velocity = velocity
         self.zipped = set()
 
     def _getMaxSpeedUnlimited(self, position: Position) -> int:
@@ -66,9 +69,8 @@ class Car(Vehicle):
         :param destination: position on the road.
         :return: if it is possible to change the lane.
         '''
-        x, lane = destination
-        return all(self.road.isSafePosition(position=(x - i, lane + w), ignore=self)
-                   for i in range(self.length) for w in range(self.width))
+        return self.road.isSafeArea(
+            position=destination, length=self.length, width=self.width, ignore=self)
 
     def _isChangeRequired(self) -> bool:
         '''
@@ -121,10 +123,11 @@ class Car(Vehicle):
             self._isChangeBeneficial(destination=destination) and \
             self._isChangeSafe(destination=destination)
 
-    def _canAvoid(self, obstacle: Vehicle, destination: Position) -> bool:
+    def _canAvoid(self, obstacle: typing.Optional[Vehicle], destination: Position) -> bool:
         '''
         Returns whether it is possible to change the lane to destination, avoiding an obstacle
         and zipping in front of another vehicle.
+        :param obstacle: obstacle to avoid, None to always get priority.
         :param destination: position on the road.
         :return: whether to change lane.
         '''
@@ -139,19 +142,20 @@ class Car(Vehicle):
         _, vehicle = self.road.getPreviousVehicle(position=destination)
         if vehicle is None:
             return True
-        if isinstance(vehicle, Car):
+        kind = vehicle.KIND
+        if isKind(kind, VehicleKind.CAR):
             return not self.road.isSingleLane(vehicle) \
                    or obstacle not in vehicle.zipped
-        elif isinstance(vehicle, Obstacle):
+        elif isKind(kind, VehicleKind.OBSTACLE):
             return True
 
         # In case new vehicle types get added make sure we remember to add it here.
         assert False, 'unreachable'
 
-    def _avoid(self, obstacle: Vehicle, destination: Position) -> None:
+    def _avoid(self, obstacle: typing.Optional[Vehicle], destination: Position) -> None:
         '''
         Avoid given obstacle or vehicle by changing lane to the destination lane.
-        :param obstacle: obstacle to avoid.
+        :param obstacle: obstacle to avoid, None to always get priority.
         :param destination: destination to change to.
         :return: None.
         '''
@@ -162,13 +166,13 @@ class Car(Vehicle):
         _, vehicle = self.road.getPreviousVehicle(position=destination)
         assert vehicle is not None, 'unreachable'
         # Zip in front of a different car.
-        if isinstance(vehicle, Car):
+        if obstacle is not None and isKind(vehicle.KIND, VehicleKind.CAR):
             vehicle.zipped.add(obstacle)
 
-    def _tryAvoidWithChange(self, obstacle: Vehicle, change: int) -> bool:
+    def _tryAvoidWithChange(self, obstacle: typing.Optional[Vehicle], change: int) -> bool:
         '''
         Try avoiding an obstacle by changing a lane by a specified vector.
-        :param obstacle: obstacle to avoid.
+        :param obstacle: obstacle to avoid, None to always get priority.
         :param change: lane change vector.
         :return: if lane was changed.
         '''
@@ -207,15 +211,26 @@ class Car(Vehicle):
         :return: whether an emergency vehicle is approaching.
         '''
         x, _ = self.position
-        for emergency in self.road.emergency:
-            ex, _ = emergency.position
-            if abs(x - ex) < Car.EMERGENCY_RADIUS:
-                return emergency
-        return None
+        return self.road.getEmergencyVehicle(x=x, radius=Car.EMERGENCY_RADIUS)
+
+    def _pruneZipped(self) -> None:
+        '''
+        Forgets the zipped obstacles which cannot be avoided in front of the car anymore, the
+        obstacles already passed and the vehicles which left the road.
+        :return: None.
+        '''
+        x, _ = self.position
+        tail = x - self.length + 1
+        self.zipped = {
+            vehicle for vehicle in self.zipped
+            if vehicle.position[0] < self.road.length and
+            (vehicle.position[0] >= tail or not isKind(vehicle.KIND, VehicleKind.OBSTACLE))}
 
     def beforeMove(self) -> Position:
-        self.path.append((self.position, self.velocity))
+        self.last_velocity = self.velocity
         self.last_position = self.position
+        if self.zipped:
+            self._pruneZipped()
         changes = [
             lambda: self._tryAvoidObstacle(),
             lambda: self._tryChangeEmergency(),
@@ -228,4 +243,4 @@ class Car(Vehicle):
 
 
 def isCar(vehicle: Vehicle) -> bool:
-    return isinstance(vehicle, Car)
+    return isKind(vehicle.KIND, VehicleKind.CAR)
@@ -6,6 +6,9 @@ from simulator.position import Position
 from simulator.vehicle.car import Car, isCar
 from simulator.vehicle.obstacle import Obstacle
 from simulator.vehicle.vehicle import Vehicle
+from simulator.vehicle.vehicle_test import patchable
+
+PatchableCar = patchable(Car)
 
 
 class CarTestCase(unittest.TestCase):
@@ -13,7 +16,7 @@ class CarTestCase(unittest.TestCase):
         road = Mock(length=100)
         road.controller = Mock()
         road.controller.getMaxSpeed.return_value = 5
-        car = Car(position=(0, 0), velocity=5, road=road)
+        car = PatchableCar(position=(0, 0), velocity=5, road=road)
         # No vehicles in front.
         road.getNextVehicle.return_value = (100, None)
         limit = car._getMaxSpeedUnlimited(position=(0, 0))
@@ -31,7 +34,7 @@ class CarTestCase(unittest.TestCase):
         road = Mock(length=100)
         road.controller = Mock()
         road.controller.getMaxSpeed.return_value = 5
-        car = Car(position=(0, 0), velocity=5, road=road)
+        car = PatchableCar(position=(0, 0), velocity=5, road=road)
         # No vehicles in front.
         road.getNextVehicle.return_value = (100, None)
         limit = car._getMaxSpeed(position=(0, 0))
@@ -47,7 +50,7 @@ class CarTestCase(unittest.TestCase):
 
     def test_isChangeRequired(self):
         road = Mock()
-        car = Car(position=(0, 0), velocity=1, length=1, road=road)
+        car = PatchableCar(position=(0, 0), velocity=1, length=1, road=road)
         car._getMaxSpeedUnlimited = Mock(return_value=1)
         self.assertTrue(car._isChangeRequired())
         car._getMaxSpeedUnlimited = Mock(return_value=5)
@@ -55,31 +58,15 @@ class CarTestCase(unittest.TestCase):
 
     def test_isChangePossible(self):
         road = Mock()
-
-        def mock_isSafePosition(invalid: typing.List[Position]) \
-                -> typing.Callable[[Position], bool]:
-            return lambda position, ignore: position not in invalid
-
-        # Vehicle of one cell length .
-        car = Car(position=(0, 0), velocity=1, length=1, road=road)
-        road.isSafePosition.side_effect = mock_isSafePosition([])
-        self.assertTrue(car._isChangePossible(destination=(0, 1)))
-        road.isSafePosition.side_effect = mock_isSafePosition([(0, 1)])
-        self.assertFalse(car._isChangePossible(destination=(0, 1)))
-        # Longer vehicle.
-        car = Car(position=(3, 0), velocity=1, length=3, road=road)
-        road.isSafePosition.side_effect = mock_isSafePosition([(3, 1)])
-        self.assertFalse(car._isChangePossible(destination=(3, 1)))
-        road.isSafePosition.side_effect = mock_isSafePosition([(2, 1)])
-        self.assertFalse(car._isChangePossible(destination=(3, 1)))
-        road.isSafePosition.side_effect = mock_isSafePosition([(1, 1)])
-        self.assertFalse(car._isChangePossible(destination=(3, 1)))
-        road.isSafePosition.side_effect = mock_isSafePosition([(0, 1)])
-        self.assertTrue(car._isChangePossible(destination=(3, 1)))
+        car = PatchableCar(position=(3, 0), velocity=1, length=3, width=2, road=road)
+        for safe in (True, False):
+            road.isSafeArea.return_value = safe
+            self.assertEqual(car._isChangePossible(destination=(3, 2)), safe)
+            road.isSafeArea.assert_called_with(position=(3, 2), length=3, width=2, ignore=car)
 
     def test_isChangeBeneficial(self):
         road = Mock()
-        car = Car(position=(0, 0), velocity=5, length=3, road=road)
+        car = PatchableCar(position=(0, 0), velocity=5, length=3, road=road)
         # Same speed.
         car._getMaxSpeedUnlimited = Mock(return_value=5)
         car.velocity = 5
@@ -102,7 +89,7 @@ class CarTestCase(unittest.TestCase):
         road = Mock()
         road.controller = Mock()
         road.controller.getMaxSpeed.return_value = max_speed
-        car = Car(position=(x, 0), velocity=1, length=length, road=road)
+        car = PatchableCar(position=(x, 0), velocity=1, length=length, road=road)
         # No vehicle behind.
         road.getPreviousVehicle.return_value = -1, None
         self.assertTrue(car._isChangeSafe(destination=(x, 1)))
@@ -117,7 +104,7 @@ class CarTestCase(unittest.TestCase):
         self.assertTrue(car._isChangeSafe(destination=(x, 1)))
 
     def test_canChangeLane(self):
-        car = Car(position=(0, 0), velocity=1, length=3, road=Mock())
+        car = PatchableCar(position=(0, 0), velocity=1, length=3, road=Mock())
         for r in (True, False):
             car._isChangeRequired = Mock(return_value=r)
             for p in (True, False):
@@ -134,11 +121,11 @@ class CarTestCase(unittest.TestCase):
 
     def test_canAvoidObstacle(self):
         # No space on a nearby lane.
-        car = Car(position=(0, 0), velocity=1, road=Mock())
+        car = PatchableCar(position=(0, 0), velocity=1, road=Mock())
         car._isChangePossible = Mock(return_value=False)
         self.assertFalse(car._canAvoid(obstacle=Mock(), destination=(0, 1)))
         # No nearby vehicles on the destination lane.
-        car = Car(position=(0, 0), velocity=1, road=Mock())
+        car = PatchableCar(position=(0, 0), velocity=1, road=Mock())
         car._isChangePossible = Mock(return_value=True)
         car._isChangeSafe = Mock(return_value=True)
         self.assertTrue(car._canAvoid(obstacle=Mock(), destination=(0, 1)))
@@ -146,7 +133,7 @@ class CarTestCase(unittest.TestCase):
         road = Mock()
         other = Car(position=(0, 1), velocity=1, road=road)
         road.getPreviousVehicle.return_value = 0, other
-        car = Car(position=(1, 0), velocity=1, road=road)
+        car = PatchableCar(position=(1, 0), velocity=1, road=road)
         car._isChangePossible = Mock(return_value=True)
         car._isChangeSafe = Mock(return_value=False)
         obstacle = Mock()
@@ -156,7 +143,7 @@ class CarTestCase(unittest.TestCase):
         road = Mock()
         other = Obstacle(position=(0, 1), length=1, width=1)
         road.getPreviousVehicle.return_value = 0, other
-        car = Car(position=(1, 0), velocity=1, road=road)
+        car = PatchableCar(position=(1, 0), velocity=1, road=road)
         car._isChangePossible = Mock(return_value=True)
         car._isChangeSafe = Mock(return_value=False)
         self.assertTrue(car._canAvoid(obstacle=obstacle, destination=(1, 1)))
@@ -164,7 +151,7 @@ class CarTestCase(unittest.TestCase):
         road = Mock()
         other = Car(position=(0, 1), velocity=1, road=road)
         road.getPreviousVehicle.return_value = 0, other
-        car = Car(position=(1, 0), velocity=1, road=road)
+        car = PatchableCar(position=(1, 0), velocity=1, road=road)
         car._isChangePossible = Mock(return_value=True)
         car._isChangeSafe = Mock(return_value=False)
         obstacle = Mock()
@@ -176,7 +163,7 @@ class CarTestCase(unittest.TestCase):
         road = Mock()
         other = Car(position=(0, 1), velocity=1, road=road)
         road.getPreviousVehicle.return_value = 0, other
-        car = Car(position=(1, 0), velocity=1, road=road)
+        car = PatchableCar(position=(1, 0), velocity=1, road=road)
         car._isChangeSafe = Mock(return_value=True)
         obstacle = Mock()
         car._avoid(obstacle=obstacle, destination=(1, 1))
@@ -185,11 +172,16 @@ class CarTestCase(unittest.TestCase):
         road = Mock()
         other = Car(position=(0, 1), velocity=1, road=road)
         road.getPreviousVehicle.return_value = 0, other
-        car = Car(position=(1, 0), velocity=1, road=road)
+        car = PatchableCar(position=(1, 0), velocity=1, road=road)
         car._isChangeSafe = Mock(return_value=False)
         obstacle = Mock()
         car._avoid(obstacle=obstacle, destination=(1, 1))
         self.assertIn(obstacle, other.zipped)
+        # Priority changes without an obstacle do not zip.
+        other.zipped = set()
+        self.assertTrue(car._canAvoid(obstacle=None, destination=(1, 1)))
+        car._avoid(obstacle=None, destination=(1, 1))
+        self.assertEqual(other.zipped, set())
 
     def test_beforeMove(self):
         def mock_tryChange(car: Car, result: bool, destination: Position) \
@@ -203,7 +195,7 @@ class CarTestCase(unittest.TestCase):
 
         # Obstacles avoided.
         road = Mock()
-        car = Car(position=(42, 1), velocity=5, road=road)
+        car = PatchableCar(position=(42, 1), velocity=5, road=road)
         car._tryAvoidObstacle = \
             Mock(side_effect=mock_tryChange(car=car, result=True, destination=(42, 0)))
         car._tryChangeEmergency = \
@@ -217,10 +209,10 @@ class CarTestCase(unittest.TestCase):
         self.assertEqual(position, (42, 0))
         self.assertEqual(car.position, (42, 0))
         self.assertEqual(car.last_position, (42, 1))
-        self.assertIn(((42, 1), 5), car.path)
+        self.assertEqual(car.last_velocity, 5)
         # Emergency corridor.
         road = Mock()
-        car = Car(position=(42, 1), velocity=5, road=road)
+        car = PatchableCar(position=(42, 1), velocity=5, road=road)
         car._tryAvoidObstacle = \
             Mock(side_effect=mock_tryChange(car=car, result=False, destination=(42, 1)))
         car._tryChangeEmergency = \
@@ -234,10 +226,10 @@ class CarTestCase(unittest.TestCase):
         self.assertEqual(position, (42, 0))
         self.assertEqual(car.position, (42, 0))
         self.assertEqual(car.last_position, (42, 1))
-        self.assertIn(((42, 1), 5), car.path)
+        self.assertEqual(car.last_velocity, 5)
         # No obstacles or emergency corridor.
         road = Mock()
-        car = Car(position=(42, 1), velocity=5, road=road)
+        car = PatchableCar(position=(42, 1), velocity=5, road=road)
         car._tryAvoidObstacle = \
             Mock(side_effect=mock_tryChange(car=car, result=False, destination=(42, 1)))
         car._tryChangeEmergency = \
@@ -250,30 +242,34 @@ class CarTestCase(unittest.TestCase):
         self.assertEqual(position, (42, 2))
         self.assertEqual(car.position, (42, 2))
         self.assertEqual(car.last_position, (42, 1))
-        self.assertIn(((42, 1), 5), car.path)
+        self.assertEqual(car.last_velocity, 5)
+
+    def test_beforeMove__zipped(self):
+        road = Mock(length=100)
+        car = PatchableCar(position=(42, 1), velocity=5, length=2, road=road)
+        car._tryAvoidObstacle = Mock(return_value=False)
+        car._tryChangeEmergency = Mock(return_value=False)
+        car._tryChangeLanes = Mock(return_value=False)
+        ahead = Obstacle(position=(50, 0), length=10, width=1)
+        alongside = Obstacle(position=(41, 0), length=1, width=1)
+        passed = Obstacle(position=(40, 0), length=1, width=1)
+        emergency = Car(position=(20, 0), velocity=5, road=road)
+        removed = Car(position=(100, 0), velocity=5, road=road)
+        car.zipped = {ahead, alongside, passed, emergency, removed}
+        car.beforeMove()
+        # Passed obstacles and vehicles which left the road are forgotten.
+        self.assertSetEqual(car.zipped, {ahead, alongside, emergency})
 
     def test_getEmergency(self):
-        # No emergency vehicles.
-        road = Mock(emergency=set())
-        car = Car(position=(0, 0), velocity=1, road=road)
-        self.assertIsNone(car._getEmergency())
-        # Emergency vehicle is too far.
-        road = Mock(emergency={Mock(position=(0, 0))})
-        car = Car(position=(Car.EMERGENCY_RADIUS + 1, 0), velocity=1, road=road)
-        self.assertIsNone(car._getEmergency())
-        # Emergency vehicle approaching.
         emergency = Mock(position=(0, 0))
-        road = Mock(emergency={emergency})
-        car = Car(position=(Car.EMERGENCY_RADIUS - 1, 0), velocity=1, road=road)
-        self.assertIs(car._getEmergency(), emergency)
-        # Emergency vehicle in front.
-        emergency = Mock(position=(Car.EMERGENCY_RADIUS - 1, 0))
-        road = Mock(emergency={emergency})
-        car = Car(position=(0, 0), velocity=1, road=road)
+        road = Mock()
+        road.getEmergencyVehicle.return_value = emergency
+        car = PatchableCar(position=(42, 0), velocity=1, road=road)
         self.assertIs(car._getEmergency(), emergency)
+        road.getEmergencyVehicle.assert_called_once_with(x=42, radius=Car.EMERGENCY_RADIUS)
 
     def test_isCar(self):
-        car = Car(position=(0, 0), velocity=1, road=Mock())
+        car = PatchableCar(position=(0, 0), velocity=1, road=Mock())
         self.assertTrue(isCar(car))
         vehicle = Vehicle(position=(0, 0), velocity=0)
         self.assertFalse(isCar(vehicle))
@@ -1,15 +1,15 @@
-import random
 import typing
 
 from simulator.position import Position
 from simulator.road.road import Road
 from simulator.vehicle.car import Car
-from simulator.vehicle.obstacle import Obstacle
-from simulator.vehicle.vehicle import Vehicle
-from util.rand import shuffled
+from simulator.vehicle.vehicle import Vehicle, VehicleKind, isKind
+from util.rand import driver_random, lanes_random
 
 
 class Driver:
+    __slots__ = ('change', 'slow', 'symmetry')
+
     change: float
     slow: float
     symmetry: bool
@@ -24,6 +24,10 @@ MaybeDriver = typing.Optional[Driver]
 
 
 class ConventionalCar(Car):
+    __slots__ = ('driver',)
+
+    KIND = VehicleKind.CONVENTIONAL
+
     driver: Driver
 
     def __init__(self, position: Position, velocity: int, road: Road,
@@ -40,7 +44,7 @@ class ConventionalCar(Car):
             return self.position
 
         x, lane = self.position
-        if self.velocity > 0 and random.random() < self.driver.slow:
+        if self.velocity > 0 and driver_random.random() < self.driver.slow:
             self.velocity -= 1
         else:
             self.velocity += 1
@@ -55,12 +59,12 @@ class ConventionalCar(Car):
         '''
         x, lane = self.position
         vx, vehicle = self.road.getNextVehicle(position=self.position)
-        if vehicle is None or not isinstance(vehicle, Obstacle):
+        if vehicle is None or not isKind(vehicle.KIND, VehicleKind.OBSTACLE):
             return False
         if vx - x > max(self.velocity, 1):
             return False
         # Try to switch lanes in random order.
-        for change in shuffled([-self.road.lane_width, self.road.lane_width]):
+        for change in lanes_random.shuffled([-self.road.lane_width, self.road.lane_width]):
             if self._tryAvoidWithChange(obstacle=vehicle, change=change):
                 return True
         return False
@@ -72,7 +76,7 @@ class ConventionalCar(Car):
         '''
         # Try to switch lanes in random order.
         x, lane = self.position
-        for change in shuffled([-self.road.lane_width, self.road.lane_width]):
+        for change in lanes_random.shuffled([-self.road.lane_width, self.road.lane_width]):
             destination = (x, lane + change)
             # Force changes for asymmetrical cases when switching from L -> R.
             force = change == 1 and not self.driver.symmetry
@@ -96,7 +100,7 @@ class ConventionalCar(Car):
                 _, absoluteLane = self.road.getAbsolutePosition(self.position)
                 change = changeValue if absoluteLane == -1 else -changeValue
                 # When coming back always get priority.
-                return self._tryAvoidWithChange(Obstacle((-1, -1), 0, 0), change)
+                return self._tryAvoidWithChange(None, change)
 
         # If already creating emergency corridor don't move.
         if not self.road.isSingleLane(self):
@@ -113,8 +117,8 @@ class ConventionalCar(Car):
 
     def _canChangeLane(self, destination: Position, force: bool = False) -> bool:
         change_lane = super()._canChangeLane(destination=destination, force=force)
-        return change_lane and random.random() < self.driver.change
+        return change_lane and driver_random.random() < self.driver.change
 
 
 def isConventional(vehicle: Vehicle) -> bool:
-    return isinstance(vehicle, ConventionalCar)
+    return isKind(vehicle.KIND, VehicleKind.CONVENTIONAL)
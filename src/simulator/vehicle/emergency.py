@@ -1,10 +1,14 @@
 from simulator.position import Position
 from simulator.road.road import Road
 from simulator.vehicle.car import Car
-from simulator.vehicle.vehicle import VehicleFlags
+from simulator.vehicle.vehicle import VehicleFlags, VehicleKind
 
 
 class EmergencyCar(Car):
+    __slots__ = ()
+
+    KIND = VehicleKind.EMERGENCY
+
     def __init__(self, position: Position, velocity: int, road: Road,
                  length: int = 1, width: int = 1):
         super().__init__(position=position, velocity=velocity, road=road,
@@ -18,6 +22,6 @@ class EmergencyCar(Car):
         return self.position
 
     def beforeMove(self) -> Position:
-        self.path.append((self.position, self.velocity))
+        self.last_velocity = self.velocity
         self.last_position = self.position
         return self.position
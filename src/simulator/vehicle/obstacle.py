@@ -1,8 +1,12 @@
 from simulator.position import Position
-from simulator.vehicle.vehicle import Vehicle
+from simulator.vehicle.vehicle import Vehicle, VehicleKind
 
 
 class Obstacle(Vehicle):
+    __slots__ = ()
+
+    KIND = VehicleKind.OBSTACLE
+
     def __init__(self, position: Position, length: int, width: int):
         super().__init__(position=position, length=length, width=width, velocity=0)
 
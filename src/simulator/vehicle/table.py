@@ -0,0 +1,132 @@
+import operator
+import typing
+
+import numpy as np
+
+# Identifier stored in the free rows.
+FREE = -1
+
+# Columns of the vehicle table.
+COLUMNS = ('id', 'kind', 'x', 'lane', 'last_x', 'last_lane', 'velocity', 'last_velocity',
+           'length', 'width', 'limit', 'start', 'flags')
+
+# Reads the handle and the changing state of a vehicle stored by VehicleTable.store.
+getState = operator.attrgetter('handle', 'position', 'last_position', 'velocity',
+                               'last_velocity', 'limit', 'start', 'flags')
+
+
+class VehicleTable:
+    '''
+    Struct of arrays keeping the state of the vehicles, a vehicle occupies a row identified by an
+    integer handle while it exists. Columns are NumPy arrays read at once by the statistics and
+    the engines, the vehicles keep their state in attributes and it is stored to the columns in
+    bulk once per step. Rows of the released vehicles are reused, the vehicles are identified by
+    increasing identifiers kept in the id column.
+    '''
+    size: int
+    free: typing.List[int]
+    # Identifier of the next allocated vehicle.
+    next_id: int
+    columns: typing.Dict[str, np.ndarray]
+
+    # Views of the columns.
+    id: memoryview
+    kind: memoryview
+    x: memoryview
+    lane: memoryview
+    last_x: memoryview
+    last_lane: memoryview
+    velocity: memoryview
+    last_velocity: memoryview
+    length: memoryview
+    width: memoryview
+    limit: memoryview
+    start: memoryview
+    flags: memoryview
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.free = list()
+        self.next_id = 0
+        self.columns = dict()
+        self._resize(capacity=capacity)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.columns['id'])
+
+    def _resize(self, capacity: int) -> None:
+        '''
+        Reallocates the columns keeping the used rows.
+        :param capacity: new number of rows.
+        :return: None.
+        '''
+        for name in COLUMNS:
+            column = np.zeros(capacity, dtype=np.int64)
+            if name == 'id':
+                column.fill(FREE)
+            if name in self.columns:
+                column[:self.size] = self.columns[name][:self.size]
+            self.columns[name] = column
+            setattr(self, name, memoryview(column))
+
+    def allocate(self, vehicle_id: typing.Optional[int] = None) -> int:
+        '''
+        Allocates a row for a vehicle, reusing the released rows first.
+        :param vehicle_id: identifier of a restored vehicle, a new one is assigned if not given.
+        :return: handle of the row.
+        '''
+        if len(self.free) > 0:
+            handle = self.free.pop()
+        else:
+            if self.size == self.capacity:
+                self._resize(capacity=2 * self.capacity)
+            handle = self.size
+            self.size += 1
+        if vehicle_id is None:
+            vehicle_id = self.next_id
+        self.next_id = max(self.next_id, vehicle_id + 1)
+        self.id[handle] = vehicle_id
+        return handle
+
+    def release(self, handle: int) -> None:
+        '''
+        Releases a row of a removed vehicle.
+        :param handle: handle of the row.
+        :return: None.
+        '''
+        self.id[handle] = FREE
+        self.free.append(handle)
+
+    def store(self, vehicles: typing.Iterable[typing.Any]) -> None:
+        '''
+        Copies the state of the vehicles to their rows.
+        :param vehicles: vehicles stored in the table.
+        :return: None.
+        '''
+        states = list(map(getState, vehicles))
+        if len(states) == 0:
+            return
+        handles, position, last_position, velocity, last_velocity, limit, start, flags = \
+            zip(*states)
+        handles = np.array(handles, dtype=np.int64)
+        columns = self.columns
+        columns['x'][handles], columns['lane'][handles] = np.array(position).T
+        columns['last_x'][handles], columns['last_lane'][handles] = np.array(last_position).T
+        columns['velocity'][handles] = velocity
+        columns['last_velocity'][handles] = last_velocity
+        columns['limit'][handles] = limit
+        columns['start'][handles] = start
+        columns['flags'][handles] = flags
+
+    def getHandles(self, vehicles: typing.Iterable[typing.Any]) -> np.ndarray:
+        '''
+        Collects handles of the vehicles to index the columns with.
+        :param vehicles: vehicles stored in the table.
+        :return: array of handles.
+        '''
+        return np.fromiter((vehicle.handle for vehicle in vehicles), dtype=np.int64)
+
+
+# Table shared by all the vehicles.
+TABLE = VehicleTable()
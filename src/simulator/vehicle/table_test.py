@@ -0,0 +1,97 @@
+import pickle
+import unittest
+
+from simulator.road.dense import DenseRoad
+from simulator.vehicle.conventional import ConventionalCar, Driver
+from simulator.vehicle.obstacle import Obstacle
+from simulator.vehicle.table import FREE, VehicleTable, TABLE
+from simulator.vehicle.vehicle import VehicleFlags
+
+
+class VehicleTableTestCase(unittest.TestCase):
+    def test_allocate(self):
+        table = VehicleTable(capacity=2)
+        first, second = table.allocate(), table.allocate()
+        self.assertNotEqual(first, second)
+        self.assertListEqual([table.id[first], table.id[second]], [0, 1])
+        table.release(first)
+        self.assertEqual(table.id[first], FREE)
+        # Released rows are reused by vehicles with new identifiers.
+        self.assertEqual(table.allocate(), first)
+        self.assertEqual(table.id[first], 2)
+        self.assertEqual(table.size, 2)
+        # Restored identifiers are not assigned again.
+        third = table.allocate(vehicle_id=10)
+        self.assertEqual(table.id[third], 10)
+        self.assertEqual(table.id[table.allocate()], 11)
+
+    def test_resize(self):
+        table = VehicleTable(capacity=2)
+        handles = [table.allocate() for _ in range(2)]
+        for handle in handles:
+            table.x[handle] = 10 + handle
+        third = table.allocate()
+        self.assertEqual(table.capacity, 4)
+        self.assertEqual(table.id[third], 2)
+        self.assertListEqual(table.columns['x'][handles].tolist(), [10, 11])
+        # Views point to the new columns.
+        table.x[third] = 12
+        self.assertEqual(table.columns['x'][third], 12)
+
+    def test_store(self):
+        car = ConventionalCar(position=(4, 1), velocity=2, road=None, length=2, limit=1,
+                              driver=Driver())
+        obstacle = Obstacle(position=(8, 0), length=3, width=2)
+        car.position, car.velocity, car.flags = (5, 2), 3, VehicleFlags.EMERGENCY
+        car.setStatistics(start=7)
+        TABLE.store([car, obstacle])
+        columns = TABLE.columns
+        handles = TABLE.getHandles([car, obstacle])
+        self.assertListEqual(columns['x'][handles].tolist(), [5, 8])
+        self.assertListEqual(columns['lane'][handles].tolist(), [2, 0])
+        self.assertListEqual(columns['last_x'][handles].tolist(), [4, 8])
+        self.assertListEqual(columns['velocity'][handles].tolist(), [3, 0])
+        self.assertListEqual(columns['last_velocity'][handles].tolist(), [2, 0])
+        self.assertListEqual(columns['limit'][handles].tolist(), [1, 0])
+        self.assertListEqual(columns['start'][handles].tolist(), [7, 0])
+        self.assertListEqual(columns['flags'][handles].tolist(), [VehicleFlags.EMERGENCY, 0])
+        self.assertListEqual(columns['kind'][handles].tolist(),
+                             [ConventionalCar.KIND, Obstacle.KIND])
+        self.assertListEqual(columns['width'][handles].tolist(), [1, 2])
+
+    def test_vehicle(self):
+        car = ConventionalCar(position=(4, 1), velocity=2, road=None, length=2, driver=Driver())
+        self.assertListEqual(TABLE.getHandles([car]).tolist(), [car.handle])
+        self.assertEqual(TABLE.id[car.handle], car.id)
+        # A copy gets its own row with the same identifier and values.
+        copy = pickle.loads(pickle.dumps(car))
+        self.assertNotEqual(copy.handle, car.handle)
+        self.assertEqual(copy.id, car.id)
+        self.assertEqual(TABLE.id[copy.handle], car.id)
+        self.assertEqual(copy.position, car.position)
+        self.assertEqual(TABLE.x[copy.handle], 4)
+        self.assertEqual(TABLE.length[copy.handle], 2)
+        # Released rows are not reused by a copy.
+        handle = copy.handle
+        copy.release()
+        self.assertEqual(TABLE.id[handle], FREE)
+        self.assertEqual(pickle.loads(pickle.dumps(copy)).handle, FREE)
+        # New vehicles get new identifiers.
+        self.assertGreater(Obstacle(position=(0, 0), length=1, width=1).id, car.id)
+
+    def test_release(self):
+        road = DenseRoad(length=10, lanes_count=1, lane_width=1)
+        car = ConventionalCar(position=(9, 0), velocity=2, road=road, driver=Driver(slow=0))
+        road.addVehicle(car)
+        handle = car.handle
+        road.step()
+        # Rows of the removed vehicles are kept for the statistics of the step.
+        self.assertListEqual(road.removed, [car])
+        self.assertEqual(TABLE.id[handle], car.id)
+        road.step()
+        self.assertEqual(car.handle, FREE)
+        self.assertEqual(TABLE.id[handle], FREE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,16 +1,60 @@
-import enum
+import typing
 
 from simulator.position import Position
-from util.enum import withLimits
+from simulator.vehicle.table import FREE, TABLE
 
 
-@withLimits
-class VehicleFlags(enum.Flag):
-    MOVED = enum.auto()
-    EMERGENCY = enum.auto()
+class VehicleFlags:
+    '''
+    Vehicle flags combined into a plain int bitset.
+    '''
+    NONE = 0
+    EMERGENCY = 1 << 0
+    ALL = EMERGENCY
+
+
+class VehicleKind:
+    '''
+    Vehicle kind codes, the code of a subclass contains all the bits of its base class code, so
+    a mask of a base class matches all its subclasses.
+    '''
+    VEHICLE = 0
+    OBSTACLE = 1 << 0
+    CAR = 1 << 1
+    CONVENTIONAL = CAR | 1 << 2
+    AUTONOMOUS = CAR | 1 << 3
+    EMERGENCY = CAR | 1 << 4
+
+
+def isKind(kind: int, mask: int) -> bool:
+    '''
+    Checks if a kind code matches a kind mask.
+    :param kind: kind code of a vehicle.
+    :param mask: kind code of the vehicle class to match.
+    :return: whether the kind is the class or its subclass.
+    '''
+    return kind & mask == mask
 
 
 class Vehicle:
+    '''
+    Vehicle keeps its state in attributes, the state is copied to a row of the shared vehicle
+    table once per step to be read by the statistics at once.
+    '''
+    __slots__ = ('handle', 'id', 'position', 'velocity', 'length', 'width', 'last_position',
+                 'flags', 'epoch', 'start')
+
+    # Code of the vehicle kind stored in the table.
+    KIND = VehicleKind.VEHICLE
+    # State of the cars stored in the table, vehicles which are not cars keep the defaults.
+    last_velocity = 0
+    limit = 0
+
+    # Row of the vehicle table, FREE once released.
+    handle: int
+    # Identifier, unique among all the vehicles and kept in the checkpoints.
+    id: int
+
     # Vehicle properties.
     position: Position
     velocity: int
@@ -19,7 +63,9 @@ class Vehicle:
 
     # Runtime properties.
     last_position: Position
-    flags: VehicleFlags
+    flags: int
+    # Last road update which moved the vehicle.
+    epoch: int
 
     # Statistics purposes.
     start: int
@@ -31,6 +77,51 @@ class Vehicle:
         self.width = width
         self.last_position = position
         self.flags = VehicleFlags.NONE
+        self.epoch = 0
+        self.start = 0
+        self._allocate()
+
+    def _allocate(self, vehicle_id: typing.Optional[int] = None) -> None:
+        '''
+        Allocates a row of the vehicle table and stores the constant state in it.
+        :param vehicle_id: identifier of a restored vehicle.
+        :return: None.
+        '''
+        self.handle = handle = TABLE.allocate(vehicle_id=vehicle_id)
+        self.id = TABLE.id[handle]
+        TABLE.kind[handle] = self.KIND
+        TABLE.length[handle] = self.length
+        TABLE.width[handle] = self.width
+
+    def release(self) -> None:
+        '''
+        Releases the row of the vehicle table, called by the road once the vehicle left it.
+        :return: None.
+        '''
+        if self.handle != FREE:
+            TABLE.release(self.handle)
+            self.handle = FREE
+
+    def __del__(self) -> None:
+        # Vehicles never removed from a road, e.g. of a discarded simulation.
+        if getattr(self, 'handle', FREE) != FREE:
+            self.release()
+
+    def __getstate__(self) -> typing.Dict[str, typing.Any]:
+        return {name: getattr(self, name)
+                for cls in type(self).__mro__ for name in getattr(cls, '__slots__', ())
+                if hasattr(self, name)}
+
+    def __setstate__(self, state: typing.Dict[str, typing.Any]) -> None:
+        # Rows are not shared between processes, a restored vehicle allocates a new one with
+        # the same identifier unless it was already released.
+        released = state.pop('handle') == FREE
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.handle = FREE
+        if not released:
+            self._allocate(vehicle_id=self.id)
+            TABLE.store([self])
 
     def beforeMove(self) -> Position:
         '''
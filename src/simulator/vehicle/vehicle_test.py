@@ -1,7 +1,21 @@
+import typing
 import unittest
 
 from simulator.position import Position
-from simulator.vehicle.vehicle import Vehicle
+from simulator.vehicle.table import TABLE
+from simulator.vehicle.vehicle import Vehicle, VehicleKind, isKind
+
+T = typing.TypeVar('T')
+
+
+def patchable(cls: typing.Type[T]) -> typing.Type[T]:
+    '''
+    Creates a subclass of a slotted vehicle class accepting new instance attributes, so the
+    methods of its instances can be mocked.
+    :param cls: vehicle class.
+    :return: patchable subclass.
+    '''
+    return typing.cast(typing.Type[T], type(cls.__name__, (cls,), {}))
 
 
 def implementsVehicle(cls):
@@ -17,7 +31,21 @@ def implementsVehicle(cls):
             self.fail('Vehicle interface not implemented')
         self.assertEqual(vehicle.last_position, position, 'Last position differs')
 
+    def test_slots(self: cls):
+        vehicle: Vehicle = self.getVehicle(position=(42, 0))
+        self.assertFalse(hasattr(vehicle, '__dict__'), 'vehicle attributes not slotted')
+
+    def test_kind(self: cls):
+        vehicle: Vehicle = self.getVehicle(position=(42, 0))
+        self.assertEqual(TABLE.kind[vehicle.handle], vehicle.KIND)
+        # Kind of a vehicle matches the kinds of all its base classes.
+        for base in type(vehicle).__mro__:
+            if hasattr(base, 'KIND'):
+                self.assertTrue(isKind(vehicle.KIND, base.KIND), f'{base.__name__} not matched')
+
     cls.test_implementsVehicle = test_implementsVehicle
+    cls.test_kind = test_kind
+    cls.test_slots = test_slots
     return cls
 
 
@@ -36,6 +64,16 @@ class VehicleTestCase(unittest.TestCase):
         self.assertEqual(vehicle.position, position, 'positions differs')
         self.assertEqual(vehicle.last_position, position, 'last position not initialized')
 
+    def test_isKind(self):
+        self.assertTrue(isKind(VehicleKind.CONVENTIONAL, VehicleKind.CAR))
+        self.assertTrue(isKind(VehicleKind.AUTONOMOUS, VehicleKind.CAR))
+        self.assertTrue(isKind(VehicleKind.EMERGENCY, VehicleKind.CAR))
+        self.assertTrue(isKind(VehicleKind.CAR, VehicleKind.VEHICLE))
+        self.assertTrue(isKind(VehicleKind.OBSTACLE, VehicleKind.VEHICLE))
+        self.assertFalse(isKind(VehicleKind.CAR, VehicleKind.CONVENTIONAL))
+        self.assertFalse(isKind(VehicleKind.AUTONOMOUS, VehicleKind.CONVENTIONAL))
+        self.assertFalse(isKind(VehicleKind.OBSTACLE, VehicleKind.CAR))
+
     def test_interface(self):
         vehicle = Vehicle(position=(0, 0))
         with self.assertRaises(NotImplementedError, msg='expected beforeMove to be virtual'):
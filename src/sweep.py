@@ -0,0 +1,4 @@
+from interface.sweep import sweep
+
+if __name__ == '__main__':
+    sweep()
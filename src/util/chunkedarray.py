@@ -0,0 +1,117 @@
+import os
+import tempfile
+import typing
+
+import numpy as np
+
+from util.npyfile import NpyWriter
+
+
+class ChunkedArray:
+    '''
+    Growing array of equally shaped rows stored in fixed-size chunks. Once the chunks kept in
+    memory exceed the memory budget the full ones are spilled to a .npy file, the spilled rows
+    are then read through a memory map. Rows in memory reach the file only on a spill or flush,
+    until flush the file holds just the spilled rows and its header counts only those.
+    '''
+    shape: typing.Tuple[int, ...]
+    dtype: np.dtype
+    chunk_size: int
+    memory_budget: int
+    path: typing.Optional[str]
+    chunks: typing.List[np.ndarray]
+    # Number of rows in the last chunk.
+    used: int
+    # Spill file, created with the first spilled rows.
+    file: typing.Optional[NpyWriter]
+
+    def __init__(self, shape: typing.Tuple[int, ...], dtype: typing.Any, chunk_size: int = 256,
+                 memory_budget: int = 256 * 2 ** 20, path: typing.Optional[str] = None):
+        '''
+        :param shape: shape of a single row.
+        :param dtype: type of the values.
+        :param chunk_size: number of rows in a chunk.
+        :param memory_budget: maximal size of the chunks kept in memory (bytes).
+        :param path: path of the spill file, a temporary file is created if not given.
+        '''
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.chunk_size = chunk_size
+        self.memory_budget = memory_budget
+        self.path = path
+        self.chunks = []
+        self.used = chunk_size
+        self.file = None
+
+    @property
+    def spilled(self) -> int:
+        '''
+        Returns the number of rows written to the file.
+        :return: number of spilled rows.
+        '''
+        return 0 if self.file is None else self.file.rows
+
+    def __len__(self) -> int:
+        if not self.chunks:
+            return self.spilled
+        return self.spilled + (len(self.chunks) - 1) * self.chunk_size + self.used
+
+    @property
+    def _rowBytes(self) -> int:
+        return int(np.prod(self.shape)) * self.dtype.itemsize
+
+    def append(self, row: np.ndarray) -> None:
+        '''
+        Copies a row to the end of the array.
+        :param row: row of the array shape.
+        :return: None.
+        '''
+        if self.used == self.chunk_size:
+            # Spill the full chunks if a new chunk does not fit in the budget.
+            chunks_bytes = (len(self.chunks) + 1) * self.chunk_size * self._rowBytes
+            if self.chunks and chunks_bytes > self.memory_budget:
+                self._spill()
+            self.chunks.append(np.empty((self.chunk_size, *self.shape), dtype=self.dtype))
+            self.used = 0
+        self.chunks[-1][self.used] = row
+        self.used += 1
+
+    def _spill(self, rows: typing.Optional[int] = None) -> None:
+        '''
+        Moves the chunks from memory to the end of the spill file.
+        :param rows: number of rows to move, all the full chunks by default.
+        :return: None.
+        '''
+        if self.file is None:
+            if self.path is None:
+                descriptor, self.path = tempfile.mkstemp(suffix='.npy')
+                os.close(descriptor)
+            self.file = NpyWriter(path=self.path, dtype=self.dtype, shape=self.shape)
+        if rows is None:
+            rows = len(self.chunks) * self.chunk_size
+        written = 0
+        while written < rows:
+            count = min(self.chunk_size, rows - written)
+            self.file.append(self.chunks.pop(0)[:count])
+            written += count
+
+    def flush(self) -> None:
+        '''
+        Spills all the rows to the file, the file then holds the whole array.
+        :return: None.
+        '''
+        if self.chunks or self.file is None:
+            self._spill(rows=len(self) - self.spilled)
+            self.used = self.chunk_size
+
+    def toArray(self) -> np.ndarray:
+        '''
+        Returns all the rows, the spilled rows are flushed and memory-mapped.
+        :return: array of the rows.
+        '''
+        if self.spilled > 0:
+            self.flush()
+            return np.load(self.path, mmap_mode='r')
+        if not self.chunks:
+            return np.empty((0, *self.shape), dtype=self.dtype)
+        return np.concatenate(self.chunks)[:len(self)]
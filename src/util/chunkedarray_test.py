@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from util.chunkedarray import ChunkedArray
+
+
+class ChunkedArrayTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'array.npy')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_append(self):
+        array = ChunkedArray(shape=(2, 3), dtype=np.int8, chunk_size=4)
+        self.assertEqual(len(array), 0)
+        self.assertEqual(array.toArray().shape, (0, 2, 3))
+        rows = np.arange(10 * 6, dtype=np.int8).reshape((10, 2, 3))
+        for row in rows:
+            array.append(row)
+        self.assertEqual(len(array), 10)
+        self.assertEqual(len(array.chunks), 3)
+        self.assertEqual(array.spilled, 0)
+        np.testing.assert_array_equal(array.toArray(), rows)
+
+    def test_spill(self):
+        # Budget of two chunks of 4 rows of 6 bytes.
+        array = ChunkedArray(shape=(2, 3), dtype=np.int8, chunk_size=4, memory_budget=48,
+                             path=self.path)
+        rows = np.arange(19 * 6, dtype=np.int64).reshape((19, 2, 3)).astype(np.int8)
+        for i, row in enumerate(rows):
+            array.append(row)
+            self.assertLessEqual(len(array.chunks), 2)
+            self.assertEqual(len(array), i + 1)
+        self.assertEqual(array.spilled, 16)
+        result = array.toArray()
+        self.assertIsInstance(result, np.memmap)
+        np.testing.assert_array_equal(result, rows)
+        # Rows can be appended after reading, the file is a regular .npy file.
+        array.append(rows[0])
+        np.testing.assert_array_equal(array.toArray(), np.concatenate([rows, rows[:1]]))
+        np.testing.assert_array_equal(np.load(self.path), np.concatenate([rows, rows[:1]]))
+
+    def test_spill__temporary(self):
+        array = ChunkedArray(shape=(), dtype=np.float64, chunk_size=1, memory_budget=0)
+        for value in range(5):
+            array.append(value)
+        try:
+            self.assertIsNotNone(array.path)
+            self.assertListEqual(array.toArray().tolist(), list(range(5)))
+        finally:
+            os.remove(array.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
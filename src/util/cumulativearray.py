@@ -0,0 +1,65 @@
+import typing
+
+import numpy as np
+
+# Sample stored in the cumulative array.
+Sample = typing.Tuple[int, int]
+
+SAMPLE_DTYPE = np.dtype([('value', np.int64), ('count', np.int64)])
+
+
+class CumulativeArray:
+    '''
+    Ring buffer of cumulative (value, count) sums, an array-backed CumulativeList keeping only
+    the last size + 1 sums.
+    '''
+    size: int
+    index: int
+    length: int
+    sums: np.ndarray
+
+    def __init__(self, size: int, *items: Sample):
+        self.size = size + 1
+        self.index = 0
+        self.length = 0
+        self.sums = np.zeros(self.size, dtype=SAMPLE_DTYPE)
+        for value, count in items:
+            self.append(value=value, count=count)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, item: int) -> Sample:
+        if item < -len(self) or item >= len(self):
+            raise KeyError
+        value, count = self.sums[(self.index + item) % len(self)].tolist()
+        return value, count
+
+    def append(self, value: int, count: int = 0) -> None:
+        '''
+        Appends a sample adding it to the last cumulative sum.
+        :param value: sample value.
+        :param count: sample count.
+        :return: None.
+        '''
+        if self.length > 0:
+            last_value, last_count = self[-1]
+            value += last_value
+            count += last_count
+        if self.length < self.size:
+            self.sums[self.length] = (value, count)
+            self.length += 1
+        else:
+            self.sums[self.index] = (value, count)
+            self.index = (self.index + 1) % self.size
+
+    def value(self) -> Sample:
+        '''
+        Returns the sum of the samples in the window.
+        :return: value and count sums.
+        '''
+        last_value, last_count = self[-1]
+        if len(self) < self.size:
+            return last_value, last_count
+        first_value, first_count = self[0]
+        return last_value - first_value, last_count - first_count
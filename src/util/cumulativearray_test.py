@@ -0,0 +1,44 @@
+import unittest
+
+from util.cumulativearray import CumulativeArray
+from util.cumulativelist import CumulativeList
+
+
+class CumulativeArrayTestCase(unittest.TestCase):
+    def test_append(self):
+        a = CumulativeArray(20)
+        a.append(42, 1)
+        self.assertEqual((42, 1), a[0])
+        s = 42
+        for i in range(1, 100):
+            s += i
+            a.append(i, 1)
+            self.assertEqual((s, i + 1), a[-1], f'error with i={i}')
+        self.assertEqual(len(a), 21)
+        with self.assertRaises(KeyError):
+            _ = a[21]
+
+    def test_value(self):
+        a = CumulativeArray(20)
+        a.append(1, 2)
+        self.assertEqual((1, 2), a.value())
+        for i in range(2, 21):
+            a.append(1, 2)
+            self.assertEqual((i, 2 * i), a.value())
+        for _ in range(100):
+            a.append(1, 2)
+            self.assertEqual((20, 40), a.value())
+
+    def test_value__list(self):
+        a = CumulativeArray(7, (0, 0))
+        l: CumulativeList[int] = CumulativeList(7, 0)
+        for i in range(50):
+            a.append(i * i % 11)
+            l.append(i * i % 11)
+            value, _ = a.value()
+            self.assertEqual(value, l.value(), f'error with i={i}')
+            self.assertEqual(len(a), len(l))
+
+
+if __name__ == '__main__':
+    unittest.main()
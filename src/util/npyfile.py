@@ -0,0 +1,63 @@
+import struct
+import typing
+
+import numpy as np
+
+# Size of the .npy header, the header is rewritten in place by every append.
+HEADER_SIZE = 128
+MAGIC = b'\x93NUMPY\x01\x00'
+
+
+class NpyWriter:
+    '''
+    Append-only .npy file of equally shaped rows. The header has a fixed size and every append
+    rewrites it after writing the rows, so between the appends the file is a valid array of the
+    rows appended so far readable by np.load. The file is not synced to the disk.
+    '''
+    path: str
+    dtype: np.dtype
+    shape: typing.Tuple[int, ...]
+    rows: int
+
+    def __init__(self, path: str, dtype: typing.Any, shape: typing.Tuple[int, ...] = ()):
+        '''
+        Creates an empty file, an existing file is overwritten.
+        :param path: path of the file.
+        :param dtype: type of the values.
+        :param shape: shape of a single row.
+        '''
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.shape = tuple(shape)
+        self.rows = 0
+        with open(self.path, 'wb') as file:
+            self._writeHeader(file)
+
+    @property
+    def rowBytes(self) -> int:
+        return int(np.prod(self.shape)) * self.dtype.itemsize
+
+    def _writeHeader(self, file: typing.BinaryIO) -> None:
+        header = repr({
+            'descr': np.lib.format.dtype_to_descr(self.dtype),
+            'fortran_order': False,
+            'shape': (self.rows, *self.shape),
+        })
+        size = HEADER_SIZE - len(MAGIC) - 2
+        header = header.ljust(size - 1).encode('latin1') + b'\n'
+        assert len(header) == size, 'header too long'
+        file.seek(0)
+        file.write(MAGIC + struct.pack('<H', size) + header)
+
+    def append(self, rows: np.ndarray) -> None:
+        '''
+        Writes rows to the end of the file.
+        :param rows: array of the rows.
+        :return: None.
+        '''
+        rows = np.ascontiguousarray(rows, dtype=self.dtype)
+        with open(self.path, 'r+b') as file:
+            file.seek(HEADER_SIZE + self.rows * self.rowBytes)
+            file.write(rows.tobytes())
+            self.rows += len(rows)
+            self._writeHeader(file)
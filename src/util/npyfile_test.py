@@ -0,0 +1,28 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from util.npyfile import NpyWriter
+
+
+class NpyWriterTestCase(unittest.TestCase):
+    def test_append(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'array.npy')
+            writer = NpyWriter(path=path, dtype=np.int16, shape=(3,))
+            self.assertEqual(np.load(path).shape, (0, 3))
+            rows = np.arange(30).reshape((10, 3))
+            writer.append(rows[:4])
+            np.testing.assert_array_equal(np.load(path), rows[:4])
+            writer.append(rows[4:])
+            self.assertEqual(writer.rows, 10)
+            result = np.load(path, mmap_mode='r')
+            self.assertEqual(result.dtype, np.int16)
+            np.testing.assert_array_equal(result, rows)
+            del result
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import math
+import typing
+
+import numpy as np
+
+from util.cumulativearray import SAMPLE_DTYPE, Sample
+
+# Two-sided 95% quantiles of the Student t distribution by degrees of freedom. SciPy is installed
+# only as a dependency of the charts, the statistics of the simulator do not import scipy.stats.
+T_QUANTILES = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+               2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+               2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+# Quantile of the normal distribution the t quantiles are expanded from for more degrees of freedom.
+Z_QUANTILE = 1.959964
+
+
+def getTQuantile(degrees: int) -> float:
+    '''
+    Returns the two-sided 95% quantile of the Student t distribution, beyond the table by the
+    Cornish-Fisher expansion accurate to 1e-4.
+    :param degrees: degrees of freedom.
+    :return: quantile.
+    '''
+    if degrees <= len(T_QUANTILES):
+        return T_QUANTILES[degrees - 1]
+    z = Z_QUANTILE
+    return z + (z ** 3 + z) / (4 * degrees) + \
+        (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * degrees ** 2)
+
+
+class OnlineStatistics:
+    '''
+    Constant-memory statistics of a series of (value, count) samples. The mean is the ratio of
+    the value and count sums, the variance of the sample ratios weighted by their counts, whose
+    weighted mean is the same ratio, is updated by West's weighted version of Welford's
+    algorithm. The confidence interval of the mean is estimated from the ratios of batches of
+    consecutive samples, which are nearly independent even for an autocorrelated series.
+    Once all the batches are full the neighbouring ones are merged and the batch size doubles.
+    '''
+    max_batches: int
+    samples: int
+    last: Sample
+    # Sums of all the samples.
+    value_sum: int
+    count_sum: int
+    # Accumulators of the sample ratios weighted by the counts.
+    ratios: int
+    count_squares: int
+    ratio_mean: float
+    ratio_m2: float
+    # Sums of the full batches and of the batch being filled.
+    batch_size: int
+    batches: np.ndarray
+    full: int
+    batch: Sample
+    used: int
+
+    def __init__(self, max_batches: int = 32):
+        '''
+        :param max_batches: number of the batches kept, has to be even.
+        '''
+        if max_batches < 2 or max_batches % 2 != 0:
+            raise ValueError('max_batches has to be positive and even')
+        self.max_batches = max_batches
+        self.samples = 0
+        self.last = (0, 0)
+        self.value_sum = 0
+        self.count_sum = 0
+        self.ratios = 0
+        self.count_squares = 0
+        self.ratio_mean = 0.
+        self.ratio_m2 = 0.
+        self.batch_size = 1
+        self.batches = np.zeros(max_batches, dtype=SAMPLE_DTYPE)
+        self.full = 0
+        self.batch = (0, 0)
+        self.used = 0
+
+    def __len__(self) -> int:
+        return self.samples
+
+    def append(self, value: int, count: int = 0) -> None:
+        '''
+        Adds a sample, samples without count do not change the variance.
+        :param value: sample value.
+        :param count: sample count.
+        :return: None.
+        '''
+        self.samples += 1
+        self.last = (value, count)
+        self.value_sum += value
+        self.count_sum += count
+        if count > 0:
+            ratio = value / count
+            self.ratios += 1
+            self.count_squares += count * count
+            delta = ratio - self.ratio_mean
+            self.ratio_mean += delta * count / self.count_sum
+            self.ratio_m2 += count * delta * (ratio - self.ratio_mean)
+        batch_value, batch_count = self.batch
+        self.batch = (batch_value + value, batch_count + count)
+        self.used += 1
+        if self.used == self.batch_size:
+            self.batches[self.full] = self.batch
+            self.full += 1
+            self.batch = (0, 0)
+            self.used = 0
+            if self.full == self.max_batches:
+                self._mergeBatches()
+
+    def _mergeBatches(self) -> None:
+        '''
+        Merges pairs of the neighbouring full batches, doubling the batch size.
+        :return: None.
+        '''
+        half = self.full // 2
+        for name in ('value', 'count'):
+            column = self.batches[name]
+            column[:half] = column[0:self.full:2] + column[1:self.full:2]
+        self.batches[half:] = (0, 0)
+        self.full = half
+        self.batch_size *= 2
+
+    def value(self) -> Sample:
+        '''
+        Returns the sums of all the samples.
+        :return: value and count sums.
+        '''
+        return self.value_sum, self.count_sum
+
+    def mean(self) -> typing.Optional[float]:
+        '''
+        Returns the mean, the ratio of the value and count sums.
+        :return: mean or None without any count.
+        '''
+        if self.count_sum == 0:
+            return None
+        return self.value_sum / self.count_sum
+
+    def std(self) -> typing.Optional[float]:
+        '''
+        Returns the sample standard deviation of the sample ratios weighted by their counts, the
+        unbiased estimate for reliability weights, around the mean.
+        :return: standard deviation or None with less than two ratios.
+        '''
+        if self.ratios < 2:
+            return None
+        return math.sqrt(self.ratio_m2 / (self.count_sum - self.count_squares / self.count_sum))
+
+    def halfWidth(self) -> typing.Optional[float]:
+        '''
+        Returns the half-width of the 95% confidence interval of the mean by the batch means
+        method, the batch being filled is not included.
+        :return: half-width or None with less than two full batches with count.
+        '''
+        batches = self.batches[:self.full]
+        batches = batches[batches['count'] > 0]
+        if len(batches) < 2:
+            return None
+        ratios = batches['value'] / batches['count']
+        error = ratios.std(ddof=1) / math.sqrt(len(ratios))
+        return getTQuantile(len(ratios) - 1) * error
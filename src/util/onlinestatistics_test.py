@@ -0,0 +1,87 @@
+import math
+import random
+import unittest
+
+import numpy as np
+
+from util.onlinestatistics import OnlineStatistics, getTQuantile
+
+
+class OnlineStatisticsTestCase(unittest.TestCase):
+    def setUp(self):
+        generator = random.Random(42)
+        self.samples = [(generator.randint(0, 50), generator.randint(0, 10)) for _ in range(200)]
+
+    def test_mean(self):
+        statistics = OnlineStatistics()
+        self.assertIsNone(statistics.mean())
+        for value, count in self.samples:
+            statistics.append(value=value, count=count)
+        values, counts = np.array(self.samples).T
+        self.assertEqual(statistics.value(), (values.sum(), counts.sum()))
+        self.assertAlmostEqual(statistics.mean(), values.sum() / counts.sum())
+        self.assertEqual(statistics.last, self.samples[-1])
+        self.assertEqual(len(statistics), len(self.samples))
+
+    def test_std(self):
+        statistics = OnlineStatistics()
+        statistics.append(value=3, count=1)
+        self.assertIsNone(statistics.std())
+        for value, count in self.samples:
+            statistics.append(value=value, count=count)
+        # Samples without count are left out, the ratios are weighted by the counts.
+        values, counts = np.array([(3, 1)] + [sample for sample in self.samples if sample[1] > 0]).T
+        ratios = values / counts
+        mean = values.sum() / counts.sum()
+        variance = (counts * (ratios - mean) ** 2).sum() / \
+            (counts.sum() - (counts ** 2).sum() / counts.sum())
+        self.assertAlmostEqual(statistics.std(), np.sqrt(variance))
+
+    def test_std__unweighted(self):
+        statistics = OnlineStatistics()
+        for value in range(10):
+            statistics.append(value=2 * value, count=2)
+        # Equal counts give the sample standard deviation of the ratios.
+        self.assertAlmostEqual(statistics.std(), np.std(range(10), ddof=1))
+
+    def test_init(self):
+        for max_batches in (0, 3):
+            with self.assertRaises(ValueError):
+                OnlineStatistics(max_batches=max_batches)
+
+    def test_append__merge(self):
+        statistics = OnlineStatistics(max_batches=4)
+        for _ in range(4):
+            statistics.append(value=1, count=1)
+        # Four batches of a single sample get merged to two of two samples.
+        self.assertEqual(statistics.full, 2)
+        self.assertEqual(statistics.batch_size, 2)
+        for _ in range(3):
+            statistics.append(value=1, count=1)
+        self.assertEqual(statistics.full, 3)
+        self.assertEqual(statistics.used, 1)
+        self.assertListEqual(statistics.batches['value'].tolist(), [2, 2, 2, 0])
+
+    def test_halfWidth(self):
+        statistics = OnlineStatistics(max_batches=8)
+        self.assertIsNone(statistics.halfWidth())
+        for value, count in self.samples:
+            statistics.append(value=value, count=count)
+        # 200 samples end in 6 full batches of 32 samples.
+        self.assertEqual(statistics.batch_size, 32)
+        self.assertEqual(statistics.full, 6)
+        batches = np.array(self.samples[:192]).reshape(6, 32, 2).sum(axis=1)
+        ratios = batches[:, 0] / batches[:, 1]
+        expected = getTQuantile(5) * np.std(ratios, ddof=1) / math.sqrt(6)
+        self.assertAlmostEqual(statistics.halfWidth(), expected)
+
+    def test_getTQuantile(self):
+        self.assertEqual(getTQuantile(1), 12.706)
+        self.assertEqual(getTQuantile(30), 2.042)
+        self.assertAlmostEqual(getTQuantile(31), 2.0395, delta=1e-4)
+        self.assertAlmostEqual(getTQuantile(120), 1.9799, delta=1e-4)
+        self.assertAlmostEqual(getTQuantile(1000), 1.9623, delta=1e-4)
+
+
+if __name__ == '__main__':
+    unittest.main()
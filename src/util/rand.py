@@ -1,13 +1,133 @@
-import random
 import typing
 
+import numpy as np
+
 T = typing.TypeVar('T')
 
+# Number of uniform numbers drawn from a generator at once.
+BLOCK_SIZE = 4096
+
+# Saved state of a single stream.
+StreamState = typing.Tuple[typing.Dict[str, typing.Any], typing.List[float], int]
+
+
+class Stream:
+    '''
+    Stream of uniform random numbers pre-drawn in blocks from a NumPy generator.
+    '''
+    block_size: int
+    generator: np.random.Generator
+    block: typing.List[float]
+    index: int
+
+    def __init__(self, seed: typing.Optional[np.random.SeedSequence] = None,
+                 block_size: int = BLOCK_SIZE):
+        self.block_size = block_size
+        self.seed(seed)
+
+    def seed(self, seed: typing.Optional[np.random.SeedSequence]) -> None:
+        '''
+        Reinitializes the generator discarding the numbers already drawn.
+        :param seed: seed sequence of the stream, None for a fresh entropy.
+        :return: None.
+        '''
+        self.generator = np.random.default_rng(seed)
+        self.block = []
+        self.index = 0
+
+    def _draw(self) -> None:
+        self.block = self.generator.random(self.block_size).tolist()
+        self.index = 0
+
+    def random(self) -> float:
+        '''
+        Returns the next number of the stream.
+        :return: random number in [0, 1).
+        '''
+        if self.index == len(self.block):
+            self._draw()
+        value = self.block[self.index]
+        self.index += 1
+        return value
+
+    def uniform(self, count: int) -> np.ndarray:
+        '''
+        Returns the next numbers of the stream at once, the same numbers as the repeated calls
+        of random would return.
+        :param count: number of the returned numbers.
+        :return: array of random numbers in [0, 1).
+        '''
+        values: typing.List[float] = []
+        while len(values) < count:
+            if self.index == len(self.block):
+                self._draw()
+            end = min(len(self.block), self.index + count - len(values))
+            values.extend(self.block[self.index:end])
+            self.index = end
+        return np.array(values, dtype=np.float64)
+
+    def randint(self, a: int, b: int) -> int:
+        '''
+        Returns a random integer from the range.
+        :param a: range start (inc.)
+        :param b: range end (inc.)
+        :return: random integer.
+        '''
+        return a + int(self.random() * (b - a + 1))
+
+    def shuffled(self, xs: typing.Sequence[T]) -> typing.List[T]:
+        '''
+        Creates a shuffled version of a given sequence.
+        :param xs: sequence to shuffle.
+        :return: shuffled list.
+        '''
+        result = list(xs)
+        for i in range(len(result) - 1, 0, -1):
+            j = int(self.random() * (i + 1))
+            result[i], result[j] = result[j], result[i]
+        return result
+
+    def getState(self) -> StreamState:
+        return self.generator.bit_generator.state, list(self.block), self.index
+
+    def setState(self, state: StreamState) -> None:
+        generator_state, block, index = state
+        self.generator.bit_generator.state = generator_state
+        self.block = list(block)
+        self.index = index
+
+
+# Independent streams of the simulation components.
+dispatcher_random = Stream()
+driver_random = Stream()
+lanes_random = Stream()
+STREAMS = [dispatcher_random, driver_random, lanes_random]
+
+
+def seed(value: typing.Optional[int]) -> None:
+    '''
+    Seeds all the streams, each stream gets its own child of the seed sequence.
+    :param value: seed, None for a fresh entropy.
+    :return: None.
+    '''
+    children = np.random.SeedSequence(value).spawn(len(STREAMS))
+    for stream, child in zip(STREAMS, children):
+        stream.seed(child)
+
+
+def getState() -> typing.List[StreamState]:
+    '''
+    Returns the state of all the streams.
+    :return: states of the streams.
+    '''
+    return [stream.getState() for stream in STREAMS]
+
 
-def shuffled(xs: typing.List[T]) -> typing.List[T]:
+def setState(state: typing.List[StreamState]) -> None:
     '''
-    Creates a shuffled version of a given list.
-    :param xs: list to shuffle.
-    :return: shuffled list.
+    Restores the state of all the streams.
+    :param state: states of the streams.
+    :return: None.
     '''
-    return random.sample(xs, len(xs))
+    for stream, stream_state in zip(STREAMS, state):
+        stream.setState(stream_state)
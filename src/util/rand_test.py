@@ -1,17 +1,55 @@
 import unittest
 
-from util.rand import shuffled
+import numpy as np
+
+from util import rand
+from util.rand import Stream
 
 
 class RandTestCase(unittest.TestCase):
     def test_shuffled(self):
-        self.assertListEqual(shuffled([0]), [0])
+        stream = Stream(seed=np.random.SeedSequence(42))
+        self.assertListEqual(stream.shuffled([0]), [0])
         sample = list(range(10))
-        self.assertEqual(len(shuffled(sample)), len(sample))
-        self.assertCountEqual(shuffled(sample), sample)
+        self.assertEqual(len(stream.shuffled(sample)), len(sample))
+        self.assertCountEqual(stream.shuffled(sample), sample)
         sample = [0] * 10
-        self.assertEqual(len(shuffled(sample)), len(sample))
-        self.assertCountEqual(shuffled(sample), sample)
+        self.assertEqual(len(stream.shuffled(sample)), len(sample))
+        self.assertCountEqual(stream.shuffled(sample), sample)
+        self.assertCountEqual(stream.shuffled(range(5)), range(5))
+
+    def test_randint(self):
+        stream = Stream(seed=np.random.SeedSequence(42))
+        values = [stream.randint(-2, 2) for _ in range(1000)]
+        self.assertCountEqual(set(values), range(-2, 3))
+
+    def test_uniform(self):
+        # Blocks are drawn on demand, single and batched draws return the same numbers.
+        first = Stream(seed=np.random.SeedSequence(42), block_size=7)
+        second = Stream(seed=np.random.SeedSequence(42), block_size=5)
+        expected = [first.random() for _ in range(30)]
+        result = [second.random(), *second.uniform(12).tolist(), *second.uniform(0).tolist(),
+                  second.random(), *second.uniform(16).tolist()]
+        self.assertListEqual(result, expected)
+        self.assertTrue(all(0 <= value < 1 for value in result))
+
+    def test_state(self):
+        stream = Stream(seed=np.random.SeedSequence(42), block_size=5)
+        stream.uniform(3)
+        state = stream.getState()
+        expected = stream.uniform(10).tolist()
+        stream.setState(state)
+        self.assertListEqual(stream.uniform(10).tolist(), expected)
+
+    def test_seed(self):
+        rand.seed(42)
+        expected = [stream.random() for stream in rand.STREAMS]
+        # Streams are independent of each other.
+        self.assertEqual(len(set(expected)), len(rand.STREAMS))
+        rand.seed(42)
+        self.assertListEqual([stream.random() for stream in rand.STREAMS], expected)
+        rand.seed(43)
+        self.assertNotEqual([stream.random() for stream in rand.STREAMS], expected)
 
 
 if __name__ == '__main__':